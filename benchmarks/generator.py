@@ -0,0 +1,272 @@
+"""
+Generator of synthetic economic CSV files for load tests.
+
+Run from project root:
+    python -m benchmarks.generator out.csv --rows 1000000
+    python -m benchmarks.generator feed/ --size 1G --files 8 --invalid-rate 0.001 --skew 1.1
+"""
+
+import argparse
+import random
+from itertools import accumulate, islice
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+from core import parse_size
+
+HEADER = (
+    "country",
+    "year",
+    "gdp",
+    "gdp_growth",
+    "inflation",
+    "unemployment",
+    "population",
+    "continent",
+)
+CONTINENTS = (
+    "Africa",
+    "Asia",
+    "Europe",
+    "North America",
+    "Oceania",
+    "South America",
+)
+DEFAULT_COUNTRIES = 200
+DEFAULT_YEARS = (2000, 2024)
+CHUNK_SIZE = 10_000
+MAX_VARIANTS = 16
+VARIANTS_BUDGET = 1 << 16
+
+
+class Country:
+    """Economic profile that rows of one synthetic country are drawn from."""
+
+    __slots__ = ("name", "continent", "gdp", "growth", "inflation", "unemployment")
+
+    def __init__(self, index: int, rng: random.Random):
+        self.name = f"Country {index:04d}"
+        self.continent = CONTINENTS[index % len(CONTINENTS)]
+        self.gdp = rng.lognormvariate(5, 1.5)
+        self.growth = rng.gauss(3, 2)
+        self.inflation = rng.lognormvariate(1, 0.6)
+        self.unemployment = rng.uniform(2, 15)
+
+    def population(self, year: int, first_year: int) -> int:
+        """Population in millions, growing 1% a year."""
+
+        return max(1, round(self.gdp / 30 * 1.01 ** (year - first_year)))
+
+    def row(self, year: int, first_year: int, rng: random.Random) -> list[str]:
+        """Drawing row of country for year."""
+
+        growth = rng.gauss(self.growth, 2)
+        gdp = self.gdp * (1 + self.growth / 100) ** (year - first_year)
+
+        return [
+            self.name,
+            str(year),
+            str(max(1, round(gdp * rng.lognormvariate(0, 0.05)))),
+            f"{growth:.1f}",
+            f"{max(0.0, rng.gauss(self.inflation, 1)):.1f}",
+            f"{max(0.5, rng.gauss(self.unemployment, 1)):.1f}",
+            str(self.population(year, first_year)),
+            self.continent,
+        ]
+
+
+def _corrupt(line: str, rng: random.Random) -> str:
+    row = line.rstrip("\n").split(",")
+    kind = rng.randrange(3)
+    if kind == 0:
+        row = row[:-1]
+    else:
+        row[2] = "" if kind == 1 else "n/a"
+
+    return ",".join(row) + "\n"
+
+
+def generate_lines(
+    countries: int = DEFAULT_COUNTRIES,
+    years: tuple[int, int] = DEFAULT_YEARS,
+    invalid_rate: float = 0.0,
+    skew: float = 0.0,
+    seed: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Generating endless stream of economic CSV lines.
+
+    Countries are drawn with Zipf weights, so with skew above 0 some of them
+    have many more rows than others. GDP of country grows from its base by
+    its mean growth a year, other values vary around country means. Up to
+    MAX_VARIANTS rows of every country and year are drawn up front and
+    lines are picked from them, so random values aren't drawn for every row.
+
+    Args:
+        countries: Number of countries.
+        years: First and last year.
+        invalid_rate: Share of rows with missing column, empty or non-numeric gdp.
+        skew: Zipf exponent of country frequencies, 0 is uniform.
+        seed: Random seed.
+
+    Yields: CSV lines in HEADER order, with newline.
+
+    Raises:
+        ValueError: If countries, years, invalid_rate or skew are out of range.
+    """
+
+    first_year, last_year = years
+    if countries < 1 or first_year > last_year:
+        error_msg = f"Need at least 1 country and year, got {countries} and {years}."
+        raise ValueError(error_msg)
+    if not 0 <= invalid_rate <= 1 or skew < 0:
+        error_msg = f"Invalid rate must be in [0, 1] and skew >= 0, got {invalid_rate} and {skew}."
+        raise ValueError(error_msg)
+
+    rng = random.Random(seed)
+    profiles = [Country(index, rng) for index in range(countries)]
+    cells = [
+        (rank, country, year)
+        for rank, country in enumerate(profiles)
+        for year in range(first_year, last_year + 1)
+    ]
+    variants = max(1, min(MAX_VARIANTS, VARIANTS_BUDGET // len(cells)))
+    lines = [
+        [",".join(country.row(year, first_year, rng)) + "\n" for _ in range(variants)]
+        for _, country, year in cells
+    ]
+    weights = list(accumulate(1 / (rank + 1) ** skew for rank, _, _ in cells))
+
+    while True:
+        for cell in rng.choices(lines, cum_weights=weights, k=CHUNK_SIZE):
+            line = rng.choice(cell)
+            if invalid_rate and rng.random() < invalid_rate:
+                line = _corrupt(line, rng)
+            yield line
+
+
+def write_csv(
+    file: Path,
+    lines: Iterator[str],
+    count: Optional[int] = None,
+    size: Optional[int] = None,
+) -> int:
+    """
+    Writing lines to CSV file until count rows or size bytes are written.
+
+    Args:
+        file: Output file.
+        lines: Stream of lines, like from generate_lines.
+        count: Number of rows.
+        size: Approximate size of file in bytes.
+
+    Returns:
+        Number of written rows.
+
+    Raises:
+        ValueError: If neither count nor size is given.
+    """
+
+    if count is None and size is None:
+        error_msg = "Either count or size of output must be given."
+        raise ValueError(error_msg)
+
+    written = 0
+    with open(file, "w", encoding="utf-8", newline="") as f:
+        f.write(",".join(HEADER) + "\n")
+        while count is None or written < count:
+            limit = CHUNK_SIZE if count is None else min(CHUNK_SIZE, count - written)
+            f.write("".join(islice(lines, limit)))
+            written += limit
+            if size is not None and f.tell() >= size:
+                break
+
+    return written
+
+
+def write_files(
+    directory: Path,
+    files: int,
+    count: Optional[int] = None,
+    size: Optional[int] = None,
+    **options,
+) -> list[Path]:
+    """
+    Writing rows split evenly between files of directory.
+
+    Args:
+        directory: Output directory, created if missing.
+        files: Number of files.
+        count: Total number of rows.
+        size: Approximate total size in bytes.
+        options: Options of generate_lines.
+
+    Returns:
+        Written files.
+    """
+
+    directory.mkdir(parents=True, exist_ok=True)
+    lines = generate_lines(**options)
+    paths = []
+
+    for index in range(files):
+        path = directory / f"economic-{index:03d}.csv"
+        file_count = None if count is None else count // files + (index < count % files)
+        write_csv(path, lines, file_count, None if size is None else size // files)
+        paths.append(path)
+
+    return paths
+
+
+def _years(value: str) -> tuple[int, int]:
+    first, _, last = value.partition("-")
+    return int(first), int(last or first)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generating synthetic economic CSV.")
+    parser.add_argument(
+        "output", type=Path, help="Output file, or directory with --files."
+    )
+    parser.add_argument("--rows", type=int, help="Number of rows.")
+    parser.add_argument("--size", type=parse_size, help="Approximate size, e.g. 1G.")
+    parser.add_argument(
+        "--files", type=int, help="Number of files in output directory."
+    )
+    parser.add_argument("--countries", type=int, default=DEFAULT_COUNTRIES)
+    parser.add_argument(
+        "--years",
+        type=_years,
+        default=DEFAULT_YEARS,
+        help="FIRST-LAST, e.g. 2000-2024.",
+    )
+    parser.add_argument("--invalid-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--skew", type=float, default=0.0, help="Zipf exponent of country frequencies."
+    )
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    if args.rows is None and args.size is None:
+        parser.error("one of the arguments --rows --size is required")
+
+    options = {
+        "countries": args.countries,
+        "years": args.years,
+        "invalid_rate": args.invalid_rate,
+        "skew": args.skew,
+        "seed": args.seed,
+    }
+    if args.files is None:
+        written = write_csv(
+            args.output, generate_lines(**options), args.rows, args.size
+        )
+        print(f"Written {written} rows to {args.output}.")
+        return
+
+    paths = write_files(args.output, args.files, args.rows, args.size, **options)
+    print(f"Written {len(paths)} files to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
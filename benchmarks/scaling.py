@@ -0,0 +1,251 @@
+"""
+Scaling benchmark of report modes over input sizes and CPU counts.
+
+Every run is a separate main.py process pinned to the first N CPUs where
+affinity is supported, so the planner and sharded mode see only them.
+Peak memory is the largest sum of RSS of the process and its workers,
+sampled from /proc, or peak RSS of the main process on other platforms.
+
+Run from project root:
+    python -m benchmarks.scaling --rows 100000 1000000 --cpus 1 2 4 --csv curves.csv
+"""
+
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from benchmarks.generator import write_files
+from core import print_table
+from core.planner import available_cpus
+
+try:
+    import resource
+except ImportError:
+    resource = None  # type: ignore[assignment]
+
+MAIN = Path(__file__).resolve().parents[1] / "main.py"
+SAMPLE_INTERVAL = 0.05
+DEFAULT_ROWS = (100_000, 1_000_000)
+DEFAULT_REPORT = "economy-summary"
+# economy-summary has no estimate, so approximate mode runs report that has
+MODE_REPORTS = {"approximate": "average-gdp"}
+
+# Arguments of every mode, {cpus} is replaced by number of CPUs of run
+MODES = {
+    "planned": [],
+    "streaming": ["--on-error", "skip"],
+    "spill": ["--on-error", "skip", "--memory-limit", "1M"],
+    "sharded": ["--shards", "{cpus}"],
+    "approximate": ["--sample-size", "1000"],
+}
+
+
+def _process_tree_rss(root: int) -> Optional[int]:
+    children: dict[int, list[int]] = defaultdict(list)
+    rss: dict[int, int] = {}
+
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return None
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                fields = f.read().rsplit(b")", 1)[1].split()
+        except OSError:
+            continue
+        pid = int(entry)
+        children[int(fields[1])].append(pid)
+        rss[pid] = int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+
+    total, stack = 0, [root]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children[pid])
+
+    return total
+
+
+def _limit_cpus(cpus: int) -> None:
+    if hasattr(os, "sched_setaffinity"):
+        available = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, available[:cpus])
+
+
+def measure(
+    command: Sequence[str], cpus: int, cwd: Optional[Path] = None
+) -> tuple[float, int]:
+    """
+    Running command on cpus CPUs.
+
+    Args:
+        command: Command to run.
+        cpus: Number of CPUs the command may run on.
+        cwd: Working directory of command, its logs directory is created there.
+
+    Returns:
+        Wall time in seconds and peak memory in bytes.
+
+    Raises:
+        subprocess.CalledProcessError: If command fails, with its output.
+    """
+
+    peak = 0
+    done = threading.Event()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        cwd=cwd,
+        preexec_fn=lambda: _limit_cpus(cpus),
+    )
+
+    def sample() -> None:
+        nonlocal peak
+        while not done.wait(SAMPLE_INTERVAL):
+            rss = _process_tree_rss(process.pid)
+            if rss is not None:
+                peak = max(peak, rss)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    output, _ = process.communicate()
+    seconds = time.perf_counter() - start
+    done.set()
+    sampler.join()
+
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command, output)
+
+    if not peak and resource is not None:
+        # ru_maxrss is in KiB on Linux, in bytes on macOS
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        peak = usage if sys.platform == "darwin" else usage * 1024
+
+    return seconds, peak
+
+
+def run_benchmark(
+    rows: Sequence[int],
+    cpus: Sequence[int],
+    modes: Sequence[str],
+    report: Optional[str] = None,
+    invalid_rate: float = 0.0,
+    skew: float = 1.0,
+) -> list[dict[str, Any]]:
+    """
+    Measuring throughput and peak memory of modes for every size and CPU count.
+
+    Inputs are split into max(cpus) files, so parallel modes can use all CPUs.
+    Runs work in the temporary input directory, so their logs are removed with it.
+    Without report, every mode runs its report from MODE_REPORTS or DEFAULT_REPORT.
+    With invalid_rate, invalid rows are skipped in every mode. Modes report
+    doesn't support are skipped.
+
+    Returns:
+        Rows of mode, report, input rows and size, CPUs, seconds, throughput and memory.
+    """
+
+    results = []
+    files = max(cpus)
+
+    for count in rows:
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_files(
+                Path(directory),
+                files,
+                count,
+                invalid_rate=invalid_rate,
+                skew=skew,
+                seed=0,
+            )
+            size = sum(path.stat().st_size for path in paths)
+            inputs = [str(path) for path in paths]
+
+            for mode in modes:
+                mode_report = report or MODE_REPORTS.get(mode, DEFAULT_REPORT)
+                for cpu_count in cpus:
+                    options = [arg.format(cpus=cpu_count) for arg in MODES[mode]]
+                    if invalid_rate and "--on-error" not in options:
+                        options += ["--on-error", "skip"]
+                    command = [
+                        sys.executable,
+                        str(MAIN),
+                        "--files",
+                        *inputs,
+                        "--report",
+                        mode_report,
+                        *options,
+                    ]
+                    try:
+                        seconds, peak = measure(command, cpu_count, Path(directory))
+                    except subprocess.CalledProcessError as e:
+                        reason = e.output.strip().splitlines()[-1:] or [
+                            f"exit code {e.returncode}"
+                        ]
+                        print(f"Skipping {mode} on {cpu_count} CPUs: {reason[0]}")
+                        continue
+                    results.append(
+                        {
+                            "mode": mode,
+                            "report": mode_report,
+                            "rows": count,
+                            "size_mib": round(size / 2**20, 1),
+                            "cpus": cpu_count,
+                            "seconds": round(seconds, 2),
+                            "rows_per_s": round(count / seconds),
+                            "mib_per_s": round(size / 2**20 / seconds, 1),
+                            "peak_mib": round(peak / 2**20, 1),
+                        }
+                    )
+                    print_table(results[-1:])
+
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measuring scaling of report modes.")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS))
+    parser.add_argument("--cpus", type=int, nargs="+", default=[1, available_cpus()])
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument(
+        "--report", help="Report of all modes instead of their defaults."
+    )
+    parser.add_argument("--invalid-rate", type=float, default=0.0)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--csv", type=Path, help="File to save curves to.")
+    args = parser.parse_args(argv)
+
+    cpus = sorted({min(count, available_cpus()) for count in args.cpus})
+    if cpus != sorted(set(args.cpus)):
+        print(f"Only {available_cpus()} CPUs are available, measuring on {cpus}.")
+
+    results = run_benchmark(
+        args.rows, cpus, args.modes, args.report, args.invalid_rate, args.skew
+    )
+    print_table(results, title="Scaling")
+
+    if args.csv is not None and results:
+        with open(args.csv, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"Curves are saved to {args.csv}.")
+
+
+if __name__ == "__main__":
+    main()
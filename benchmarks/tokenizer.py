@@ -0,0 +1,79 @@
+"""
+Benchmark of simple dialect tokenizer against csv.reader.
+
+Run from project root: python -m benchmarks.tokenizer [rows]
+"""
+
+import csv
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.generator import generate_lines, write_csv
+from core import CsvReader
+from core.compression import open_text
+from core.tokenizer import read_columns, read_rows
+
+DEFAULT_ROWS = 500_000
+REPEATS = 3
+
+
+def _best(func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def _count_csv_reader(file: Path) -> int:
+    with open_text(file) as f:
+        return sum(1 for _ in csv.reader(f))
+
+
+def _count_read_rows(file: Path) -> int:
+    with open_text(file) as f:
+        return sum(1 for _ in read_rows(f))
+
+
+def _columns_csv_reader(file: Path) -> list[tuple[str, ...]]:
+    with open_text(file) as f:
+        reader = csv.reader(f)
+        next(reader)
+        return list(zip(*reader))
+
+
+def _columns_read_columns(file: Path) -> list[list[str]]:
+    with open_text(file) as f:
+        return read_columns(f)[1]
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = Path(directory) / "economic.csv"
+        write_csv(file, generate_lines(seed=0), rows)
+        print(f"{rows} rows, {file.stat().st_size / 2**20:.1f} MiB")
+
+        for name, baseline, tokenizer in (
+            ("read_rows", _count_csv_reader, _count_read_rows),
+            ("read_columns", _columns_csv_reader, _columns_read_columns),
+        ):
+            stdlib = _best(lambda: baseline(file))
+            fast = _best(lambda: tokenizer(file))
+            print(
+                f"{name:<13} {fast:.3f} s, csv.reader {stdlib:.3f} s "
+                f"({stdlib / fast:.1f}x faster)"
+            )
+
+        load = _best(lambda: CsvReader(file, infer_schema=True).load_columns)
+        print(f"load_columns with schema conversion: {load:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
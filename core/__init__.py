@@ -1,14 +1,18 @@
 __all__ = (
     "ArgParser",
     "BaseReport",
+    "ColumnType",
     "CsvReader",
     "ReportRegistry",
+    "Schema",
     "convert_to_number",
     "is_numeric",
     "log",
+    "parse_size",
     "get_logger",
     "print_table",
     "setup_logging",
+    "to_number",
 )
 
 
@@ -17,4 +21,5 @@ from .cli_tools import print_table
 from .csv_tools import CsvReader
 from .logger import log, get_logger, setup_logging
 from .reports import BaseReport, ReportRegistry
-from .shortcuts import convert_to_number, is_numeric
+from .schema import ColumnType, Schema
+from .shortcuts import convert_to_number, is_numeric, parse_size, to_number
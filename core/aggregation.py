@@ -0,0 +1,306 @@
+import math
+import pickle
+import tempfile
+from itertools import chain
+from operator import neg
+from pathlib import Path
+from typing import Any, Hashable, Iterable, Iterator, Optional, Sequence
+
+PENDING_LIMIT = 16
+
+
+def exact_partials(values: Sequence[int | float]) -> list[float]:
+    """
+    Splitting exact sum of values into non-overlapping float partials.
+
+    Every partial is math.fsum of values minus previous partials, so the
+    exact sum of partials is the exact sum of values, and math.fsum of them
+    is correctly rounded whatever order values were added in.
+
+    Args:
+        values: Floats and integers below 2 ** 53, larger ones are rounded.
+
+    Returns:
+        Partials in decreasing magnitude, empty if exact sum is zero.
+    """
+
+    partials: list[float] = []
+
+    while True:
+        try:
+            remainder = math.fsum(chain(values, map(neg, partials)))
+        except (ValueError, OverflowError):
+            # inf - inf or overflow of partial sums, sum isn't finite anyway
+            return [sum(values, 0.0)]
+
+        if not remainder:
+            return partials
+        partials.append(remainder)
+        if not math.isfinite(remainder):
+            return partials
+
+
+def _integer_partials(integer: int) -> list[float]:
+    partials = []
+    while integer:
+        partial = float(integer)
+        partials.append(partial)
+        integer -= int(partial)
+
+    return partials
+
+
+class AggregateState:
+    """
+    Mergeable count, sum, min and max of numeric values.
+
+    Sum is exact: integers are summed as int, floats are kept as partials
+    of their exact sum, so states merged in any order, e.g. from parallel
+    workers or spilled partitions, give bit-identical sum and mean.
+    """
+
+    __slots__ = ("count", "min", "max", "_integer", "_partials", "_pending")
+
+    def __init__(
+        self,
+        count: int = 0,
+        total: int | float | list = 0,
+        minimum: Optional[int | float] = None,
+        maximum: Optional[int | float] = None,
+    ):
+        self.count = count
+        self.min = minimum
+        self.max = maximum
+        self._pending: list[float] = []
+
+        if isinstance(total, list):
+            self._integer, *self._partials = total
+        elif isinstance(total, float):
+            self._integer, self._partials = 0, [total]
+        else:
+            self._integer, self._partials = total, []
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, AggregateState) and (
+            self.count,
+            self.sum,
+            self.min,
+            self.max,
+        ) == (other.count, other.sum, other.min, other.max)
+
+    def __repr__(self) -> str:
+        return (
+            f"AggregateState(count={self.count}, sum={self.sum}, "
+            f"min={self.min}, max={self.max})"
+        )
+
+    def _compact(self) -> None:
+        self._partials = exact_partials(self._partials + self._pending)
+        self._pending = []
+
+    def add(self, value: int | float) -> None:
+        """Adding single value."""
+
+        self.count += 1
+        if isinstance(value, float):
+            self._pending.append(value)
+            if len(self._pending) >= PENDING_LIMIT:
+                self._compact()
+        else:
+            self._integer += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def update(self, values: Sequence[int | float]) -> None:
+        """Adding batch of values."""
+
+        if not values:
+            return
+
+        self.count += len(values)
+        total = sum(values)
+        if isinstance(total, int):
+            self._integer += total
+        else:
+            self._partials = exact_partials(
+                [*self._partials, *self._pending, *exact_partials(values)]
+            )
+            self._pending = []
+
+        minimum, maximum = min(values), max(values)
+        self.min = minimum if self.min is None else min(self.min, minimum)
+        self.max = maximum if self.max is None else max(self.max, maximum)
+
+    def merge(self, other: "AggregateState") -> None:
+        """Merging other state into this one."""
+
+        if not other.count:
+            return
+
+        self.count += other.count
+        self._integer += other._integer
+        self._pending.extend(other._partials + other._pending)
+        if len(self._pending) >= PENDING_LIMIT:
+            self._compact()
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    @property
+    def sum(self) -> int | float:
+        """Sum of added values, correctly rounded if some of them are floats."""
+
+        if not self._partials and not self._pending:
+            return self._integer
+        values = self._partials + self._pending + _integer_partials(self._integer)
+        try:
+            return math.fsum(values)
+        except (ValueError, OverflowError):
+            return sum(values, 0.0)
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean of added values."""
+
+        if not self.count:
+            return None
+        return self.sum / self.count
+
+    def to_list(self) -> list[Any]:
+        """Serializing state to list, exact sum of floats is kept as partials."""
+
+        self._compact()
+        total: int | float | list = [self._integer, *self._partials]
+        if not self._partials:
+            total = self._integer
+        elif not self._integer and len(self._partials) == 1:
+            total = self._partials[0]
+
+        return [self.count, total, self.min, self.max]
+
+    @classmethod
+    def from_list(cls, values: Iterable[Any]) -> "AggregateState":
+        """Deserializing state from list."""
+
+        return cls(*values)
+
+
+# Group key with state and up to PENDING_LIMIT pending floats, measured with tracemalloc
+GROUP_SIZE_ESTIMATE = 512
+DEFAULT_PARTITIONS = 16
+
+
+class GroupAggregator:
+    """
+    Aggregator of states by group key within memory budget.
+
+    When number of groups exceeds the budget, partial states are spilled
+    to temporary files partitioned by key hash. Partitions are merged one
+    by one at the end, so only one partition is in memory at a time.
+    """
+
+    def __init__(
+        self,
+        memory_limit: Optional[int] = None,
+        partitions: int = DEFAULT_PARTITIONS,
+        state_factory: type[Any] = AggregateState,
+    ):
+        self.max_groups = None
+        if memory_limit is not None:
+            self.max_groups = max(1, memory_limit // GROUP_SIZE_ESTIMATE)
+        self.partitions = partitions
+        self.state_factory = state_factory
+        self.spills = 0
+        self._groups: dict[Hashable, Any] = {}
+        self._spill_dir: Optional[tempfile.TemporaryDirectory] = None
+
+    def __enter__(self) -> "GroupAggregator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _state(self, key: Hashable) -> Any:
+        state = self._groups.get(key)
+        if state is None:
+            if self.max_groups is not None and len(self._groups) >= self.max_groups:
+                self._spill()
+            state = self._groups[key] = self.state_factory()
+        return state
+
+    def add(self, key: Hashable, value: Any) -> None:
+        """Adding value to group state."""
+
+        self._state(key).add(value)
+
+    def merge(self, key: Hashable, state: Any) -> None:
+        """Merging partial state into group state."""
+
+        self._state(key).merge(state)
+
+    def _partition_path(self, partition: int) -> Path:
+        return Path(self._spill_dir.name) / f"partition_{partition}.pickle"
+
+    def _spill(self) -> None:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.TemporaryDirectory(prefix="csv_report_")
+
+        parts: list[list[tuple[Hashable, list[Any]]]] = [
+            [] for _ in range(self.partitions)
+        ]
+        for key, state in self._groups.items():
+            parts[hash(key) % self.partitions].append((key, state.to_list()))
+
+        for partition, items in enumerate(parts):
+            if items:
+                with open(self._partition_path(partition), "ab") as f:
+                    pickle.dump(items, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self._groups = {}
+        self.spills += 1
+
+    def _load_partition(self, partition: int) -> dict[Hashable, Any]:
+        groups: dict[Hashable, Any] = {}
+        path = self._partition_path(partition)
+        if not path.exists():
+            return groups
+
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    items = pickle.load(f)
+                except EOFError:
+                    break
+                for key, values in items:
+                    state = self.state_factory.from_list(values)
+                    if key in groups:
+                        groups[key].merge(state)
+                    else:
+                        groups[key] = state
+
+        path.unlink()
+        return groups
+
+    def items(self) -> Iterator[tuple[Hashable, Any]]:
+        """
+        Iterating merged states of all groups.
+
+        Yields: Tuples of (group key, state), consuming spilled partitions.
+        """
+
+        if self._spill_dir is None:
+            yield from self._groups.items()
+            return
+
+        self._spill()
+        for partition in range(self.partitions):
+            yield from self._load_partition(partition).items()
+
+    def close(self) -> None:
+        """Removing spilled partitions."""
+
+        if self._spill_dir is not None:
+            self._spill_dir.cleanup()
+            self._spill_dir = None
+        self._groups = {}
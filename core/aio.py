@@ -0,0 +1,218 @@
+import asyncio
+import threading
+from concurrent.futures import Executor
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+)
+
+from .csv_tools import CsvReader
+from .validation import DEFAULT_BATCH_SIZE
+
+DEFAULT_QUEUE_SIZE = 4
+
+_DONE = object()
+
+
+class _Cancelled(Exception):
+    pass
+
+
+async def _aiterate(
+    iterator: Iterator[Any], executor: Optional[Executor] = None
+) -> AsyncIterator[Any]:
+    loop = asyncio.get_running_loop()
+    future: Optional[asyncio.Future] = None
+
+    try:
+        while True:
+            future = loop.run_in_executor(executor, next, iterator, _DONE)
+            item = await future
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            if future is None or future.done():
+                close()
+            else:
+                future.add_done_callback(lambda _: close())
+
+
+def _column_batches(
+    readers: Sequence[CsvReader], batch_size: int
+) -> Iterator[dict[str, list[Any]]]:
+    for reader in readers:
+        yield from reader.iter_batches(batch_size)
+
+
+def _row_batches(
+    readers: Sequence[CsvReader], batch_size: int
+) -> Iterator[list[dict[str, Any]]]:
+    for reader in readers:
+        for columns in reader.iter_batches(batch_size):
+            yield list(reader.batch_rows(columns))
+
+
+def aiter_batches(
+    readers: Sequence[CsvReader],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[dict[str, list[Any]]]:
+    """
+    Streaming validated column batches of files without blocking event loop.
+
+    Every batch is read, validated and converted on executor thread.
+
+    Args:
+        readers: Readers of files, read one after another.
+        batch_size: Number of rows in batch.
+        executor: Thread pool executor, default executor of loop if None.
+
+    Returns:
+        Async iterator of dictionaries of column name to batch values.
+    """
+
+    return _aiterate(_column_batches(readers, batch_size), executor)
+
+
+def aiter_rows(
+    readers: Sequence[CsvReader],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Streaming validated row batches of files without blocking event loop.
+
+    Args:
+        readers: Readers of files, read one after another.
+        batch_size: Number of rows in batch.
+        executor: Thread pool executor, default executor of loop if None.
+
+    Returns:
+        Async iterator of lists of row dictionaries.
+    """
+
+    return _aiterate(_row_batches(readers, batch_size), executor)
+
+
+def _bridge_rows(
+    batches: AsyncIterator[list[dict[str, Any]]],
+    loop: asyncio.AbstractEventLoop,
+    cancelled: threading.Event,
+) -> Iterator[dict[str, Any]]:
+    while not cancelled.is_set():
+        try:
+            batch = asyncio.run_coroutine_threadsafe(batches.__anext__(), loop).result()
+        except StopAsyncIteration:
+            return
+        yield from batch
+
+    raise _Cancelled
+
+
+def _run_cancellable(
+    generate: Callable[[Iterable[dict[str, Any]]], list[dict[str, Any]]],
+    rows: Iterator[dict[str, Any]],
+) -> Optional[list[dict[str, Any]]]:
+    try:
+        return generate(rows)
+    except _Cancelled:
+        return None
+
+
+async def agenerate(
+    generate: Callable[[Iterable[dict[str, Any]]], list[dict[str, Any]]],
+    batches: AsyncIterable[list[dict[str, Any]]],
+    executor: Optional[Executor] = None,
+) -> list[dict[str, Any]]:
+    """
+    Running synchronous report generation over async row batches.
+
+    Generation runs on executor thread and pulls batches from event loop,
+    so the loop stays responsive. Cancelling the awaiting task stops
+    generation at the next batch.
+
+    Args:
+        generate: Report generate method.
+        batches: Async iterable of lists of row dictionaries.
+        executor: Thread pool executor, default executor of loop if None.
+
+    Returns:
+        Result of generate.
+    """
+
+    loop = asyncio.get_running_loop()
+    cancelled = threading.Event()
+    rows = _bridge_rows(aiter(batches), loop, cancelled)
+
+    try:
+        return await loop.run_in_executor(executor, _run_cancellable, generate, rows)
+    finally:
+        cancelled.set()
+
+
+class SharedBatches:
+    """
+    Single pass over async batches shared by several consumers.
+
+    Every subscriber gets every batch through its own bounded queue, so
+    inputs are parsed once for concurrent reports and the slowest consumer
+    applies backpressure. Subscribers must subscribe before iterating;
+    a subscriber that stops early no longer holds others back.
+    """
+
+    def __init__(
+        self, source: AsyncIterable[Any], queue_size: int = DEFAULT_QUEUE_SIZE
+    ):
+        self.source = source
+        self.queue_size = queue_size
+        self._queues: list[asyncio.Queue] = []
+        self._pump: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> AsyncIterator[Any]:
+        """Creating async iterator over all batches of source."""
+
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._queues.append(queue)
+        return self._consume(queue)
+
+    async def _consume(self, queue: asyncio.Queue) -> AsyncIterator[Any]:
+        if self._pump is None:
+            self._pump = asyncio.ensure_future(self._run())
+
+        try:
+            while (item := await queue.get()) is not _DONE:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self._unsubscribe(queue)
+
+    def _unsubscribe(self, queue: asyncio.Queue) -> None:
+        if queue in self._queues:
+            self._queues.remove(queue)
+        while not queue.empty():
+            queue.get_nowait()
+
+        if not self._queues and self._pump is not None:
+            self._pump.cancel()
+
+    async def _run(self) -> None:
+        try:
+            async for batch in self.source:
+                for queue in list(self._queues):
+                    await queue.put(batch)
+        except Exception as e:
+            for queue in list(self._queues):
+                await queue.put(e)
+        finally:
+            for queue in list(self._queues):
+                await queue.put(_DONE)
@@ -1,5 +1,10 @@
 import argparse
 
+from .dedup import DedupPolicy
+from .shards import parse_address
+from .shortcuts import parse_size
+from .validation import ErrorPolicy
+
 
 class OnceAction(argparse.Action):
     """Action that allows argument to be specified only once."""
@@ -21,13 +26,227 @@ class ArgParser(argparse.ArgumentParser):
         self.add_argument(
             "--files",
             nargs="+",
-            required=True,
             action=OnceAction,
-            help="Path to CSV files.",
+            help='Path to CSV files, "-" reads CSV from stdin.',
+        )
+        self.add_argument(
+            "--stdin",
+            action="store_true",
+            help="Reading CSV from stdin in addition to --files.",
+        )
+        self.add_argument(
+            "--input-dir",
+            nargs="+",
+            action=OnceAction,
+            help="Directories searched recursively for CSV files in addition to --files.",
+        )
+        self.add_argument(
+            "--pattern",
+            action=OnceAction,
+            help='Glob pattern for file names in --input-dir, e.g. "economic-*.csv.gz".',
+        )
+        self.add_argument(
+            "--manifest",
+            action=OnceAction,
+            help=(
+                "Manifest of files found in --input-dir, unchanged files aren't validated "
+                "again (default: .csv-report-manifest.json in first directory)."
+            ),
         )
         self.add_argument(
             "--report",
-            required=True,
             action=OnceAction,
             help="Creating <report-name> with given files.",
         )
+        self.add_argument(
+            "--specs",
+            action=OnceAction,
+            help="TOML or JSON file with declarative report definitions.",
+        )
+        self.add_argument(
+            "--plugins",
+            nargs="+",
+            action=OnceAction,
+            help="Directories of report plugins, one <report_name>.py file per report.",
+        )
+        self.add_argument(
+            "--build-index",
+            action="store_true",
+            help="Building rollup index files next to given files.",
+        )
+        self.add_argument(
+            "--max-errors",
+            type=int,
+            action=OnceAction,
+            help="Number of invalid rows reported per file before stopping (default: 100).",
+        )
+        self.add_argument(
+            "--on-error",
+            choices=[policy.value for policy in ErrorPolicy],
+            action=OnceAction,
+            help=(
+                "Invalid rows policy: fail before processing (default), "
+                "skip or quarantine them while streaming."
+            ),
+        )
+        self.add_argument(
+            "--quarantine-file",
+            action=OnceAction,
+            help="Side CSV file for quarantined rows (default: quarantine.csv).",
+        )
+        self.add_argument(
+            "--dedup-key",
+            nargs="+",
+            action=OnceAction,
+            help="Dropping rows which key columns, e.g. country year, repeat in a winning file.",
+        )
+        self.add_argument(
+            "--dedup-policy",
+            choices=[policy.value for policy in DedupPolicy],
+            action=OnceAction,
+            help="Winning file of duplicate keys: last given file (default) or newest by mtime.",
+        )
+        self.add_argument(
+            "--records",
+            action="store_true",
+            help="Streaming rows as compact read-only records instead of dictionaries.",
+        )
+        self.add_argument(
+            "--save-result",
+            action=OnceAction,
+            help="Saving report result to JSON file, usable as baseline of --diff.",
+        )
+        self.add_argument(
+            "--diff",
+            action=OnceAction,
+            help="Printing per-key deltas and rank changes against result saved with --save-result.",
+        )
+        self.add_argument(
+            "--memory-limit",
+            type=parse_size,
+            action=OnceAction,
+            help="Memory budget for aggregation, e.g. 512M or 2G, spills to disk above it.",
+        )
+        self.add_argument(
+            "--group-by",
+            nargs="+",
+            action=OnceAction,
+            help="Group columns of declarative reports, e.g. continent year.",
+        )
+        self.add_argument(
+            "--window",
+            type=int,
+            action=OnceAction,
+            help="Number of years in rolling window of gdp-trends report (default: 3).",
+        )
+        self.add_argument(
+            "--explain",
+            action="store_true",
+            help="Printing execution plan chosen from input size, CPU count and --memory-limit.",
+        )
+        self.add_argument(
+            "--prefetch",
+            type=int,
+            action=OnceAction,
+            help="Number of files read ahead on thread pool while parsing (default: 4, 0 disables).",
+        )
+        self.add_argument(
+            "--shards",
+            type=int,
+            action=OnceAction,
+            help="Aggregating files on <shards> local worker processes, 0 waits for remote workers only.",
+        )
+        self.add_argument(
+            "--listen",
+            type=parse_address,
+            action=OnceAction,
+            help="HOST:PORT the coordinator of --shards listens on (default: 127.0.0.1 and random port).",
+        )
+        self.add_argument(
+            "--worker",
+            type=parse_address,
+            action=OnceAction,
+            help="Running as worker of coordinator at HOST:PORT, --specs and --plugins must match coordinator.",
+        )
+        self.add_argument(
+            "--watch",
+            action="store_true",
+            help="Updating report on every change of input files until interrupted.",
+        )
+        self.add_argument(
+            "--query",
+            action="store_true",
+            help="Loading files once and answering report, filter, group and top queries at prompt.",
+        )
+        self.add_argument(
+            "--sample-size",
+            type=int,
+            action=OnceAction,
+            help="Approximate report from random sample of <sample-size> rows.",
+        )
+        self.add_argument(
+            "--seed",
+            type=int,
+            action=OnceAction,
+            help="Random seed for approximate mode.",
+        )
+
+    def parse_args(self, args=None, namespace=None):
+        parsed = super(ArgParser, self).parse_args(args, namespace)
+
+        if parsed.worker is not None:
+            return parsed
+
+        if parsed.files is None and not parsed.stdin and parsed.input_dir is None:
+            self.error("the following arguments are required: --files")
+
+        if parsed.input_dir is None and (parsed.pattern or parsed.manifest):
+            self.error("argument --pattern/--manifest: not allowed without --input-dir")
+
+        if parsed.report is None and not parsed.build_index and not parsed.query:
+            self.error("the following arguments are required: --report")
+
+        if parsed.dedup_key is not None and parsed.sample_size is not None:
+            self.error("argument --dedup-key: not allowed with --sample-size")
+
+        # "-" in --files reads stdin the same as --stdin
+        stdin = parsed.stdin or "-" in (parsed.files or ())
+
+        if parsed.listen is not None and parsed.shards is None:
+            self.error("argument --listen: not allowed without --shards")
+
+        if parsed.shards is not None and (
+            stdin
+            or parsed.sample_size is not None
+            or parsed.dedup_key is not None
+            or parsed.on_error == ErrorPolicy.QUARANTINE.value
+        ):
+            self.error(
+                "argument --shards: not allowed with --stdin, --sample-size, "
+                "--dedup-key or --on-error quarantine"
+            )
+
+        if parsed.watch and (
+            stdin
+            or parsed.sample_size is not None
+            or parsed.dedup_key is not None
+            or parsed.shards is not None
+        ):
+            self.error(
+                "argument --watch: not allowed with --stdin, --sample-size, "
+                "--dedup-key or --shards"
+            )
+
+        if parsed.query and (
+            stdin
+            or parsed.watch
+            or parsed.sample_size is not None
+            or parsed.dedup_key is not None
+            or parsed.shards is not None
+        ):
+            self.error(
+                "argument --query: not allowed with --stdin, --watch, --sample-size, "
+                "--dedup-key or --shards"
+            )
+
+        return parsed
@@ -0,0 +1,310 @@
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import sys
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator, Optional, TextIO
+
+try:
+    from compression import zstd as _zstd  # type: ignore[import-not-found]
+except ImportError:
+    try:
+        import zstandard as _zstd  # type: ignore[import-not-found,no-redef]
+    except ImportError:
+        _zstd = None
+
+GZIP_MAGIC = b"\x1f\x8b\x08"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".xz", ".zst")
+
+STDIN = "-"
+
+PARALLEL_MIN_SIZE = 4 * 1024 * 1024
+PARALLEL_MAX_MEMBER_SIZE = 64 * 1024 * 1024
+
+
+class _StdinText(io.TextIOWrapper):
+    """Text stream over stdin which leaves stdin open on close."""
+
+    def close(self) -> None:
+        try:
+            self.detach()
+        except ValueError:
+            pass
+
+
+def is_stdin(file: Path) -> bool:
+    """Checking if path stands for standard input."""
+
+    return str(file) == STDIN
+
+
+def is_csv_path(file: Path) -> bool:
+    """Checking if path is CSV file, compressed or not."""
+
+    suffixes = file.suffixes[-2:]
+
+    if suffixes and suffixes[-1] in COMPRESSED_SUFFIXES:
+        return len(suffixes) == 2 and suffixes[0] == ".csv"
+
+    return file.suffix == ".csv"
+
+
+def _zstd_module() -> Any:
+    if _zstd is None:
+        error_msg = "Reading .zst files requires Python 3.14+ or zstandard package."
+        raise ValueError(error_msg)
+    return _zstd
+
+
+def _zstd_decompressor() -> Any:
+    module = _zstd_module()
+    if module.__name__ == "zstandard":
+        return module.ZstdDecompressor().decompressobj()
+    return module.ZstdDecompressor()
+
+
+def _gzip_decompressor() -> Any:
+    return zlib.decompressobj(wbits=31)
+
+
+class _MemberError(Exception):
+    pass
+
+
+def _decompress_member(data: bytes, factory: Callable[[], Any]) -> bytes:
+    decompressor = factory()
+    try:
+        output = decompressor.decompress(data)
+    except Exception as e:
+        raise _MemberError(str(e))
+
+    if not decompressor.eof or decompressor.unused_data:
+        raise _MemberError("Member boundary mismatch.")
+
+    return output
+
+
+def _decompress_sequential(
+    data: memoryview, factory: Callable[[], Any], chunk_size: int = 1024 * 1024
+) -> Iterator[bytes]:
+    decompressor = factory()
+    position = 0
+
+    while position < len(data):
+        output = decompressor.decompress(data[position : position + chunk_size])
+        position += chunk_size
+        if output:
+            yield output
+        while decompressor.eof and decompressor.unused_data:
+            rest = decompressor.unused_data
+            decompressor = factory()
+            output = decompressor.decompress(rest)
+            if output:
+                yield output
+
+
+class ParallelMemberReader(io.RawIOBase):
+    """
+    Raw stream decompressing gzip members or zstd frames on thread pool.
+
+    Member starts are found by magic bytes. A false match makes its chunk
+    fail to decode, in that case the rest of file is decompressed
+    sequentially from the last confirmed member start.
+    """
+
+    def __init__(
+        self,
+        file: Path,
+        magic: bytes,
+        factory: Callable[[], Any],
+        workers: Optional[int] = None,
+    ):
+        super().__init__()
+        self._file = open(file, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self._factory = factory
+        self._workers = workers or os.cpu_count() or 1
+        self._offsets = self.member_offsets(self._map, magic)
+        self._chunks = self._decompress()
+        self._pending = memoryview(b"")
+
+    @staticmethod
+    def member_offsets(data: Any, magic: bytes) -> list[int]:
+        """Finding candidate member starts by magic bytes."""
+
+        offsets = []
+        position = data.find(magic)
+        while position != -1:
+            offsets.append(position)
+            position = data.find(magic, position + 1)
+
+        return offsets
+
+    @property
+    def members(self) -> int:
+        """Number of candidate members."""
+
+        return len(self._offsets)
+
+    @property
+    def first_member(self) -> Optional[int]:
+        """Offset of first candidate member."""
+
+        return self._offsets[0] if self._offsets else None
+
+    def _decompress(self) -> Iterator[bytes]:
+        bounds = iter(zip(self._offsets, self._offsets[1:] + [len(self._map)]))
+        window: deque[tuple[int, Future]] = deque()
+        resume = None
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+
+            def fill() -> None:
+                for start, end in bounds:
+                    member = bytes(self._view[start:end])
+                    future = executor.submit(_decompress_member, member, self._factory)
+                    window.append((start, future))
+                    if len(window) >= self._workers * 2:
+                        return
+
+            fill()
+            while window:
+                start, future = window.popleft()
+                try:
+                    output = future.result()
+                except _MemberError:
+                    resume = start
+                    break
+                fill()
+                yield output
+
+            for _, future in window:
+                future.cancel()
+
+        if resume is not None:
+            yield from _decompress_sequential(self._view[resume:], self._factory)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._chunks.close()
+            self._pending.release()
+            self._view.release()
+            self._map.close()
+            self._file.close()
+        super().close()
+
+
+def may_read_parallel(file: Path) -> bool:
+    """Checking if file is large enough gzip or zstd file to be decompressed in parallel."""
+
+    if is_stdin(file) or file.suffix not in (".gz", ".zst"):
+        return False
+
+    try:
+        return file.stat().st_size >= PARALLEL_MIN_SIZE
+    except OSError:
+        return False
+
+
+def _parallel_reader(file: Path, magic: bytes, factory: Callable[[], Any]) -> Any:
+    if not may_read_parallel(file):
+        return None
+
+    size = file.stat().st_size
+    reader = ParallelMemberReader(file, magic, factory)
+    if (
+        reader.members < 2
+        or reader.first_member != 0
+        or size / reader.members > PARALLEL_MAX_MEMBER_SIZE
+    ):
+        reader.close()
+        return None
+
+    return reader
+
+
+def _open_raw(raw: BinaryIO, suffix: str, encoding: str) -> TextIO:
+    if suffix == ".gz":
+        stream: BinaryIO = gzip.GzipFile(fileobj=raw, mode="rb")
+    elif suffix == ".zst":
+        stream = _zstd_module().open(raw, "rb")
+    elif suffix == ".bz2":
+        stream = bz2.BZ2File(raw, "rb")
+    elif suffix == ".xz":
+        stream = lzma.LZMAFile(raw, "rb")
+    else:
+        stream = io.BufferedReader(raw)
+
+    return io.TextIOWrapper(stream, encoding, newline="")
+
+
+def open_text(
+    file: Path, encoding: str = "utf-8", raw: Optional[BinaryIO] = None
+) -> TextIO:
+    """
+    Opening CSV file as text stream, decompressing by suffix.
+
+    Args:
+        file: Path to plain or compressed CSV file, "-" for stdin.
+        encoding: Text encoding.
+        raw: Already opened binary stream of file, like prefetched one.
+
+    Returns:
+        Text stream of CSV content.
+
+    Raises:
+        ValueError: If zstd support isn't available.
+    """
+
+    if is_stdin(file):
+        return _StdinText(sys.stdin.buffer, encoding, newline="")
+
+    suffix = file.suffix
+
+    if raw is not None:
+        return _open_raw(raw, suffix, encoding)
+
+    if suffix in (".gz", ".zst"):
+        magic, factory = (
+            (GZIP_MAGIC, _gzip_decompressor)
+            if suffix == ".gz"
+            else (ZSTD_MAGIC, _zstd_decompressor)
+        )
+        raw = _parallel_reader(file, magic, factory)
+        if raw is not None:
+            return io.TextIOWrapper(io.BufferedReader(raw), encoding, newline="")
+        if suffix == ".gz":
+            return gzip.open(file, "rt", encoding=encoding, newline="")
+        return _zstd_module().open(file, "rt", encoding=encoding, newline="")
+
+    if suffix == ".bz2":
+        return bz2.open(file, "rt", encoding=encoding, newline="")
+
+    if suffix == ".xz":
+        return lzma.open(file, "rt", encoding=encoding, newline="")
+
+    return open(file, "r", encoding=encoding, newline="")
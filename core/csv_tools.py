@@ -1,13 +1,156 @@
 import csv
+import io
+import random
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, TextIO
 
+from .compression import is_csv_path, is_stdin, open_text
 from .logger import log
+from .prefetch import Prefetcher
+from .records import record_type
+from .sampling import Sample, reservoir_sample
+from .schema import DEFAULT_SAMPLE_SIZE, ColumnType, Schema
+from .sketches import ColumnSketch
+from .tokenizer import read_columns, read_rows
+from .validation import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_ERRORS,
+    ErrorPolicy,
+    Quarantine,
+    RowError,
+    ValidationResult,
+    validate_batch,
+)
 
 
 class CsvReader:
-    def __init__(self, file: Path, delimiter: str = ","):
+    def __init__(
+        self,
+        file: Path,
+        delimiter: str = ",",
+        schema: Optional[Schema] = None,
+        infer_schema: bool = False,
+        max_errors: int = DEFAULT_MAX_ERRORS,
+        on_error: ErrorPolicy = ErrorPolicy.FAIL,
+        quarantine: Optional[Quarantine] = None,
+        prefetcher: Optional[Prefetcher] = None,
+        records: bool = False,
+        content: Optional[bytes] = None,
+    ):
         self.file = file
         self.delimiter = delimiter
+        self.schema = schema
+        self.infer_schema = infer_schema
+        self.max_errors = max_errors
+        self.on_error = on_error
+        self.quarantine = quarantine
+        self.prefetcher = prefetcher
+        self.records = records
+        self.content = content
+        self.rows_read = 0
+        self.rows_rejected = 0
+
+    @property
+    def is_stdin(self) -> bool:
+        """Whether reader streams standard input."""
+
+        return is_stdin(self.file)
+
+    def _check_path(self) -> None:
+        if self.is_stdin:
+            return
+
+        if not self.file.is_file():
+            error_msg = f"File {self.file} does not exist!"
+            raise FileNotFoundError(error_msg)
+
+        if not is_csv_path(self.file):
+            error_msg = f"File {self.file} is not a CSV file!"
+            raise ValueError(error_msg)
+
+    def _open(self) -> TextIO:
+        if self.content is not None:
+            return open_text(self.file, raw=io.BytesIO(self.content))
+
+        raw = None
+        if self.prefetcher is not None and not self.is_stdin:
+            raw = self.prefetcher.take(self.file)
+
+        return open_text(self.file, raw=raw)
+
+    def _read_columns(self) -> tuple[list[str], dict[str, list[Any]]]:
+        with self._open() as csvfile:
+            header, columns = read_columns(csvfile, self.delimiter)
+
+        sample = list(zip(*(values[:DEFAULT_SAMPLE_SIZE] for values in columns)))
+        self._resolve_schema(header, sample)
+
+        return header, self._typed_columns(header, columns)
+
+    def _resolve_schema(
+        self, header: list[str], rows: list[list[str]]
+    ) -> Optional[Schema]:
+        if self.schema is None and self.infer_schema:
+            self.schema = Schema.infer(header, rows[:DEFAULT_SAMPLE_SIZE])
+
+        return self.schema
+
+    def _convert_columns(
+        self, header: list[str], rows: list[list[str]]
+    ) -> dict[str, list[Any]]:
+        columns = list(zip(*rows)) or [()] * len(header)
+        self._resolve_schema(header, rows)
+
+        return self._typed_columns(header, columns)
+
+    def _typed_columns(
+        self, header: list[str], columns: Sequence[Sequence[str]]
+    ) -> dict[str, list[Any]]:
+        if self.schema is None:
+            return {name: list(values) for name, values in zip(header, columns)}
+
+        return {
+            name: self.schema.convert_column(name, values)
+            for name, values in zip(header, columns)
+        }
+
+    def _to_dicts(
+        self, header: list[str], rows: list[list[str]]
+    ) -> list[dict[str, Any]]:
+        return self._columns_to_dicts(header, self._convert_columns(header, rows))
+
+    def _columns_to_dicts(
+        self, header: list[str], columns: dict[str, list[Any]]
+    ) -> list[dict[str, Any]]:
+        if self.records:
+            return list(map(record_type(header), zip(*columns.values())))
+
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    def _position(self, header: list[str], name: str) -> int:
+        if name not in header:
+            error_msg = f"Column '{name}' isn't found in {self.file}!"
+            raise ValueError(error_msg)
+
+        return header.index(name)
+
+    def _numeric_converter(self, name: str) -> Optional[Callable[[str], float]]:
+        if self.schema is None:
+            return None
+
+        if self.schema.column_type(name) in (ColumnType.INT, ColumnType.FLOAT):
+            return float
+
+        return None
+
+    @staticmethod
+    def _check_schema_columns(header: list[str], schema: Schema) -> None:
+        missing = [name for name in schema.types if name not in header]
+        if missing:
+            error_msg = f"Columns {', '.join(missing)} from schema are missing!"
+            raise csv.Error(error_msg)
 
     @property
     @log
@@ -24,46 +167,316 @@ class CsvReader:
             csv.Error: If file validation fails.
         """
 
-        if not self.file.is_file():
-            error_msg = f"File {self.file} does not exist!"
-            raise FileNotFoundError(error_msg)
-
-        if not self.file.suffix == ".csv":
-            error_msg = f"File {self.file} is not a CSV file!"
-            raise ValueError(error_msg)
+        self._check_path()
 
-        with open(self.file, "r", encoding="utf-8") as csvfile:
-            reader = csv.reader(csvfile, delimiter=self.delimiter)
-            header = next(reader)
-            header_count = len(header)
-            rows = list(reader)
+        result = self.validate(self.max_errors)
 
-            if len(rows) == 0:
-                error_msg = f"CSV file {self.file} is empty!"
-                raise csv.Error(error_msg)
+        if result.rows == 0:
+            error_msg = f"CSV file {self.file} is empty!"
+            raise csv.Error(error_msg)
 
-            for row in rows:
-                if len(row) != header_count:
-                    error_msg = f"More or less columns than headers in row: {row}"
-                    raise csv.Error(error_msg)
-                for value in row:
-                    if not value:
-                        error_msg = f"Empty value in row: {row}"
-                        raise csv.Error(error_msg)
+        if not result.is_valid:
+            raise csv.Error(str(result))
 
-            return f"CSV file {self.file} is valid with {len(rows)} rows."
+        return f"CSV file {self.file} is valid with {result.rows} rows."
 
     @property
     @log
-    def load_csv(self) -> list[dict[str, str]]:
+    def load_csv(self) -> list[dict[str, Any]]:
         """
         Loading CSV file.
 
-        Returns: List of dictionaries from CSV file.
+        Returns: List of dictionaries from CSV file, or records in record mode,
+            values are converted when schema is set.
+        """
+
+        if self.schema is None and not self.infer_schema and not self.records:
+            with self._open() as f:
+                reader = csv.DictReader(f, delimiter=self.delimiter)
+                data = list(reader)
+
+            return data
+
+        header, columns = self._read_columns()
+
+        return self._columns_to_dicts(header, columns)
+
+    @property
+    @log
+    def load_columns(self) -> dict[str, list[Any]]:
+        """
+        Loading CSV file by columns.
+
+        Returns: Dictionary of column name to list of values,
+            values are converted when schema is set.
+        """
+
+        return self._read_columns()[1]
+
+    @log
+    def validate(
+        self, max_errors: int = DEFAULT_MAX_ERRORS, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> ValidationResult:
+        """
+        Validating CSV file by batches of rows.
+
+        Args:
+            max_errors: Number of errors to stop validation at.
+            batch_size: Number of rows checked at once.
+
+        Returns:
+            Validation result with rows count and errors with row numbers.
+
+        Raises:
+            csv.Error: If columns from schema are missing in header.
+        """
+
+        errors = []
+        rows_count = 0
+
+        with self._open() as csvfile:
+            reader = read_rows(csvfile, self.delimiter)
+            header = next(reader, [])
+
+            while len(errors) < max_errors:
+                batch = list(islice(reader, batch_size))
+                if not batch:
+                    break
+
+                schema = self.schema
+                if rows_count == 0:
+                    schema = self._resolve_schema(
+                        header, [row for row in batch if len(row) == len(header)]
+                    )
+                    if schema is not None:
+                        self._check_schema_columns(header, schema)
+
+                errors += validate_batch(
+                    header, batch, rows_count + 1, schema, max_errors - len(errors)
+                )
+                rows_count += len(batch)
+
+        return ValidationResult(rows_count, errors, max_errors)
+
+    def _reject(
+        self, errors: list[RowError], batch: list[list[str]], first_row: int
+    ) -> None:
+        if self.on_error is ErrorPolicy.FAIL:
+            raise csv.Error(str(errors[0]))
+
+        self.rows_rejected += len(errors)
+
+        if self.on_error is ErrorPolicy.QUARANTINE and self.quarantine is not None:
+            for error in errors:
+                self.quarantine.write(
+                    self.file,
+                    error.row,
+                    error.message,
+                    batch[error.row - first_row],
+                    self.delimiter,
+                )
+
+    @log
+    def iter_batches(
+        self, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[dict[str, list[Any]]]:
+        """
+        Streaming validated column batches of CSV file in a single pass.
+
+        Rows are validated and converted by batches, so memory doesn't depend
+        on file size. Invalid rows are handled by on_error policy.
+
+        Args:
+            batch_size: Number of rows validated and converted at once.
+
+        Yields: Dictionaries of column name to values of batch rows,
+            values are converted when schema is set.
+
+        Raises:
+            FileNotFoundError: If csv file does not exist.
+            ValueError: If file is not a csv file.
+            csv.Error: If row validation fails with fail policy or file is empty.
+        """
+
+        self._check_path()
+        self.rows_read = 0
+        self.rows_rejected = 0
+        first_row = 1
+
+        with self._open() as csvfile:
+            reader = read_rows(csvfile, self.delimiter)
+            header = next(reader, [])
+
+            while batch := list(islice(reader, batch_size)):
+                if first_row == 1:
+                    schema = self._resolve_schema(
+                        header, [row for row in batch if len(row) == len(header)]
+                    )
+                    if schema is not None:
+                        self._check_schema_columns(header, schema)
+
+                errors = validate_batch(header, batch, first_row, schema)
+                valid = batch
+                if errors:
+                    self._reject(errors, batch, first_row)
+                    rejected = {error.row - first_row for error in errors}
+                    valid = [r for i, r in enumerate(batch) if i not in rejected]
+
+                first_row += len(batch)
+                self.rows_read += len(valid)
+                if valid:
+                    yield self._convert_columns(header, valid)
+
+        if not self.rows_read and not self.rows_rejected:
+            error_msg = f"CSV file {self.file} is empty!"
+            raise csv.Error(error_msg)
+
+    def batch_rows(self, columns: dict[str, list[Any]]) -> Iterator[dict[str, Any]]:
+        """
+        Iterating rows of column batch.
+
+        Args:
+            columns: Dictionary of column name to values, like from iter_batches.
+
+        Yields: Dictionaries, or records in record mode.
+        """
+
+        rows = zip(*columns.values())
+        if self.records:
+            yield from map(record_type(list(columns)), rows)
+        else:
+            yield from (dict(zip(columns, values)) for values in rows)
+
+    @log
+    def iter_rows(
+        self, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Streaming validated rows of CSV file in a single pass.
+
+        Args:
+            batch_size: Number of rows validated and converted at once.
+
+        Yields: Dictionaries from CSV file, or records in record mode,
+            values are converted when schema is set.
+
+        Raises:
+            FileNotFoundError: If csv file does not exist.
+            ValueError: If file is not a csv file.
+            csv.Error: If row validation fails with fail policy or file is empty.
         """
 
-        with open(self.file, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f, delimiter=self.delimiter)
-            data = list(reader)
+        for columns in self.iter_batches(batch_size):
+            yield from self.batch_rows(columns)
+
+    @log
+    def load_sample(
+        self,
+        size: int,
+        stratify_by: Optional[str] = None,
+        sketch_columns: Sequence[str] = (),
+        seed: Optional[int] = None,
+    ) -> Sample:
+        """
+        Loading random sample of CSV file rows.
+
+        Rows are streamed once, only sampled rows are kept, validated and
+        converted. Rows with wrong field count and invalid sampled rows are
+        handled by on_error policy, so errors in rows outside the sample
+        aren't found.
+
+        Args:
+            size: Number of sampled rows, per stratum when stratified.
+            stratify_by: Column to draw separate reservoir for each value.
+            sketch_columns: Columns to build distinct count and quantile sketches.
+            seed: Random seed.
+
+        Returns:
+            Sample of rows with population sizes.
+
+        Raises:
+            ValueError: If column isn't found in file.
+            csv.Error: If row is invalid with fail policy.
+        """
+
+        self.rows_rejected = 0
+
+        with self._open() as csvfile:
+            reader = read_rows(csvfile, self.delimiter)
+            header = next(reader, [])
+            head = list(islice(reader, DEFAULT_SAMPLE_SIZE))
+            self._resolve_schema(header, [r for r in head if len(r) == len(header)])
+
+            sketches = {
+                name: ColumnSketch(self._numeric_converter(name))
+                for name in sketch_columns
+            }
+            positions = [
+                (self._position(header, name), sketch)
+                for name, sketch in sketches.items()
+            ]
+            key = None
+            if stratify_by is not None:
+                key = partial(_stratum, self._position(header, stratify_by))
+
+            rows = self._complete_rows(len(header), chain(head, reader))
+            if positions:
+                rows = _sketch_rows(rows, positions)
+
+            strata, totals = reservoir_sample(rows, size, key, random.Random(seed))
+
+        return Sample(
+            strata={
+                stratum: self._valid_sample(header, stratum_rows, totals, stratum)
+                for stratum, stratum_rows in strata.items()
+            },
+            totals=totals,
+            size=size,
+            stratify_by=stratify_by,
+            sketches=sketches,
+        )
+
+    def _complete_rows(
+        self, columns: int, rows: Iterable[list[str]]
+    ) -> Iterator[tuple[int, list[str]]]:
+        for number, row in enumerate(rows, 1):
+            if len(row) == columns:
+                yield number, row
+                continue
+            error = RowError(number, f"More or less columns in row: {row}")
+            self._reject([error], [row], number)
+
+    def _valid_sample(
+        self,
+        header: list[str],
+        sampled: list[tuple[int, list[str]]],
+        totals: dict[Any, int],
+        stratum: Any,
+    ) -> list[dict[str, Any]]:
+        rows = [row for _, row in sampled]
+        errors = validate_batch(header, rows, 0, self.schema)
+        for error in errors:
+            number, row = sampled[error.row]
+            error.row = number
+            self._reject([error], [row], number)
+
+        if errors:
+            invalid = {error.row for error in errors}
+            rows = [row for number, row in sampled if number not in invalid]
+            # rejected share of the sample is taken out of the population
+            totals[stratum] = round(totals[stratum] * len(rows) / len(sampled))
+
+        return self._to_dicts(header, rows)
+
+
+def _stratum(position: int, item: tuple[int, list[str]]) -> str:
+    return item[1][position]
+
 
-        return data
+def _sketch_rows(
+    rows: Iterable[tuple[int, list[str]]], positions: list[tuple[int, ColumnSketch]]
+) -> Iterator[tuple[int, list[str]]]:
+    for item in rows:
+        for position, sketch in positions:
+            sketch.add(item[1][position])
+        yield item
@@ -0,0 +1,381 @@
+from collections import defaultdict
+from operator import mul
+from typing import Any, Hashable, Iterable, Iterator, Optional, Sequence
+
+from .aggregation import AggregateState, GroupAggregator
+from .logger import log
+from .reports import BaseReport
+from .rollups import Rollup, merge_rollups
+from .shortcuts import to_number
+
+NUMBER_TYPES = {int, float}
+AGGREGATIONS = {
+    "mean": ("average", lambda state: state.mean),
+    "sum": ("sum", lambda state: state.sum),
+    "min": ("min", lambda state: state.min),
+    "max": ("max", lambda state: state.max),
+    "count": ("count", lambda state: state.count),
+    "wmean": ("weighted", None),
+}
+SORT_ORDERS = ("desc", "asc")
+SPEC_KEYS = {"group_by", "agg", "weights", "sort", "sort_by", "limit"}
+
+PRODUCT = "product"
+WEIGHT = "weight"
+
+
+class ReportSpec:
+    """
+    Declarative definition of grouped aggregation report.
+
+    Weighted mean (wmean) of column needs its weight column in weights,
+    it's computed as sum of value * weight divided by sum of weight.
+    """
+
+    def __init__(
+        self,
+        group_by: Sequence[str],
+        agg: dict[str, str | Sequence[str]],
+        sort: str = "desc",
+        sort_by: Optional[str] = None,
+        limit: Optional[int] = None,
+        weights: Optional[dict[str, str]] = None,
+    ):
+        if isinstance(group_by, str) or not all(
+            isinstance(name, str) for name in group_by
+        ):
+            error_msg = (
+                f"Report spec group_by must be a list of columns, got {group_by!r}."
+            )
+            raise ValueError(error_msg)
+
+        if not isinstance(agg, dict):
+            error_msg = f"Report spec agg must be a table of columns, got {agg!r}."
+            raise ValueError(error_msg)
+
+        self.group_by = tuple(group_by)
+        self.agg = agg
+        self.weights = dict(weights or {})
+        self.metrics = [
+            (column, func)
+            for column, funcs in agg.items()
+            for func in ([funcs] if isinstance(funcs, str) else funcs)
+        ]
+
+        unknown = [func for _, func in self.metrics if func not in AGGREGATIONS]
+        if not self.group_by or not self.metrics or unknown:
+            error_msg = (
+                "Report spec needs group_by and agg with functions "
+                f"{', '.join(AGGREGATIONS)}, got {', '.join(unknown) or 'nothing'}."
+            )
+            raise ValueError(error_msg)
+
+        unweighted = [
+            c for c, f in self.metrics if f == "wmean" and c not in self.weights
+        ]
+        if unweighted:
+            error_msg = (
+                f"Report spec needs weights for wmean of {', '.join(unweighted)}."
+            )
+            raise ValueError(error_msg)
+
+        if sort not in SORT_ORDERS:
+            error_msg = f"Report spec sort must be one of {', '.join(SORT_ORDERS)}."
+            raise ValueError(error_msg)
+
+        self.sort = sort
+        self.sort_by = sort_by or self.output_name(*self.metrics[0])
+        self.limit = limit
+
+        outputs = [*self.group_by, *(self.output_name(*m) for m in self.metrics)]
+        if self.sort_by not in outputs:
+            error_msg = (
+                f"Report spec sort_by must be one of {', '.join(outputs)}, "
+                f"got {self.sort_by!r}."
+            )
+            raise ValueError(error_msg)
+
+    @staticmethod
+    def output_name(column: str, func: str) -> str:
+        """Name of output column for aggregated column."""
+
+        return f"{AGGREGATIONS[func][0]}_{column}"
+
+    @property
+    def columns(self) -> list[str]:
+        """Distinct aggregated columns without weighted ones."""
+
+        return list(
+            dict.fromkeys(column for column, func in self.metrics if func != "wmean")
+        )
+
+    @property
+    def series(self) -> list[tuple[str, ...]]:
+        """
+        Aggregated series: (column,) for plain values, (column, weight, product)
+        and (column, weight, weight) for weighted means.
+        """
+
+        series: list[tuple[str, ...]] = [(column,) for column in self.columns]
+        for column, func in dict.fromkeys(self.metrics):
+            if func == "wmean":
+                weight = self.weights[column]
+                series += [(column, weight, PRODUCT), (column, weight, WEIGHT)]
+
+        return series
+
+    def regrouped(self, group_by: Sequence[str]) -> "ReportSpec":
+        """Copy of spec with other group columns, sorted by default when sort column is dropped."""
+
+        sort_by = self.sort_by
+        if sort_by in self.group_by and sort_by not in group_by:
+            sort_by = None
+
+        return ReportSpec(
+            group_by, self.agg, self.sort, sort_by, self.limit, self.weights
+        )
+
+    @classmethod
+    def from_dict(cls, content: dict[str, Any]) -> "ReportSpec":
+        """
+        Creating spec from parsed TOML or JSON table.
+
+        Raises:
+            ValueError: If table has unknown keys or values.
+        """
+
+        if not isinstance(content, dict):
+            error_msg = f"Report spec must be a table, got {content!r}."
+            raise ValueError(error_msg)
+
+        unknown = set(content) - SPEC_KEYS
+        if unknown:
+            error_msg = f"Unknown report spec keys: {', '.join(sorted(unknown))}."
+            raise ValueError(error_msg)
+
+        return cls(**content)
+
+
+def _group_value(value: Any) -> Any:
+    return value.strip() if isinstance(value, str) else value
+
+
+def _series_value(
+    series: tuple[str, ...], values: dict[str, Any]
+) -> Optional[int | float]:
+    if len(series) == 1:
+        return values[series[0]]
+
+    column, weight, role = series
+    if values[column] is None or values[weight] is None:
+        return None
+    if role == PRODUCT:
+        return values[column] * values[weight]
+    return values[weight]
+
+
+def _series_column(series: tuple[str, ...], columns: dict[str, list[Any]]) -> list[Any]:
+    if len(series) == 1:
+        return columns[series[0]]
+
+    column, weight, role = series
+    if role == PRODUCT:
+        return list(map(mul, columns[column], columns[weight]))
+    return columns[weight]
+
+
+class DeclarativeReport(BaseReport):
+    """
+    Report compiled from ReportSpec.
+
+    Answers from rollups when they cover the spec, from whole columns when
+    inputs are loaded by columns, and from a single-pass stream otherwise.
+    All metrics are aggregated in the same pass.
+    """
+
+    spec: ReportSpec
+
+    def __init__(
+        self,
+        memory_limit: Optional[int] = None,
+        group_by: Optional[Sequence[str]] = None,
+    ):
+        super().__init__(memory_limit)
+        if group_by:
+            self.spec = self.spec.regrouped(group_by)
+
+    @property
+    def result_key(self) -> tuple[str, ...]:
+        """Group columns identifying result rows."""
+
+        return self.spec.group_by
+
+    @classmethod
+    def for_spec(cls, name: str, spec: ReportSpec) -> type["DeclarativeReport"]:
+        """Creating report class for spec."""
+
+        class_name = "".join(part.title() for part in name.split("-")) + "Report"
+        return type(class_name, (cls,), {"spec": spec, "__doc__": f"Report {name}."})
+
+    def _metric_value(
+        self, column: str, func: str, states: dict[tuple[str, ...], AggregateState]
+    ) -> Optional[int | float]:
+        if func != "wmean":
+            return AGGREGATIONS[func][1](states[(column,)])
+
+        weight = self.spec.weights[column]
+        total = states[(column, weight, WEIGHT)].sum
+        if not total:
+            return None
+        return states[(column, weight, PRODUCT)].sum / total
+
+    def _report_rows(
+        self, states: Iterable[tuple[tuple, dict[tuple[str, ...], AggregateState]]]
+    ) -> list[dict[str, Any]]:
+        report_data = []
+        for key, series_states in states:
+            row = dict(zip(self.spec.group_by, key))
+            for column, func in self.spec.metrics:
+                value = self._metric_value(column, func, series_states)
+                if isinstance(value, float):
+                    value = round(value, 2)
+                row[ReportSpec.output_name(column, func)] = value
+            report_data.append(row)
+
+        report_data.sort(
+            key=lambda x: (x[self.spec.sort_by] is not None, x[self.spec.sort_by]),
+            reverse=self.spec.sort == "desc",
+        )
+
+        return report_data[: self.spec.limit]
+
+    def _empty_states(self) -> dict[tuple[str, ...], AggregateState]:
+        return {series: AggregateState() for series in self.spec.series}
+
+    def _row_series(
+        self, data: Iterable[dict[str, Any]]
+    ) -> Iterator[tuple[tuple[tuple[str, ...], tuple], int | float]]:
+        group_by = self.spec.group_by
+        series = self.spec.series
+        inputs = list(dict.fromkeys(name for item in series for name in item[:2]))
+
+        for row in data:
+            if any(name not in row for name in group_by):
+                continue
+            key = tuple(_group_value(row[name]) for name in group_by)
+            values = {name: to_number(row.get(name)) for name in inputs}
+            for item in series:
+                value = _series_value(item, values)
+                if value is not None:
+                    yield (item, key), value
+
+    @log
+    def generate(self, data: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Generating report from stream of rows.
+
+        Args:
+            data: Rows from all CSV files, list or single-pass stream.
+
+        Returns:
+            List of dictionaries with group columns and aggregates.
+        """
+
+        with self.aggregator() as aggregator:
+            self.aggregate(data, aggregator)
+            return self.from_states(aggregator.items())
+
+    def aggregate(
+        self, data: Iterable[dict[str, Any]], aggregator: GroupAggregator
+    ) -> None:
+        """Aggregating states keyed by series and group key."""
+
+        for series_key, value in self._row_series(data):
+            aggregator.add(series_key, value)
+
+    def from_states(
+        self, states: Iterable[tuple[Hashable, AggregateState]]
+    ) -> list[dict[str, Any]]:
+        """Generating report from states keyed by series and group key."""
+
+        groups: dict[tuple, dict[tuple[str, ...], AggregateState]] = defaultdict(
+            self._empty_states
+        )
+        for (series, key), state in states:
+            groups[key][series] = state
+
+        return self._report_rows(groups.items())
+
+    @log
+    def generate_columns(
+        self, columns: dict[str, list[Any]]
+    ) -> Optional[list[dict[str, Any]]]:
+        """
+        Generating report from whole typed columns.
+
+        Rows are grouped once, then every series is aggregated by batches.
+
+        Args:
+            columns: Dictionary of column name to converted values.
+
+        Returns:
+            List of dictionaries with group columns and aggregates,
+            or None if some column is missing or not numeric.
+        """
+
+        series = self.spec.series
+        inputs = list(dict.fromkeys(name for item in series for name in item[:2]))
+        if any(name not in columns for name in self.spec.group_by + tuple(inputs)):
+            return None
+
+        # files have own schemas, so strings of one file may follow numbers of another
+        if any(not set(map(type, columns[name])) <= NUMBER_TYPES for name in inputs):
+            return None
+
+        keys = zip(*(map(_group_value, columns[name]) for name in self.spec.group_by))
+        positions: dict[tuple, list[int]] = defaultdict(list)
+        for position, key in enumerate(keys):
+            positions[key].append(position)
+
+        series_columns = {item: _series_column(item, columns) for item in series}
+
+        states = []
+        for key, indexes in positions.items():
+            series_states = self._empty_states()
+            for item, state in series_states.items():
+                values = series_columns[item]
+                state.update([values[index] for index in indexes])
+            states.append((key, series_states))
+
+        return self._report_rows(states)
+
+    @log
+    def from_rollups(self, rollups: list[Rollup]) -> Optional[list[dict[str, Any]]]:
+        """
+        Generating report from rollups.
+
+        Args:
+            rollups: Rollups of all input files.
+
+        Returns:
+            List of dictionaries or None if rollups don't cover spec,
+            weighted means are never covered.
+        """
+
+        if any(func == "wmean" for _, func in self.spec.metrics) or not all(
+            rollup.covers(self.spec.group_by, column)
+            for rollup in rollups
+            for column in self.spec.columns
+        ):
+            return None
+
+        groups: dict[tuple, dict[tuple[str, ...], AggregateState]] = defaultdict(
+            self._empty_states
+        )
+        for column in self.spec.columns:
+            for key, state in merge_rollups(
+                rollups, self.spec.group_by, column
+            ).items():
+                groups[tuple(map(_group_value, key))][(column,)].merge(state)
+
+        return self._report_rows(groups.items())
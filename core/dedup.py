@@ -0,0 +1,343 @@
+import heapq
+import os
+import pickle
+import tempfile
+import time
+from array import array
+from hashlib import blake2b
+from bisect import bisect_left
+from enum import Enum
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+from .aggregation import DEFAULT_PARTITIONS
+from .csv_tools import CsvReader
+from .logger import log
+
+DEFAULT_DEDUP_KEY = ("country", "year")
+# Bytes of key in index arrays and of key while keys of source are sorted, measured with tracemalloc
+KEY_SIZE = 16
+SORT_KEY_SIZE = 60
+KEY_MASK = 2**64 - 1
+SPILL_BATCH_SIZE = 4096
+
+Key = tuple[int, int]
+
+
+class DedupPolicy(Enum):
+    """Which file wins when the same key appears in several files."""
+
+    LAST_FILE = "last-file"
+    NEWEST_MTIME = "newest-mtime"
+
+
+def _mtime(reader: CsvReader) -> float:
+    if reader.is_stdin:
+        return time.time()
+    return os.stat(reader.file).st_mtime
+
+
+@log
+def priority_order(
+    readers: Sequence[CsvReader], policy: DedupPolicy = DedupPolicy.LAST_FILE
+) -> list[CsvReader]:
+    """
+    Ordering readers from winning to losing file.
+
+    Args:
+        readers: Readers in input order.
+        policy: Dedup policy, stdin counts as the newest file.
+
+    Returns:
+        Readers ordered by priority, ties are won by later files.
+    """
+
+    ordered = list(reversed(readers))
+    if policy is DedupPolicy.NEWEST_MTIME:
+        ordered.sort(key=_mtime, reverse=True)
+    return ordered
+
+
+def _arrays(keys: Iterable[Key]) -> tuple[array, array]:
+    hashes, checks = array("q"), array("q")
+    for key_hash, check in keys:
+        hashes.append(key_hash)
+        checks.append(check)
+    return hashes, checks
+
+
+def _join(key_hash: int, check: int) -> int:
+    return (key_hash << 64) | (check & KEY_MASK)
+
+
+def _split(joined: int) -> Key:
+    check = joined & KEY_MASK
+    return joined >> 64, check - (1 << 64) if check >> 63 else check
+
+
+class _KeyIndex:
+    """
+    Set of keys of committed sources and of current source.
+
+    Key is 128-bit digest split into 64-bit hash, which is searched,
+    and 64-bit check compared on hash hits, both kept in arrays.
+    Keys of source are sorted as single ints when committed.
+    """
+
+    __slots__ = ("claimed", "current")
+
+    def __init__(
+        self,
+        claimed: Optional[tuple[array, array]] = None,
+        current: Optional[tuple[array, array]] = None,
+    ):
+        self.claimed = _arrays(()) if claimed is None else claimed
+        self.current = _arrays(()) if current is None else current
+
+    def __len__(self) -> int:
+        return len(self.claimed[0]) + len(self.current[0])
+
+    @property
+    def memory(self) -> int:
+        """Peak bytes of index at next commit, claimed arrays are copied while merged."""
+
+        claimed, current = len(self.claimed[0]), len(self.current[0])
+        return KEY_SIZE * (2 * claimed + current) + SORT_KEY_SIZE * current
+
+    def __contains__(self, key: Key) -> bool:
+        hashes, checks = self.claimed
+        key_hash, check = key
+        position = bisect_left(hashes, key_hash)
+        while position < len(hashes) and hashes[position] == key_hash:
+            if checks[position] == check:
+                return True
+            position += 1
+        return False
+
+    def add(self, key: Key) -> None:
+        self.current[0].append(key[0])
+        self.current[1].append(key[1])
+
+    def commit(self) -> None:
+        current = sorted(map(_join, *self.current))
+        self.current = _arrays(())
+        merged = heapq.merge(map(_join, *self.claimed), current)
+        self.claimed = _arrays(map(_split, (joined for joined, _ in groupby(merged))))
+
+
+class _Spill:
+    """
+    Rows and index partitioned by key hash in temporary files.
+
+    Partition spilled again is split by next digits of hash in base of partitions.
+    """
+
+    def __init__(self, partitions: int, level: int = 0):
+        self.partitions = partitions
+        self.level = level
+        self._divisor = partitions**level
+        self._dir = tempfile.TemporaryDirectory(prefix="csv_dedup_")
+        self._buffers: list[list[tuple[int, Key, dict[str, Any]]]] = [
+            [] for _ in range(partitions)
+        ]
+        self._index: list[tuple[tuple[array, array], tuple[array, array], int]] = []
+
+    def _path(self, partition: int) -> Path:
+        return Path(self._dir.name) / f"partition_{partition}.pickle"
+
+    @property
+    def can_split(self) -> bool:
+        """Whether partitions can be split again by unused digits of hash."""
+
+        return self.partitions > 1 and self._divisor * self.partitions < 1 << 64
+
+    def _partition(self, key: Key) -> int:
+        return key[0] // self._divisor % self.partitions
+
+    def save_index(self, index: _KeyIndex, rank: int) -> None:
+        for partition in range(self.partitions):
+            claimed = _arrays(
+                key for key in zip(*index.claimed) if self._partition(key) == partition
+            )
+            current = _arrays(
+                key for key in zip(*index.current) if self._partition(key) == partition
+            )
+            self._index.append((claimed, current, rank))
+
+    def write(self, rank: int, key: Key, row: dict[str, Any]) -> None:
+        partition = self._partition(key)
+        buffer = self._buffers[partition]
+        buffer.append((rank, key, row))
+        if len(buffer) >= SPILL_BATCH_SIZE:
+            self._flush(partition)
+
+    def _flush(self, partition: int) -> None:
+        with open(self._path(partition), "ab") as f:
+            pickle.dump(self._buffers[partition], f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._buffers[partition] = []
+
+    def _rows(self, partition: int) -> Iterator[tuple[int, Key, dict[str, Any]]]:
+        path = self._path(partition)
+        if path.exists():
+            with open(path, "rb") as f:
+                while True:
+                    try:
+                        yield from pickle.load(f)
+                    except EOFError:
+                        break
+            path.unlink()
+
+    def partitions_data(
+        self,
+    ) -> Iterator[tuple[_KeyIndex, int, Iterator[tuple[int, Key, dict[str, Any]]]]]:
+        """Iterating index, its current rank and spilled rows of every partition."""
+
+        for partition in range(self.partitions):
+            if self._buffers[partition]:
+                self._flush(partition)
+            claimed, current, rank = self._index[partition]
+            self._index[partition] = (_arrays(()), _arrays(()), rank)
+            yield _KeyIndex(claimed, current), rank, self._rows(partition)
+
+    def close(self) -> None:
+        self._dir.cleanup()
+
+
+class Deduplicator:
+    """
+    Keyed dedup of rows across files within memory budget.
+
+    Sources are streamed from winning to losing one, a row is dropped
+    if its key was seen in a higher priority source. Duplicates within
+    one source are kept. Keys are kept as sorted 128-bit blake2b digests, 16 bytes
+    per key plus sort buffer of keys of current source; when the index exceeds
+    the budget, remaining rows and the index are spilled to files partitioned
+    by key hash and deduplicated one partition at a time, so row order isn't
+    kept. Partition which index exceeds the budget is spilled again.
+    """
+
+    def __init__(
+        self,
+        key: Sequence[str] = DEFAULT_DEDUP_KEY,
+        memory_limit: Optional[int] = None,
+        partitions: int = DEFAULT_PARTITIONS,
+    ):
+        self.key = tuple(key)
+        self.memory_limit = memory_limit
+        self.partitions = partitions
+        self.duplicates = 0
+        self.spilled = False
+
+    def _key(self, row: dict[str, Any]) -> Key:
+        values = (row[name] for name in self.key)
+        digest = blake2b(
+            repr(
+                tuple(v.strip() if isinstance(v, str) else v for v in values)
+            ).encode(),
+            digest_size=16,
+        ).digest()
+        return (
+            int.from_bytes(digest[:8], "little", signed=True),
+            int.from_bytes(digest[8:], "little", signed=True),
+        )
+
+    def _checked(self, rows: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return
+
+        missing = [name for name in self.key if name not in first]
+        if missing:
+            error_msg = (
+                f"Dedup key columns {', '.join(missing)} aren't found, "
+                f"columns are {', '.join(first.keys())}."
+            )
+            raise ValueError(error_msg)
+
+        yield first
+        yield from rows
+
+    def _over_budget(self, index: _KeyIndex) -> bool:
+        return self.memory_limit is not None and index.memory > self.memory_limit
+
+    def _dedup_spill(self, spill: _Spill) -> Iterator[dict[str, Any]]:
+        for index, rank, rows in spill.partitions_data():
+            yield from self._dedup_partition(index, rank, rows, spill)
+
+    def _dedup_partition(
+        self,
+        index: _KeyIndex,
+        rank: int,
+        rows: Iterator[tuple[int, Key, dict[str, Any]]],
+        spill: _Spill,
+    ) -> Iterator[dict[str, Any]]:
+        again: Optional[_Spill] = None
+
+        try:
+            for row_rank, key, row in rows:
+                if again is not None:
+                    again.write(row_rank, key, row)
+                    continue
+                if row_rank != rank:
+                    index.commit()
+                    rank = row_rank
+                if key in index:
+                    self.duplicates += 1
+                    continue
+                index.add(key)
+                yield row
+                if spill.can_split and self._over_budget(index):
+                    again = _Spill(self.partitions, spill.level + 1)
+                    again.save_index(index, rank)
+                    index = _KeyIndex()
+
+            if again is not None:
+                yield from self._dedup_spill(again)
+        finally:
+            if again is not None:
+                again.close()
+
+    @log
+    def dedup(
+        self, sources: Iterable[Iterable[dict[str, Any]]]
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Streaming rows without keys seen in higher priority sources.
+
+        Args:
+            sources: Rows of every source ordered from winning to losing.
+
+        Yields: Rows which keys weren't claimed by previous sources.
+
+        Raises:
+            ValueError: If key column isn't found in rows of source.
+        """
+
+        index = _KeyIndex()
+        spill: Optional[_Spill] = None
+
+        try:
+            for rank, rows in enumerate(sources):
+                for row in self._checked(rows):
+                    key = self._key(row)
+                    if spill is not None:
+                        spill.write(rank, key, row)
+                    elif key in index:
+                        self.duplicates += 1
+                    else:
+                        index.add(key)
+                        yield row
+                        if self._over_budget(index):
+                            spill = _Spill(self.partitions)
+                            spill.save_index(index, rank)
+                            index = _KeyIndex()
+                            self.spilled = True
+                index.commit()
+
+            if spill is not None:
+                yield from self._dedup_spill(spill)
+        finally:
+            if spill is not None:
+                spill.close()
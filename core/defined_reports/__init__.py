@@ -1,4 +1,6 @@
-__all__ = ("AverageGDPReport",)
+__all__ = ("AverageGDPReport", "EconomySummaryReport", "GDPTrendsReport")
 
 
 from .average_gdp import AverageGDPReport
+from .economy_summary import EconomySummaryReport
+from .gdp_trends import GDPTrendsReport
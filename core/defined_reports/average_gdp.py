@@ -1,50 +1,142 @@
+import math
+import statistics
 from collections import defaultdict
-from typing import Any
+from typing import Any, Hashable, Iterable, Iterator, Optional
 
-from core import BaseReport, convert_to_number, is_numeric, log
+from core import BaseReport, log, to_number
+from core.aggregation import AggregateState, GroupAggregator
+from core.rollups import Rollup, merge_rollups
+from core.sampling import Sample
+
+Z_95 = 1.96
+
+
+def _margin(gdps: list[int | float], population: Optional[int]) -> Optional[float]:
+    if population is not None and len(gdps) >= population:
+        return 0.0
+    if len(gdps) < 2:
+        return None
+
+    margin = Z_95 * statistics.stdev(gdps) / math.sqrt(len(gdps))
+    if population is not None:
+        margin *= math.sqrt((population - len(gdps)) / (population - 1))
+
+    return round(margin, 2)
 
 
 class AverageGDPReport(BaseReport):
     """Report for average GDP by country."""
 
+    stratify_by = "country"
+    result_key = ("country",)
+    sketch_columns = ("country", "gdp")
+
+    @staticmethod
+    def _country_gdps(
+        data: Iterable[dict[str, Any]],
+    ) -> Iterator[tuple[str, int | float]]:
+        for row in data:
+            if "country" not in row or "gdp" not in row:
+                continue
+
+            gdp = to_number(row["gdp"])
+            if gdp is None:
+                continue
+
+            yield row["country"].strip(), gdp
+
+    @staticmethod
+    def _report_rows(averages: dict[str, float]) -> list[dict[str, Any]]:
+        report_data = [
+            {"country": country, "average_gdp": round(avg_gdp, 2)}
+            for country, avg_gdp in averages.items()
+        ]
+        report_data.sort(key=lambda x: x["average_gdp"], reverse=True)
+
+        return report_data
+
     @log
-    def generate(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def generate(self, data: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
         """
         Generating report with average GDP by country.
 
         Args:
-            data: Combined list of dictionaries from all CSV files.
+            data: Rows from all CSV files, list or single-pass stream,
+                gdp values may be already converted by schema.
 
         Returns:
             List of dictionaries with country and average_gdp,
             sorted by average_gdp desc.
         """
-        country_gdps = defaultdict(list)
 
-        for row in data:
-            if "country" not in row or "gdp" not in row:
-                continue
+        with self.aggregator() as aggregator:
+            self.aggregate(data, aggregator)
+            return self.from_states(aggregator.items())
 
-            country = row["country"].strip()
-            gdp_str = row["gdp"].strip()
+    def aggregate(
+        self, data: Iterable[dict[str, Any]], aggregator: GroupAggregator
+    ) -> None:
+        """Aggregating gdp states by country."""
 
-            if is_numeric(gdp_str):
-                gdp = convert_to_number(gdp_str)
-                country_gdps[country].append(gdp)
-            else:
-                continue
+        for country, gdp in self._country_gdps(data):
+            aggregator.add(country, gdp)
+
+    def from_states(
+        self, states: Iterable[tuple[Hashable, AggregateState]]
+    ) -> list[dict[str, Any]]:
+        """Generating report with average GDP by country from gdp states."""
+
+        return self._report_rows({country: state.mean for country, state in states})
+
+    @log
+    def estimate(self, sample: Sample) -> list[dict[str, Any]]:
+        """
+        Estimating average GDP by country from sample.
+
+        Args:
+            sample: Sample of rows, preferably stratified by country.
+
+        Returns:
+            List of dictionaries with country, average_gdp and margin
+            of 95% confidence interval, sorted by average_gdp desc.
+        """
 
         report_data = []
-        for country, gdps in country_gdps.items():
-            if gdps:
-                avg_gdp = sum(gdps) / len(gdps)
+        for stratum, rows in sample.strata.items():
+            population = sample.population(stratum)
+            country_gdps = defaultdict(list)
+            for country, gdp in self._country_gdps(rows):
+                country_gdps[country].append(gdp)
+            for country, gdps in country_gdps.items():
                 report_data.append(
                     {
                         "country": country,
-                        "average_gdp": round(avg_gdp, 2),
+                        "average_gdp": round(sum(gdps) / len(gdps), 2),
+                        "margin": _margin(gdps, population),
                     }
                 )
 
         report_data.sort(key=lambda x: x["average_gdp"], reverse=True)
 
         return report_data
+
+    @log
+    def from_rollups(self, rollups: list[Rollup]) -> Optional[list[dict[str, Any]]]:
+        """
+        Generating report with average GDP by country from rollups.
+
+        Args:
+            rollups: Rollups of all input files.
+
+        Returns:
+            List of dictionaries with country and average_gdp,
+            or None if some rollup doesn't cover country and gdp.
+        """
+
+        if not all(rollup.covers(("country",), "gdp") for rollup in rollups):
+            return None
+
+        states = merge_rollups(rollups, ("country",), "gdp")
+        averages = {country.strip(): state.mean for (country,), state in states.items()}
+
+        return self._report_rows(averages)
@@ -0,0 +1,18 @@
+from core.declarative import DeclarativeReport, ReportSpec
+
+
+class EconomySummaryReport(DeclarativeReport):
+    """Report for average GDP and growth, population weighted inflation,
+    average unemployment and total population by continent."""
+
+    spec = ReportSpec(
+        group_by=["continent"],
+        agg={
+            "gdp": "mean",
+            "gdp_growth": "mean",
+            "inflation": "wmean",
+            "unemployment": "mean",
+            "population": "sum",
+        },
+        weights={"inflation": "population"},
+    )
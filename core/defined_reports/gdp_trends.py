@@ -0,0 +1,152 @@
+from collections import deque
+from itertools import groupby
+from typing import Any, Hashable, Iterable, Iterator, Optional
+
+from core import BaseReport, log, to_number
+from core.aggregation import AggregateState, GroupAggregator
+from core.rollups import Rollup, merge_rollups
+
+DEFAULT_WINDOW = 3
+
+
+def _growth(previous: int | float, current: int | float) -> Optional[float]:
+    if not previous:
+        return None
+    return round((current / previous - 1) * 100, 2)
+
+
+def _cagr(first: int | float, current: int | float, years: int) -> Optional[float]:
+    if years <= 0 or first <= 0 or current <= 0:
+        return None
+    return round(((current / first) ** (1 / years) - 1) * 100, 2)
+
+
+class GDPTrendsReport(BaseReport):
+    """Report for GDP trends by country and year."""
+
+    result_key = ("country", "year")
+
+    def __init__(
+        self, memory_limit: Optional[int] = None, window: int = DEFAULT_WINDOW
+    ):
+        super().__init__(memory_limit)
+        if window < 1:
+            error_msg = f"Window must be at least 1 year, got {window}."
+            raise ValueError(error_msg)
+        self.window = window
+
+    @staticmethod
+    def _country_year_gdps(
+        data: Iterable[dict[str, Any]],
+    ) -> Iterator[tuple[tuple[str, int], int | float]]:
+        for row in data:
+            if "country" not in row or "year" not in row or "gdp" not in row:
+                continue
+
+            year = to_number(row["year"])
+            gdp = to_number(row["gdp"])
+            if year is None or gdp is None:
+                continue
+
+            yield (row["country"].strip(), int(year)), gdp
+
+    def _country_rows(
+        self, country: str, years: Iterable[tuple[int, float]]
+    ) -> Iterator[dict[str, Any]]:
+        window: deque[tuple[int, float]] = deque()
+        window_sum = 0.0
+        first: Optional[tuple[int, float]] = None
+        previous: Optional[tuple[int, float]] = None
+
+        for year, gdp in years:
+            if first is None:
+                first = (year, gdp)
+            window.append((year, gdp))
+            window_sum += gdp
+            while year - window[0][0] >= self.window:
+                window_sum -= window.popleft()[1]
+
+            yoy = None
+            if previous is not None and previous[0] == year - 1:
+                yoy = _growth(previous[1], gdp)
+            previous = (year, gdp)
+
+            yield {
+                "country": country,
+                "year": year,
+                "gdp": round(gdp, 2),
+                f"rolling_{self.window}y_gdp": round(window_sum / len(window), 2),
+                "yoy_growth_pct": yoy,
+                "cagr_pct": _cagr(first[1], gdp, year - first[0]),
+            }
+
+    def _report_rows(
+        self, gdps: Iterable[tuple[tuple[str, int], float]]
+    ) -> list[dict[str, Any]]:
+        report_data = []
+        for country, group in groupby(sorted(gdps), key=lambda item: item[0][0]):
+            years = ((year, gdp) for (_, year), gdp in group)
+            report_data.extend(self._country_rows(country, years))
+
+        return report_data
+
+    @log
+    def generate(self, data: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Generating report with GDP trends by country.
+
+        Duplicate rows of the same country and year are averaged.
+
+        Args:
+            data: Rows from all CSV files, list or single-pass stream,
+                year and gdp values may be already converted by schema.
+
+        Returns:
+            List of dictionaries with country, year, gdp, trailing mean
+            of gdp over window years, year over year growth and compound
+            annual growth since first year of country, sorted by country and year.
+        """
+
+        with self.aggregator() as aggregator:
+            self.aggregate(data, aggregator)
+            return self.from_states(aggregator.items())
+
+    def aggregate(
+        self, data: Iterable[dict[str, Any]], aggregator: GroupAggregator
+    ) -> None:
+        """Aggregating gdp states by country and year."""
+
+        for key, gdp in self._country_year_gdps(data):
+            aggregator.add(key, gdp)
+
+    def from_states(
+        self, states: Iterable[tuple[Hashable, AggregateState]]
+    ) -> list[dict[str, Any]]:
+        """Generating report with GDP trends from gdp states by country and year."""
+
+        return self._report_rows(
+            ((country, int(year)), state.mean) for (country, year), state in states
+        )
+
+    @log
+    def from_rollups(self, rollups: list[Rollup]) -> Optional[list[dict[str, Any]]]:
+        """
+        Generating report with GDP trends by country from rollups.
+
+        Args:
+            rollups: Rollups of all input files.
+
+        Returns:
+            List of dictionaries as from generate,
+            or None if some rollup doesn't cover country, year and gdp.
+        """
+
+        if not all(rollup.covers(("country", "year"), "gdp") for rollup in rollups):
+            return None
+
+        states = merge_rollups(rollups, ("country", "year"), "gdp")
+
+        return self._report_rows(
+            ((country.strip(), int(year)), state.mean)
+            for (country, year), state in states.items()
+        )
@@ -0,0 +1,225 @@
+import csv
+import hashlib
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+from .compression import is_csv_path, open_text
+from .logger import log
+
+MANIFEST_NAME = ".csv-report-manifest.json"
+DEFAULT_SCAN_WORKERS = 16
+
+
+class ManifestEntry:
+    """Size, modification time, header and validation status of file."""
+
+    __slots__ = ("path", "size", "mtime_ns", "header", "valid")
+
+    def __init__(
+        self,
+        path: Path,
+        size: int,
+        mtime_ns: int,
+        header: Sequence[str] = (),
+        valid: bool = False,
+    ):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.header = tuple(header)
+        self.valid = valid
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of column names regardless of their order."""
+
+        names = "\n".join(sorted(name.strip() for name in self.header))
+        return hashlib.blake2b(names.encode(), digest_size=8).hexdigest()
+
+    def same_file(self, size: int, mtime_ns: int) -> bool:
+        """Checking if file wasn't changed since entry was created."""
+
+        return self.size == size and self.mtime_ns == mtime_ns
+
+    def to_list(self) -> list[Any]:
+        """Serializing entry to list."""
+
+        return [str(self.path), self.size, self.mtime_ns, list(self.header), self.valid]
+
+    @classmethod
+    def from_list(cls, values: Sequence[Any]) -> "ManifestEntry":
+        """Deserializing entry from list."""
+
+        path, size, mtime_ns, header, valid = values
+        return cls(Path(path), size, mtime_ns, header, valid)
+
+
+def _scan_directory(
+    directory: Path, pattern: Optional[str]
+) -> tuple[list[tuple[Path, int, int]], list[Path]]:
+    files = []
+    subdirectories = []
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(Path(entry.path))
+            elif (
+                entry.is_file()
+                and is_csv_path(Path(entry.name))
+                and (pattern is None or fnmatch(entry.name, pattern))
+            ):
+                stat = entry.stat()
+                files.append((Path(entry.path), stat.st_size, stat.st_mtime_ns))
+
+    return files, subdirectories
+
+
+def scan_directories(
+    directories: Iterable[Path],
+    pattern: Optional[str] = None,
+    workers: int = DEFAULT_SCAN_WORKERS,
+) -> list[tuple[Path, int, int]]:
+    """
+    Walking directories recursively on thread pool.
+
+    Args:
+        directories: Directories to walk.
+        pattern: Glob pattern for file names, like "economic*.csv.gz".
+        workers: Number of directories listed at once.
+
+    Returns:
+        Sorted list of (path, size, mtime_ns) of plain and compressed CSV files.
+    """
+
+    found: list[tuple[Path, int, int]] = []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(_scan_directory, d, pattern) for d in directories}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirectories = future.result()
+                found.extend(files)
+                pending |= {
+                    executor.submit(_scan_directory, d, pattern) for d in subdirectories
+                }
+
+    return sorted(found)
+
+
+def read_header(file: Path, delimiter: str = ",") -> tuple[str, ...]:
+    """Reading column names of CSV file, empty if file can't be read."""
+
+    try:
+        with open_text(file) as f:
+            return tuple(next(csv.reader(f, delimiter=delimiter), []))
+    except (OSError, UnicodeDecodeError, EOFError, ValueError, csv.Error):
+        return ()
+
+
+class Manifest:
+    """
+    Entries of all files found in input directories.
+
+    Entries of files unchanged since previous manifest are reused,
+    so their headers aren't read again and validation can be skipped.
+    """
+
+    def __init__(self, entries: Iterable[ManifestEntry], path: Optional[Path] = None):
+        self.entries = {str(entry.path): entry for entry in entries}
+        self.path = path
+
+    @classmethod
+    @log
+    def scan(
+        cls,
+        directories: Sequence[Path],
+        pattern: Optional[str] = None,
+        previous: Optional["Manifest"] = None,
+        workers: int = DEFAULT_SCAN_WORKERS,
+    ) -> "Manifest":
+        """
+        Creating manifest of CSV files in directories.
+
+        Args:
+            directories: Directories to walk recursively.
+            pattern: Glob pattern for file names.
+            previous: Manifest of previous run.
+            workers: Number of directories and headers read at once.
+
+        Returns:
+            Manifest with path of previous one.
+        """
+
+        entries = []
+        changed = []
+        for path, size, mtime_ns in scan_directories(directories, pattern, workers):
+            entry = previous.entries.get(str(path)) if previous is not None else None
+            if entry is not None and entry.same_file(size, mtime_ns):
+                entries.append(entry)
+            else:
+                changed.append(ManifestEntry(path, size, mtime_ns))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            headers = executor.map(read_header, [entry.path for entry in changed])
+            for entry, header in zip(changed, headers):
+                entry.header = header
+
+        return cls(
+            sorted(entries + changed, key=lambda entry: str(entry.path)),
+            previous.path if previous is not None else None,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "Manifest":
+        """Loading manifest, empty one if file doesn't exist or is broken."""
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entries = [ManifestEntry.from_list(values) for values in json.load(f)]
+        except (OSError, ValueError, TypeError):
+            entries = []
+
+        return cls(entries, path)
+
+    def save(self, path: Optional[Path] = None) -> None:
+        """Saving manifest to given path or to path it was loaded from."""
+
+        path = path or self.path
+        if path is None:
+            error_msg = "Manifest path isn't set."
+            raise ValueError(error_msg)
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                [entry.to_list() for entry in self.entries.values()],
+                f,
+                separators=(",", ":"),
+            )
+
+    def groups(self) -> list[list[ManifestEntry]]:
+        """Entries grouped by header fingerprint, largest group first."""
+
+        groups: dict[str, list[ManifestEntry]] = {}
+        for entry in self.entries.values():
+            groups.setdefault(entry.fingerprint, []).append(entry)
+
+        return sorted(groups.values(), key=len, reverse=True)
+
+    def is_valid(self, file: Path) -> bool:
+        """Checking if file was validated and hasn't changed since."""
+
+        entry = self.entries.get(str(file))
+        return entry is not None and entry.valid
+
+    def mark_valid(self, file: Path) -> None:
+        """Marking file as validated."""
+
+        entry = self.entries.get(str(file))
+        if entry is not None:
+            entry.valid = True
@@ -0,0 +1,196 @@
+import os
+from enum import Enum
+from typing import Any, Optional, Sequence
+
+from .compression import COMPRESSED_SUFFIXES
+from .csv_tools import CsvReader
+from .logger import log
+from .reports import BaseReport
+from .validation import ErrorPolicy
+
+# Peak memory of loaded inputs per byte of uncompressed CSV, measured with tracemalloc
+ROWS_MEMORY_FACTOR = 18
+COLUMNS_MEMORY_FACTOR = 17
+COMPRESSION_RATIO = 5
+PARALLEL_MIN_SIZE = 64 * 1024 * 1024
+DEFAULT_MEMORY_SHARE = 0.5
+
+
+class Strategy(Enum):
+    """Execution strategies of exact report."""
+
+    ROLLUPS = "rollups"
+    COLUMNAR = "columnar"
+    IN_MEMORY = "in-memory"
+    STREAMING = "streaming"
+    SPILL = "spill"
+    PARALLEL = "parallel"
+
+
+def _format_size(size: Optional[int | float]) -> str:
+    if size is None:
+        return "unknown"
+
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+    return f"{size:.1f} TiB"
+
+
+def physical_memory() -> Optional[int]:
+    """Physical memory of machine, None if platform doesn't report it."""
+
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def available_cpus() -> int:
+    """Number of CPUs the process may run on, restricted by affinity where supported."""
+
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def input_size(readers: Sequence[CsvReader]) -> int:
+    """Estimated uncompressed size of input files, stdin isn't counted."""
+
+    size = 0
+    for reader in readers:
+        if reader.is_stdin:
+            continue
+        file_size = reader.file.stat().st_size
+        if reader.file.suffix in COMPRESSED_SUFFIXES:
+            file_size *= COMPRESSION_RATIO
+        size += file_size
+
+    return size
+
+
+class Plan:
+    """Chosen strategy of exact report with inputs it was chosen from."""
+
+    def __init__(
+        self,
+        strategy: Strategy,
+        reason: str,
+        files: int,
+        size: int,
+        budget: Optional[int],
+        cpus: int,
+        workers: int = 1,
+    ):
+        self.strategy = strategy
+        self.reason = reason
+        self.files = files
+        self.size = size
+        self.budget = budget
+        self.cpus = cpus
+        self.workers = workers
+
+    @property
+    def worker_memory_limit(self) -> Optional[int]:
+        """Memory budget of every worker of parallel strategy."""
+
+        if self.budget is None:
+            return None
+        return max(1, self.budget // self.workers)
+
+    def describe(self) -> list[dict[str, Any]]:
+        """Rows of plan for print_table."""
+
+        rows = [
+            ("strategy", self.strategy.value),
+            ("reason", self.reason),
+            ("files", self.files),
+            ("input size", _format_size(self.size)),
+            ("rows in memory", _format_size(self.size * ROWS_MEMORY_FACTOR)),
+            ("memory budget", _format_size(self.budget)),
+            ("cpus", self.cpus),
+            ("workers", self.workers),
+        ]
+
+        return [{"setting": name, "value": value} for name, value in rows]
+
+
+def _supports(report: BaseReport, method: str) -> bool:
+    return getattr(type(report), method) is not getattr(BaseReport, method)
+
+
+def _forced_streaming(readers: Sequence[CsvReader], dedup: bool) -> Optional[str]:
+    if dedup:
+        return "deduplication streams files in priority order"
+    if any(reader.is_stdin for reader in readers):
+        return "stdin can be read only once"
+    if any(reader.on_error is not ErrorPolicy.FAIL for reader in readers):
+        return "invalid rows are skipped while streaming"
+    return None
+
+
+@log
+def plan_execution(
+    report: BaseReport,
+    readers: Sequence[CsvReader],
+    memory_limit: Optional[int] = None,
+    dedup: bool = False,
+    cpus: Optional[int] = None,
+    rollups: bool = False,
+) -> Plan:
+    """
+    Choosing strategy of exact report.
+
+    Fresh rollups answering report are used before any input is read.
+    Without memory_limit, half of physical memory is the budget of loaded
+    inputs, but aggregation isn't limited. Large inputs of several files are
+    aggregated on worker processes when report supports partial states,
+    inputs fitting the budget are loaded by columns or rows, others are
+    streamed, spilling groups to disk with memory_limit.
+
+    Args:
+        report: Report to generate.
+        readers: Readers of input files.
+        memory_limit: Memory budget given by user.
+        dedup: Whether rows are deduplicated.
+        cpus: Number of CPUs, available_cpus() if None.
+        rollups: Whether fresh rollups of all files answer report.
+
+    Returns:
+        Plan with chosen strategy and reason.
+    """
+
+    cpus = cpus or available_cpus()
+    size = input_size(readers)
+    budget = memory_limit
+    if budget is None:
+        memory = physical_memory()
+        budget = int(memory * DEFAULT_MEMORY_SHARE) if memory is not None else None
+
+    streaming = Strategy.SPILL if memory_limit is not None else Strategy.STREAMING
+    plan = {"files": len(readers), "size": size, "budget": budget, "cpus": cpus}
+
+    if rollups and not dedup:
+        return Plan(
+            Strategy.ROLLUPS, "fresh rollups of all files answer report", **plan
+        )
+
+    forced = _forced_streaming(readers, dedup)
+    if forced is not None:
+        return Plan(streaming, forced, **plan)
+
+    workers = min(cpus, len(readers))
+    if workers > 1 and size >= PARALLEL_MIN_SIZE and _supports(report, "aggregate"):
+        reason = f"input of {_format_size(size)} is split by files between workers"
+        return Plan(Strategy.PARALLEL, reason, workers=workers, **plan)
+
+    fits = budget is None or size * COLUMNS_MEMORY_FACTOR <= budget
+    if fits and _supports(report, "generate_columns"):
+        return Plan(Strategy.COLUMNAR, "typed columns fit memory budget", **plan)
+
+    if budget is None or size * ROWS_MEMORY_FACTOR <= budget:
+        return Plan(Strategy.IN_MEMORY, "rows fit memory budget", **plan)
+
+    return Plan(streaming, "rows don't fit memory budget", **plan)
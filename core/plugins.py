@@ -0,0 +1,126 @@
+import importlib.util
+import inspect
+import sys
+from functools import partial
+from importlib.metadata import entry_points
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+from .logger import log
+from .reports import BaseReport
+
+PLUGIN_GROUP = "csv_economy_report.reports"
+PLUGIN_PACKAGE = "report_plugins"
+
+ReportLoader = Callable[[], Any]
+
+
+def _import_file(file: Path, namespace: str) -> ModuleType:
+    name = f"{PLUGIN_PACKAGE}.{namespace}.{file.stem}"
+    spec = importlib.util.spec_from_file_location(name, file)
+    if spec is None or spec.loader is None:
+        error_msg = f"Can't import report plugin {file}."
+        raise ImportError(error_msg)
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+
+    return module
+
+
+def load_report_file(file: Path, namespace: str) -> type[BaseReport]:
+    """
+    Importing plugin file and finding its report class.
+
+    Args:
+        file: Python file defining one BaseReport subclass.
+        namespace: Namespace of plugin, its module is imported under it.
+
+    Returns:
+        Report class defined in the file.
+
+    Raises:
+        ImportError: If file defines no report class or more than one.
+    """
+
+    module = _import_file(file, namespace)
+    classes = [
+        value
+        for value in vars(module).values()
+        if inspect.isclass(value)
+        and issubclass(value, BaseReport)
+        and value.__module__ == module.__name__
+        and not inspect.isabstract(value)
+    ]
+    if len(classes) != 1:
+        error_msg = (
+            f"Report plugin {file} must define one report class, found {len(classes)}."
+        )
+        raise ImportError(error_msg)
+
+    return classes[0]
+
+
+@log
+def entry_point_reports(
+    group: str = PLUGIN_GROUP,
+) -> list[tuple[str, str, ReportLoader]]:
+    """
+    Listing reports of installed packages without importing them.
+
+    Packages declare reports as entry points, for example in pyproject.toml:
+    [project.entry-points."csv_economy_report.reports"] with gdp-per-capita = "pkg.module:Report".
+
+    Args:
+        group: Entry point group.
+
+    Returns:
+        Report name, namespace of distribution name and loader of every report.
+    """
+
+    reports = []
+    for entry_point in entry_points(group=group):
+        namespace = entry_point.dist.name if entry_point.dist else entry_point.module
+        reports.append((entry_point.name, namespace, entry_point.load))
+
+    return reports
+
+
+@log
+def directory_reports(directory: Path) -> list[tuple[str, str, ReportLoader]]:
+    """
+    Listing reports of plugin files without importing them.
+
+    Every <name>.py file of directory provides report <name> with underscores
+    replaced by hyphens, its namespace is directory name.
+
+    Args:
+        directory: Directory of plugin files.
+
+    Returns:
+        Report name, namespace and loader of every report.
+
+    Raises:
+        FileNotFoundError: If directory doesn't exist.
+    """
+
+    if not directory.is_dir():
+        error_msg = f"Plugins directory {directory} does not exist!"
+        raise FileNotFoundError(error_msg)
+
+    namespace = directory.resolve().name
+    return [
+        (
+            file.stem.replace("_", "-"),
+            namespace,
+            partial(load_report_file, file, namespace),
+        )
+        for file in sorted(directory.glob("*.py"))
+        if not file.name.startswith("_")
+    ]
@@ -0,0 +1,250 @@
+import io
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from .compression import may_read_parallel
+
+DEFAULT_PREFETCH_WORKERS = 4
+PREFETCH_CHUNK_SIZE = 1024 * 1024
+PREFETCH_DEPTH = 4
+PREFETCH_CACHE_SIZE = 64 * 1024 * 1024
+PUT_TIMEOUT = 0.1
+
+
+class PrefetchStream(io.RawIOBase):
+    """
+    Raw stream over chunks read ahead by background thread.
+
+    Chunks read by caller are kept while keep_limit allows,
+    so whole content of small file can be read again from memory.
+    """
+
+    def __init__(self, depth: int = PREFETCH_DEPTH):
+        super().__init__()
+        self.chunks: queue.Queue = queue.Queue(maxsize=depth)
+        self.stopped = threading.Event()
+        self.kept: Optional[list[bytes]] = None
+        self.keep_limit = 0
+        self._buffer = memoryview(b"")
+        self._eof = False
+
+    @property
+    def complete(self) -> bool:
+        """Whether the whole file was read and kept."""
+
+        return self._eof and self.kept is not None
+
+    def _keep(self, chunk: bytes) -> None:
+        if self.kept is None:
+            return
+
+        self.kept.append(chunk)
+        self.keep_limit -= len(chunk)
+        if self.keep_limit < 0:
+            self.kept = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if not self._buffer:
+            if self._eof:
+                return 0
+
+            chunk = self.chunks.get()
+            if isinstance(chunk, BaseException):
+                self._eof = True
+                self.kept = None
+                raise chunk
+            if not chunk:
+                self._eof = True
+                return 0
+            self._keep(chunk)
+            self._buffer = memoryview(chunk)
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self) -> None:
+        self.stopped.set()
+        super().close()
+
+
+def _put(stream: PrefetchStream, item: Any) -> bool:
+    while not stream.stopped.is_set():
+        try:
+            stream.chunks.put(item, timeout=PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _signature(file: Path) -> Optional[tuple[int, int]]:
+    try:
+        stat = file.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _fill(file: Path, stream: PrefetchStream, chunk_size: int) -> None:
+    if stream.stopped.is_set():
+        return
+
+    try:
+        with open(file, "rb") as f:
+            while _put(stream, chunk := f.read(chunk_size)) and chunk:
+                pass
+    except OSError as e:
+        _put(stream, e)
+
+
+class Prefetcher:
+    """
+    Reader of raw file chunks ahead of parsing.
+
+    Files are opened and read on a thread pool into bounded queues while
+    the caller parses previous chunks, so I/O latency overlaps with CPU work.
+    At most workers files are read at once, each up to depth chunks ahead.
+
+    Files are expected to be read one at a time in the given order. Taking
+    a file stops reading of files taken or skipped before it, and taking
+    a file that isn't pending starts a new pass from that file.
+
+    Files read whole are kept in memory up to cache_size bytes in total,
+    so the next pass, like the report after validation, takes them from
+    memory while they are unchanged, only other files are read again.
+
+    Large gzip and zstd files aren't prefetched, they are mapped and
+    decompressed by members in parallel when opened directly.
+    """
+
+    def __init__(
+        self,
+        files: Iterable[Path],
+        workers: int = DEFAULT_PREFETCH_WORKERS,
+        chunk_size: int = PREFETCH_CHUNK_SIZE,
+        depth: int = PREFETCH_DEPTH,
+        cache_size: int = PREFETCH_CACHE_SIZE,
+    ):
+        self.files = [file for file in files if not may_read_parallel(file)]
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.depth = depth
+        self.cache_size = cache_size
+        self._positions = {file: index for index, file in enumerate(self.files)}
+        self._taken: Optional[tuple[Path, PrefetchStream]] = None
+        self._pending: deque[tuple[Path, PrefetchStream]] = deque()
+        self._pending_files: set[Path] = set()
+        self._cache: dict[Path, tuple[Optional[tuple[int, int]], list[bytes]]] = {}
+        self._cached_size = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __enter__(self) -> "Prefetcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _release_taken(self) -> None:
+        if self._taken is None:
+            return
+
+        file, stream = self._taken
+        stream.stopped.set()
+        self._taken = None
+        if stream.complete and file not in self._cache:
+            kept = stream.kept or []
+            self._cache[file] = (_signature(file), kept)
+            self._cached_size += sum(map(len, kept))
+
+    def _stop(self) -> None:
+        self._release_taken()
+
+        while self._pending:
+            self._pending.popleft()[1].close()
+        self._pending_files.clear()
+
+    def _cached(self, file: Path) -> Optional[PrefetchStream]:
+        if file not in self._cache:
+            return None
+
+        signature, chunks = self._cache[file]
+        if signature is None or signature != _signature(file):
+            del self._cache[file]
+            self._cached_size -= sum(map(len, chunks))
+            return None
+
+        stream = PrefetchStream(depth=0)
+        for chunk in chunks:
+            stream.chunks.put_nowait(chunk)
+        stream.chunks.put_nowait(b"")
+        return stream
+
+    def _schedule(self, files: Iterable[Path]) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="prefetch"
+            )
+
+        for file in files:
+            if file in self._cache:
+                continue
+            stream = PrefetchStream(self.depth)
+            self._pending.append((file, stream))
+            self._pending_files.add(file)
+            self._executor.submit(_fill, file, stream, self.chunk_size)
+
+    def take(self, file: Path) -> Optional[PrefetchStream]:
+        """
+        Taking prefetched raw stream of file.
+
+        Args:
+            file: Path to file.
+
+        Returns:
+            Raw stream or None if file isn't prefetched, then it's read directly.
+        """
+
+        position = self._positions.get(file)
+        if position is None:
+            return None
+
+        self._release_taken()
+        cached = self._cached(file)
+        if cached is not None:
+            return cached
+
+        if file not in self._pending_files:
+            self._stop()
+            self._schedule(self.files[position:])
+
+        while self._pending:
+            pending, stream = self._pending.popleft()
+            self._pending_files.discard(pending)
+            if pending == file:
+                stream.kept = []
+                stream.keep_limit = self.cache_size - self._cached_size
+                self._taken = (file, stream)
+                return stream
+            stream.close()
+
+        return None
+
+    def close(self) -> None:
+        """Stopping reading of all files and dropping kept ones."""
+
+        self._stop()
+        self._cache.clear()
+        self._cached_size = 0
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
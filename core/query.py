@@ -0,0 +1,395 @@
+import operator
+import shlex
+import time
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from .cli_tools import print_table
+from .csv_tools import CsvReader
+from .declarative import AGGREGATIONS, DeclarativeReport, ReportSpec
+from .logger import log
+from .reports import ReportRegistry
+from .shortcuts import convert_to_number, is_numeric
+from .validation import ErrorPolicy
+
+try:
+    import readline  # noqa: F401  line editing and history of input
+except ImportError:
+    readline = None
+
+OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+KEYWORDS = ("where", "by", "agg", "top")
+PROMPT = "query> "
+QUERY_HELP = """\
+Queries:
+  <report> [where <column> <op> <value> [and ...]] [by <column> ...] [top <n> [<column>]]
+  agg <column>:<func> ... by <column> ... [where ...] [top <n> [<column>]]
+
+Operators: = != < <= > >=, quote values with spaces, like continent = "North America".
+Functions: {functions}.
+Commands: reports, columns, help, exit."""
+
+
+class Condition:
+    """Filter of rows comparing column with value."""
+
+    __slots__ = ("column", "op", "value")
+
+    def __init__(self, column: str, op: str, value: str):
+        if op not in OPERATORS:
+            error_msg = f"Unknown operator {op}, use one of {' '.join(OPERATORS)}."
+            raise ValueError(error_msg)
+
+        self.column = column
+        self.op = op
+        self.value = value
+
+    def predicate(self, values: Sequence[Any]) -> Callable[[Any], bool]:
+        """
+        Creating predicate of column values.
+
+        Value is compared as number when column is numeric.
+
+        Args:
+            values: Values of column.
+
+        Returns:
+            Predicate returning False for values that don't compare with value.
+        """
+
+        value: Any = self.value
+        sample = next((item for item in values if item is not None), None)
+        if isinstance(sample, (int, float)) and is_numeric(value):
+            value = convert_to_number(value)
+        compare = OPERATORS[self.op]
+
+        def predicate(item: Any) -> bool:
+            try:
+                return compare(item, value)
+            except TypeError:
+                return False
+
+        return predicate
+
+
+class Query:
+    """Parsed query of report or ad-hoc aggregation with filters and top N."""
+
+    __slots__ = ("report", "conditions", "group_by", "agg", "limit", "sort_by")
+
+    def __init__(
+        self,
+        report: Optional[str] = None,
+        conditions: Sequence[Condition] = (),
+        group_by: Sequence[str] = (),
+        agg: Optional[dict[str, list[str]]] = None,
+        limit: Optional[int] = None,
+        sort_by: Optional[str] = None,
+    ):
+        self.report = report
+        self.conditions = list(conditions)
+        self.group_by = list(group_by)
+        self.agg = agg or {}
+        self.limit = limit
+        self.sort_by = sort_by
+
+    @staticmethod
+    def _conditions(tokens: list[str]) -> list[Condition]:
+        parts = [tokens[index : index + 3] for index in range(0, len(tokens), 4)]
+        joins = tokens[3::4]
+        if any(len(part) != 3 for part in parts) or any(j != "and" for j in joins):
+            error_msg = "Filters must be <column> <op> <value> joined with and."
+            raise ValueError(error_msg)
+
+        return [Condition(*part) for part in parts]
+
+    @staticmethod
+    def _agg(tokens: list[str]) -> dict[str, list[str]]:
+        agg: dict[str, list[str]] = {}
+        for token in tokens:
+            column, _, func = token.partition(":")
+            if not column or func not in AGGREGATIONS or func == "wmean":
+                functions = ", ".join(f for f in AGGREGATIONS if f != "wmean")
+                error_msg = f"Aggregations must be <column>:<func> with {functions}, got {token}."
+                raise ValueError(error_msg)
+            agg.setdefault(column, []).append(func)
+
+        return agg
+
+    @staticmethod
+    def _top(tokens: list[str]) -> tuple[int, Optional[str]]:
+        if not 1 <= len(tokens) <= 2 or not tokens[0].isdigit():
+            error_msg = "Top must be top <n> [<column>]."
+            raise ValueError(error_msg)
+
+        return int(tokens[0]), tokens[1] if len(tokens) == 2 else None
+
+    @classmethod
+    @log
+    def parse(cls, text: str) -> "Query":
+        """
+        Parsing query text.
+
+        Args:
+            text: Query like average-gdp where year >= 2022 top 5
+                or agg gdp:mean by continent.
+
+        Returns:
+            Parsed query.
+
+        Raises:
+            ValueError: If query is empty or malformed.
+        """
+
+        tokens = shlex.split(text)
+        if not tokens:
+            error_msg = "Query is empty."
+            raise ValueError(error_msg)
+
+        report = None if tokens[0] in KEYWORDS else tokens.pop(0)
+        clauses: dict[str, list[str]] = {}
+        for token in tokens:
+            if token in KEYWORDS:
+                if token in clauses:
+                    error_msg = f"Clause {token} is given twice."
+                    raise ValueError(error_msg)
+                clauses[token] = []
+                continue
+            if not clauses:
+                error_msg = f"Unexpected {token}, clauses are {', '.join(KEYWORDS)}."
+                raise ValueError(error_msg)
+            clauses[next(reversed(clauses))].append(token)
+
+        if (report is None) == ("agg" not in clauses):
+            error_msg = "Query must name report or aggregate with agg, not both."
+            raise ValueError(error_msg)
+
+        if "agg" in clauses and not clauses.get("by"):
+            error_msg = "Aggregation needs group columns, like by continent."
+            raise ValueError(error_msg)
+
+        limit, sort_by = cls._top(clauses["top"]) if "top" in clauses else (None, None)
+
+        return cls(
+            report,
+            cls._conditions(clauses.get("where", [])),
+            clauses.get("by", []),
+            cls._agg(clauses["agg"]) if "agg" in clauses else None,
+            limit,
+            sort_by,
+        )
+
+
+class Dataset:
+    """Typed columns of all input files loaded once for repeated queries."""
+
+    __slots__ = ("columns", "rows", "_records")
+
+    def __init__(self, columns: dict[str, list[Any]]):
+        self.columns = columns
+        self.rows = len(next(iter(columns.values()), []))
+        self._records: Optional[list[dict[str, Any]]] = None
+
+    @staticmethod
+    def _file_columns(reader: CsvReader) -> dict[str, list[Any]]:
+        if reader.on_error is ErrorPolicy.FAIL:
+            return reader.load_columns
+
+        columns: dict[str, list[Any]] = {}
+        for batch in reader.iter_batches():
+            for name, values in batch.items():
+                columns.setdefault(name, []).extend(values)
+        return columns
+
+    @classmethod
+    @log
+    def load(cls, readers: Iterable[CsvReader]) -> "Dataset":
+        """
+        Loading columns of all files.
+
+        Files of fail policy are loaded by columns, as they are validated
+        before loading, other files by validated batches, so invalid rows
+        are skipped or quarantined by policy of reader.
+
+        Args:
+            readers: Readers of input files.
+
+        Returns:
+            Dataset with columns of all files concatenated.
+
+        Raises:
+            ValueError: If files have different columns.
+            csv.Error: If row validation fails with fail policy.
+        """
+
+        columns: dict[str, list[Any]] = {}
+        for reader in readers:
+            file_columns = cls._file_columns(reader)
+            if not file_columns:
+                continue
+            if columns and file_columns.keys() != columns.keys():
+                error_msg = (
+                    f"File {reader.file} has columns {', '.join(file_columns)}, "
+                    f"not {', '.join(columns)}."
+                )
+                raise ValueError(error_msg)
+            for name, values in file_columns.items():
+                columns.setdefault(name, []).extend(values)
+
+        return cls(columns)
+
+    def select(self, conditions: Sequence[Condition]) -> dict[str, list[Any]]:
+        """
+        Selecting rows matching all conditions.
+
+        Args:
+            conditions: Filters of rows.
+
+        Returns:
+            Columns of matching rows, columns of dataset without conditions.
+
+        Raises:
+            ValueError: If condition column isn't found.
+        """
+
+        if not conditions:
+            return self.columns
+
+        positions: Iterable[int] = range(self.rows)
+        for condition in conditions:
+            if condition.column not in self.columns:
+                error_msg = f"Column {condition.column} isn't found."
+                raise ValueError(error_msg)
+            values = self.columns[condition.column]
+            predicate = condition.predicate(values)
+            positions = [index for index in positions if predicate(values[index])]
+
+        return {
+            name: [values[index] for index in positions]
+            for name, values in self.columns.items()
+        }
+
+    def records(self, columns: dict[str, list[Any]]) -> list[dict[str, Any]]:
+        """Rows of selected columns, rows of whole dataset are kept for next queries."""
+
+        if columns is not self.columns:
+            return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+        if self._records is None:
+            self._records = [dict(zip(columns, row)) for row in zip(*columns.values())]
+        return self._records
+
+
+def _top(
+    result: list[dict[str, Any]], limit: Optional[int], sort_by: Optional[str]
+) -> list[dict[str, Any]]:
+    if sort_by is not None:
+        if result and sort_by not in result[0]:
+            error_msg = (
+                f"Result has no column {sort_by}, columns are {', '.join(result[0])}."
+            )
+            raise ValueError(error_msg)
+        result = sorted(
+            result,
+            key=lambda row: (row[sort_by] is not None, row[sort_by]),
+            reverse=True,
+        )
+
+    return result[:limit]
+
+
+@log
+def run_query(dataset: Dataset, query: Query) -> list[dict[str, Any]]:
+    """
+    Running query against loaded dataset.
+
+    Reports answer from selected columns when they support it, from rows otherwise.
+
+    Args:
+        dataset: Loaded dataset.
+        query: Parsed query.
+
+    Returns:
+        List of dictionaries of query result.
+
+    Raises:
+        ValueError: If report, column or option isn't found.
+    """
+
+    if query.report is None:
+        report = DeclarativeReport.for_spec(
+            "query", ReportSpec(query.group_by, query.agg)
+        )()
+    elif query.group_by:
+        report = ReportRegistry.get_report(query.report, group_by=query.group_by)
+    else:
+        report = ReportRegistry.get_report(query.report)
+
+    columns = dataset.select(query.conditions)
+    result = report.generate_columns(columns)
+    if result is None:
+        result = report.generate(dataset.records(columns))
+
+    return _top(result, query.limit, query.sort_by)
+
+
+def _command(dataset: Dataset, text: str) -> bool:
+    if text == "help":
+        functions = ", ".join(func for func in AGGREGATIONS if func != "wmean")
+        print(QUERY_HELP.format(functions=functions))
+    elif text == "reports":
+        print(", ".join(ReportRegistry.available_reports))
+    elif text == "columns":
+        print(", ".join(dataset.columns))
+    else:
+        return False
+
+    return True
+
+
+@log
+def repl(dataset: Dataset, read: Callable[[str], str] = input) -> int:
+    """
+    Answering queries against dataset until exit or end of input.
+
+    Every result is printed with number of rows and time query took.
+
+    Args:
+        dataset: Loaded dataset.
+        read: Function reading next line with prompt.
+
+    Returns:
+        Number of answered queries.
+    """
+
+    answered = 0
+    while True:
+        try:
+            text = read(PROMPT).strip()
+        except EOFError:
+            print()
+            return answered
+
+        if text in ("exit", "quit"):
+            return answered
+        if not text or _command(dataset, text):
+            continue
+
+        start = time.perf_counter()
+        try:
+            result = run_query(dataset, Query.parse(text))
+        except Exception as e:
+            # one failing report doesn't end the session with loaded dataset
+            print(f"Error: {e}")
+            continue
+
+        milliseconds = (time.perf_counter() - start) * 1000
+        print_table(result, title=f"Query: {text} ({len(result)} rows)")
+        print(f"Answered in {milliseconds:.1f} ms.")
+        answered += 1
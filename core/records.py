@@ -0,0 +1,96 @@
+import keyword
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Iterator, Sequence
+
+
+class Record(tuple):
+    """
+    Row backed by tuple with access by column name, index and attribute.
+
+    Works as read-only mapping of column names for reports written
+    for dictionaries: row["gdp"], row.get("gdp"), "gdp" in row, dict(row).
+    Integer keys and slices index values as in tuple.
+    """
+
+    __slots__ = ()
+
+    _fields: tuple[str, ...] = ()
+    _positions: dict[str, int] = {}
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._positions[key])
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._positions
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={value!r}" for name, value in self.items())
+        return f"{type(self).__name__}({values})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Value of column or default if column doesn't exist."""
+
+        position = self._positions.get(key)
+        if position is None:
+            return default
+        return tuple.__getitem__(self, position)
+
+    def keys(self) -> tuple[str, ...]:
+        """Column names."""
+
+        return self._fields
+
+    def values(self) -> tuple[Any, ...]:
+        """Column values."""
+
+        return tuple(tuple.__iter__(self))
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        """Pairs of column name and value."""
+
+        return zip(self._fields, tuple.__iter__(self))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Converting record to dictionary."""
+
+        return dict(self.items())
+
+
+@lru_cache(maxsize=None)
+def _record_type(fields: tuple[str, ...]) -> type[Record]:
+    namespace: dict[str, Any] = {
+        "__slots__": (),
+        "_fields": fields,
+        "_positions": {name: position for position, name in enumerate(fields)},
+    }
+
+    for position, name in enumerate(fields):
+        if (
+            name.isidentifier()
+            and not keyword.iskeyword(name)
+            and not name.startswith("_")
+            and not hasattr(Record, name)
+        ):
+            namespace[name] = property(itemgetter(position))
+
+    return type("Row", (Record,), namespace)
+
+
+def record_type(header: Sequence[str]) -> type[Record]:
+    """
+    Creating record class for CSV header.
+
+    Columns with names that are valid identifiers get attributes,
+    others are available by name and index only. Classes are cached by header.
+
+    Args:
+        header: Column names.
+
+    Returns:
+        Record subclass, instances are created from sequence of values.
+    """
+
+    return _record_type(tuple(header))
@@ -1,19 +1,59 @@
+import inspect
+import json
+import tomllib
 from abc import ABC, abstractmethod
-from typing import Any
+from functools import cache
+from pathlib import Path
+from concurrent.futures import Executor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    Callable,
+    Hashable,
+    Iterable,
+    Optional,
+)
 
+from .aggregation import AggregateState, GroupAggregator
+from .aio import agenerate
 from .logger import log
+from .sampling import Sample
+
+if TYPE_CHECKING:
+    from .rollups import Rollup
 
 
 class BaseReport(ABC):
     """Base report class."""
 
+    stratify_by: Optional[str] = None
+    sketch_columns: tuple[str, ...] = ()
+    result_key: tuple[str, ...] = ()
+
+    def __init__(self, memory_limit: Optional[int] = None):
+        self.memory_limit = memory_limit
+
+    def aggregator(self, state_factory: type[Any] = AggregateState) -> GroupAggregator:
+        """
+        Creating group aggregator within report memory budget.
+
+        Args:
+            state_factory: Class of group states.
+
+        Returns:
+            Aggregator spilling to disk when memory_limit is exceeded.
+        """
+
+        return GroupAggregator(self.memory_limit, state_factory=state_factory)
+
     @abstractmethod
-    def generate(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def generate(self, data: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
         """
         Generate report from data.
 
         Args:
-            data: list of dictionaries with some data.
+            data: list or single-pass stream of dictionaries with some data.
 
         Returns:
             List of dictionaries for further operations.
@@ -21,6 +61,105 @@ class BaseReport(ABC):
 
         raise NotImplementedError
 
+    async def agenerate(
+        self,
+        batches: AsyncIterable[list[dict[str, Any]]],
+        executor: Optional[Executor] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Generate report from async row batches without blocking event loop.
+
+        Args:
+            batches: Async iterable of lists of dictionaries, like aiter_rows.
+            executor: Thread pool executor, default executor of loop if None.
+
+        Returns:
+            List of dictionaries for further operations.
+        """
+
+        return await agenerate(self.generate, batches, executor)
+
+    def estimate(self, sample: Sample) -> list[dict[str, Any]]:
+        """
+        Estimate report from random sample of data.
+
+        Args:
+            sample: Sample drawn with stratify_by and sketch_columns of report.
+
+        Returns:
+            List of dictionaries with estimates and their error bounds.
+
+        Raises:
+            NotImplementedError: If report doesn't support approximate mode.
+        """
+
+        error_msg = f"Report {type(self).__name__} doesn't support approximate mode."
+        raise NotImplementedError(error_msg)
+
+    def from_rollups(self, rollups: list["Rollup"]) -> Optional[list[dict[str, Any]]]:
+        """
+        Generate report from pre-aggregated rollups.
+
+        Args:
+            rollups: Rollups of all input files.
+
+        Returns:
+            List of dictionaries or None if rollups can't answer report.
+        """
+
+        return None
+
+    def aggregate(
+        self, data: Iterable[dict[str, Any]], aggregator: GroupAggregator
+    ) -> None:
+        """
+        Aggregate data into partial group states, used by sharded mode.
+
+        Args:
+            data: list or single-pass stream of dictionaries with some data.
+            aggregator: Aggregator of states by group key.
+
+        Raises:
+            NotImplementedError: If report doesn't support sharded mode.
+        """
+
+        error_msg = f"Report {type(self).__name__} doesn't support sharded mode."
+        raise NotImplementedError(error_msg)
+
+    def from_states(
+        self, states: Iterable[tuple[Hashable, AggregateState]]
+    ) -> list[dict[str, Any]]:
+        """
+        Generate report from merged group states of aggregate.
+
+        Args:
+            states: Pairs of group key and state merged over all shards.
+
+        Returns:
+            List of dictionaries for further operations.
+
+        Raises:
+            NotImplementedError: If report doesn't support sharded mode.
+        """
+
+        error_msg = f"Report {type(self).__name__} doesn't support sharded mode."
+        raise NotImplementedError(error_msg)
+
+    def generate_columns(
+        self, columns: dict[str, list[Any]]
+    ) -> Optional[list[dict[str, Any]]]:
+        """
+        Generate report from whole typed columns.
+
+        Args:
+            columns: Dictionary of column name to converted values of all files.
+
+        Returns:
+            List of dictionaries or None if report works only on rows.
+        """
+
+        return None
+
 
 class ReportRegMeta(type):
     """Metaclass for report registry."""
@@ -31,40 +170,94 @@ class ReportRegMeta(type):
         Getting available reports.
 
         Returns:
-            List of available report names.
+            List of available report names, plugins aren't imported.
         """
-        return list(cls._reports)  # type: ignore[attr-defined]
+        return list({**cls._reports, **cls._loaders})  # type: ignore[attr-defined]
 
 
 class ReportRegistry(metaclass=ReportRegMeta):
-    """Registry of available reports."""
+    """
+    Registry of available reports.
+
+    Plugin reports are registered with loaders and imported on first use.
+    Their qualified names are prefixed with namespace of plugin, like
+    "acme:gdp-per-capita", and plugin names taken by other reports are
+    registered only qualified.
+    """
 
     _reports: dict["str", type[BaseReport]] = {}
+    _loaders: dict[str, Callable[[], Any]] = {}
+    _qualified: dict[str, str] = {}
+
+    @classmethod
+    def _report_class(cls, report_name: str) -> type[BaseReport]:
+        if report_name in cls._reports:
+            return cls._reports[report_name]
+
+        try:
+            report_class = cls._loaders[report_name]()
+        except Exception as e:
+            error_msg = f"Can't load report '{report_name}': {e}"
+            raise ValueError(error_msg) from e
+
+        if not (
+            isinstance(report_class, type) and issubclass(report_class, BaseReport)
+        ):
+            error_msg = f"Plugin of report '{report_name}' isn't a BaseReport subclass."
+            raise ValueError(error_msg)
+
+        cls._reports[report_name] = report_class
+        return report_class
+
+    @classmethod
+    def qualified_name(cls, report_name: str) -> str:
+        """
+        Getting name of report qualified with its plugin namespace.
+
+        Args:
+            report_name: report name.
+
+        Returns:
+            Qualified name of plugin report, the same name for other reports.
+        """
+
+        return cls._qualified.get(report_name, report_name)
 
     @classmethod
     @log
-    def get_report(cls, report_name: str) -> BaseReport:
+    def get_report(cls, report_name: str, **options: Any) -> BaseReport:
         """
         Getting report instance.
 
         Args:
             report_name: report name.
+            options: keyword arguments for report class, like memory_limit.
 
         Returns:
             Report class instance.
 
         Raises:
-            ValueError: If report name is not found.
+            ValueError: If report name is not found or options aren't supported.
         """
 
-        if report_name not in cls._reports:
+        if report_name not in cls._reports and report_name not in cls._loaders:
             error_msg = (
                 f"Report '{report_name}' isn't found. "
-                f"Available reports: {', '.join(cls._reports)}".rstrip()
+                f"Available reports: {', '.join(cls.available_reports)}".rstrip()
+            )
+            raise ValueError(error_msg)
+
+        report_class = cls._report_class(report_name)
+        parameters = inspect.signature(report_class).parameters
+        unsupported = [name for name in options if name not in parameters]
+        if unsupported:
+            error_msg = (
+                f"Report '{report_name}' doesn't support options: "
+                f"{', '.join(unsupported)}."
             )
             raise ValueError(error_msg)
 
-        return cls._reports[report_name]()
+        return report_class(**options)
 
     @classmethod
     @log
@@ -83,4 +276,107 @@ class ReportRegistry(metaclass=ReportRegMeta):
         """
 
         cls._reports[report_name] = report_class
+        cls._loaders.pop(report_name, None)
+        cls._qualified.pop(report_name, None)
         return report_class
+
+    @classmethod
+    @log
+    def register_plugin(
+        cls, report_name: str, loader: Callable[[], Any], namespace: str
+    ) -> list[str]:
+        """
+        Registering plugin report imported on first use.
+
+        Args:
+            report_name: report name.
+            loader: Callable importing and returning report class.
+            namespace: Namespace of plugin, like distribution or directory name.
+
+        Returns:
+            Names report is registered under, qualified one is always present.
+        """
+
+        loader = cache(loader)
+        qualified = f"{namespace}:{report_name}"
+        names = [qualified]
+        if report_name not in cls.available_reports:
+            names.append(report_name)
+
+        for name in names:
+            cls._reports.pop(name, None)
+            cls._loaders[name] = loader
+            cls._qualified[name] = qualified
+
+        return names
+
+    @classmethod
+    @log
+    def discover_plugins(cls, directories: Iterable[Path] = ()) -> list[str]:
+        """
+        Registering reports of installed packages and plugin directories.
+
+        Packages provide reports with entry points of group
+        "csv_economy_report.reports", directories with one <name>.py file
+        per report. Nothing is imported until report is used.
+
+        Args:
+            directories: Directories of plugin files.
+
+        Returns:
+            Names of registered reports.
+
+        Raises:
+            FileNotFoundError: If directory doesn't exist.
+        """
+
+        from .plugins import directory_reports, entry_point_reports
+
+        plugins = entry_point_reports()
+        for directory in directories:
+            plugins.extend(directory_reports(directory))
+
+        names = []
+        for report_name, namespace, loader in plugins:
+            names.extend(cls.register_plugin(report_name, loader, namespace))
+
+        return names
+
+    @classmethod
+    @log
+    def load_specs(cls, file: Path) -> list[str]:
+        """
+        Registering declarative reports from TOML or JSON file.
+
+        Every top-level table of the file is a report spec,
+        for example [gdp-by-continent] with group_by, agg and sort.
+
+        Args:
+            file: Path to .toml or .json file with report specs.
+
+        Returns:
+            Names of registered reports.
+
+        Raises:
+            ValueError: If file format isn't supported or spec is invalid.
+        """
+
+        from .declarative import DeclarativeReport, ReportSpec
+
+        if file.suffix == ".toml":
+            with open(file, "rb") as f:
+                content = tomllib.load(f)
+        elif file.suffix == ".json":
+            with open(file, "r", encoding="utf-8") as f:
+                content = json.load(f)
+        else:
+            error_msg = f"Report specs file {file} must be .toml or .json."
+            raise ValueError(error_msg)
+
+        for report_name, table in content.items():
+            spec = ReportSpec.from_dict(table)
+            cls.register_report(
+                report_name, DeclarativeReport.for_spec(report_name, spec)
+            )
+
+        return list(content)
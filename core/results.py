@@ -0,0 +1,195 @@
+import json
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from .logger import log
+
+NEW = "new"
+REMOVED = "removed"
+
+
+def _delta(current: Any, baseline: Any) -> Optional[int | float]:
+    if isinstance(current, bool) or isinstance(baseline, bool):
+        return None
+    if not isinstance(current, (int, float)) or not isinstance(baseline, (int, float)):
+        return None
+
+    delta = current - baseline
+    return round(delta, 2) if isinstance(delta, float) else delta
+
+
+class ResultSet:
+    """
+    Report result keyed by its key columns, rows are kept in report order.
+
+    Saved as JSON with column names once and rows as lists of values,
+    rank of row is its position in report.
+    """
+
+    def __init__(
+        self,
+        report: str,
+        key: Sequence[str],
+        columns: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+    ):
+        self.report = report
+        self.key = tuple(key)
+        self.columns = tuple(columns)
+        self.rows = [list(row) for row in rows]
+
+        missing = [name for name in self.key if name not in self.columns]
+        if missing:
+            error_msg = f"Result of {report} has no key columns {', '.join(missing)}."
+            raise ValueError(error_msg)
+
+    @classmethod
+    def from_result(
+        cls, report: str, result: list[dict[str, Any]], key: Sequence[str] = ()
+    ) -> "ResultSet":
+        """
+        Creating result set from report result.
+
+        Args:
+            report: Report name.
+            result: List of dictionaries returned by report.
+            key: Columns identifying rows, first column if empty.
+
+        Returns:
+            ResultSet with columns of first row.
+        """
+
+        columns = list(result[0]) if result else list(key)
+        key = key or columns[:1]
+
+        return cls(
+            report,
+            key,
+            columns,
+            [[row.get(name) for name in columns] for row in result],
+        )
+
+    def keyed(self) -> dict[tuple, tuple[int, dict[str, Any]]]:
+        """Dictionary of row key to rank starting from 1 and row."""
+
+        keyed = {}
+        for rank, values in enumerate(self.rows, 1):
+            row = dict(zip(self.columns, values))
+            keyed[tuple(row[name] for name in self.key)] = (rank, row)
+
+        return keyed
+
+    @log
+    def save(self, path: Path) -> None:
+        """Saving result set to JSON file."""
+
+        content = {
+            "report": self.report,
+            "key": self.key,
+            "columns": self.columns,
+            "rows": self.rows,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(content, f, separators=(",", ":"))
+
+    @classmethod
+    @log
+    def load(cls, path: Path) -> "ResultSet":
+        """
+        Loading result set from JSON file.
+
+        Raises:
+            ValueError: If file isn't a saved result set.
+        """
+
+        with open(path, "r", encoding="utf-8") as f:
+            content = json.load(f)
+
+        try:
+            return cls(
+                content["report"], content["key"], content["columns"], content["rows"]
+            )
+        except (KeyError, TypeError) as e:
+            error_msg = f"File {path} isn't a saved report result."
+            raise ValueError(error_msg) from e
+
+    def _diff_row(
+        self,
+        key: tuple,
+        current: Optional[tuple[int, dict[str, Any]]],
+        baseline: Optional[tuple[int, dict[str, Any]]],
+        metrics: Sequence[str],
+    ) -> dict[str, Any]:
+        row: dict[str, Any] = dict(zip(self.key, key))
+        values = current[1] if current is not None else {}
+        base = baseline[1] if baseline is not None else {}
+
+        for name in metrics:
+            row[name] = values.get(name)
+            row[f"{name}_delta"] = _delta(values.get(name), base.get(name))
+
+        row["rank"] = current[0] if current is not None else None
+        row["rank_change"] = None
+        if current is not None and baseline is not None:
+            row["rank_change"] = baseline[0] - current[0]
+
+        row["status"] = None
+        if baseline is None:
+            row["status"] = NEW
+        elif current is None:
+            row["status"] = REMOVED
+
+        return row
+
+    def _metrics(self, baseline: "ResultSet") -> list[str]:
+        metrics = []
+        for position, name in enumerate(self.columns):
+            if name in self.key or name not in baseline.columns:
+                continue
+
+            values = [row[position] for row in self.rows if row[position] is not None]
+            if values and all(_delta(value, value) is not None for value in values):
+                metrics.append(name)
+
+        return metrics
+
+    @log
+    def diff(self, baseline: "ResultSet") -> list[dict[str, Any]]:
+        """
+        Comparing result set with baseline by hash join on key columns.
+
+        Args:
+            baseline: Result set of previous run of the same report.
+
+        Returns:
+            List of dictionaries with key columns, current value and delta
+            of every numeric column, current rank, rank change (positive
+            when row moved up) and status new or removed, rows in current
+            order followed by removed rows.
+
+        Raises:
+            ValueError: If baseline is result of another report or key.
+        """
+
+        if baseline.report != self.report or baseline.key != self.key:
+            error_msg = (
+                f"Baseline is result of {baseline.report} by {', '.join(baseline.key)}, "
+                f"not {self.report} by {', '.join(self.key)}."
+            )
+            raise ValueError(error_msg)
+
+        metrics = self._metrics(baseline)
+        current = self.keyed()
+        previous = baseline.keyed()
+
+        diff = [
+            self._diff_row(key, entry, previous.get(key), metrics)
+            for key, entry in current.items()
+        ]
+        diff.extend(
+            self._diff_row(key, None, entry, metrics)
+            for key, entry in previous.items()
+            if key not in current
+        )
+
+        return diff
@@ -0,0 +1,245 @@
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from .aggregation import AggregateState
+from .csv_tools import CsvReader
+from .logger import log
+from .schema import ColumnType
+
+ROLLUP_SUFFIX = ".rollup.json"
+DEFAULT_DIMENSIONS = ("country", "continent", "year")
+
+
+def _source_stat(file: Path) -> list[int]:
+    stat = file.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _numeric_columns(
+    reader: CsvReader, columns: dict[str, list[Any]], dimensions: Sequence[str]
+) -> list[str]:
+    schema = reader.schema
+    return [
+        name
+        for name in columns
+        if name not in dimensions
+        and schema is not None
+        and schema.column_type(name) in (ColumnType.INT, ColumnType.FLOAT)
+    ]
+
+
+class Rollup:
+    """Pre-aggregated states of metrics per key combination of dimensions."""
+
+    def __init__(
+        self,
+        dimensions: Sequence[str],
+        metrics: Sequence[str],
+        groups: dict[tuple, dict[str, AggregateState]],
+        rows: int,
+    ):
+        self.dimensions = tuple(dimensions)
+        self.metrics = tuple(metrics)
+        self.groups = groups
+        self.rows = rows
+
+    @staticmethod
+    def path_for(file: Path) -> Path:
+        """Rollup path next to CSV file."""
+
+        return file.with_name(file.name + ROLLUP_SUFFIX)
+
+    @classmethod
+    @log
+    def build(
+        cls,
+        columns: dict[str, list[Any]],
+        dimensions: Sequence[str],
+        metrics: Sequence[str],
+    ) -> "Rollup":
+        """
+        Building rollup from typed columns.
+
+        Args:
+            columns: Dictionary of column name to converted values.
+            dimensions: Columns to group by.
+            metrics: Numeric columns to aggregate.
+
+        Returns:
+            Rollup with a state per metric for every key combination.
+        """
+
+        keys = list(zip(*(columns[name] for name in dimensions)))
+        positions: dict[tuple, list[int]] = defaultdict(list)
+        for position, key in enumerate(keys):
+            positions[key].append(position)
+
+        groups = {}
+        for key, indexes in positions.items():
+            states = {}
+            for metric in metrics:
+                values = columns[metric]
+                states[metric] = AggregateState()
+                states[metric].update([values[index] for index in indexes])
+            groups[key] = states
+
+        return cls(dimensions, metrics, groups, len(keys))
+
+    @classmethod
+    @log
+    def build_for(
+        cls, reader: CsvReader, dimensions: Sequence[str] = DEFAULT_DIMENSIONS
+    ) -> "Rollup":
+        """
+        Building rollup for CSV file from validated batches.
+
+        Args:
+            reader: Reader of CSV file with schema, invalid rows are
+                handled by its on_error policy.
+            dimensions: Columns to group by, missing ones are skipped.
+
+        Returns:
+            Rollup over all numeric columns outside dimensions.
+
+        Raises:
+            csv.Error: If row is invalid with fail policy or file is empty.
+        """
+
+        groups: dict[tuple, dict[str, AggregateState]] = {}
+        rows = 0
+        metrics: list[str] = []
+
+        for columns in reader.iter_batches():
+            if not rows:
+                dimensions = [name for name in dimensions if name in columns]
+                metrics = _numeric_columns(reader, columns, dimensions)
+
+            part = cls.build(columns, dimensions, metrics)
+            rows += part.rows
+            for key, states in part.groups.items():
+                if key not in groups:
+                    groups[key] = states
+                    continue
+                for metric, state in states.items():
+                    groups[key][metric].merge(state)
+
+        return cls(dimensions, metrics, groups, rows)
+
+    @log
+    def save(self, file: Path) -> Path:
+        """
+        Saving rollup next to CSV file.
+
+        Args:
+            file: Source CSV file.
+
+        Returns:
+            Path of saved rollup.
+        """
+
+        path = self.path_for(file)
+        content = {
+            "source": _source_stat(file),
+            "dimensions": self.dimensions,
+            "metrics": self.metrics,
+            "rows": self.rows,
+            "groups": [
+                [list(key), [states[metric].to_list() for metric in self.metrics]]
+                for key, states in self.groups.items()
+            ],
+        }
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(content, f, separators=(",", ":"))
+
+        return path
+
+    @classmethod
+    @log
+    def load_for(cls, file: Path) -> Optional["Rollup"]:
+        """
+        Loading rollup of CSV file.
+
+        Args:
+            file: Source CSV file.
+
+        Returns:
+            Rollup or None if it doesn't exist or file changed after building.
+        """
+
+        path = cls.path_for(file)
+        if not path.is_file() or not file.is_file():
+            return None
+
+        with open(path, "r", encoding="utf-8") as f:
+            content = json.load(f)
+
+        if content["source"] != _source_stat(file):
+            return None
+
+        metrics = content["metrics"]
+        groups = {
+            tuple(key): {
+                metric: AggregateState.from_list(state)
+                for metric, state in zip(metrics, states)
+            }
+            for key, states in content["groups"]
+        }
+
+        return cls(content["dimensions"], metrics, groups, content["rows"])
+
+    def covers(self, group_by: Sequence[str], metric: str) -> bool:
+        """Checking if rollup can answer grouped query."""
+
+        return metric in self.metrics and all(
+            name in self.dimensions for name in group_by
+        )
+
+    def group(
+        self, group_by: Sequence[str], metric: str
+    ) -> dict[tuple, AggregateState]:
+        """
+        Merging rollup states to coarser grouping.
+
+        Args:
+            group_by: Subset of rollup dimensions.
+            metric: Aggregated metric.
+
+        Returns:
+            Dictionary of group key to merged state.
+        """
+
+        positions = [self.dimensions.index(name) for name in group_by]
+        grouped: dict[tuple, AggregateState] = defaultdict(AggregateState)
+
+        for key, states in self.groups.items():
+            grouped[tuple(key[position] for position in positions)].merge(
+                states[metric]
+            )
+
+        return dict(grouped)
+
+
+def merge_rollups(
+    rollups: Sequence[Rollup], group_by: Sequence[str], metric: str
+) -> dict[tuple, AggregateState]:
+    """
+    Merging grouped states of several rollups.
+
+    Args:
+        rollups: Rollups covering query.
+        group_by: Columns to group by.
+        metric: Aggregated metric.
+
+    Returns:
+        Dictionary of group key to merged state.
+    """
+
+    merged: dict[tuple, AggregateState] = defaultdict(AggregateState)
+    for rollup in rollups:
+        for key, state in rollup.group(group_by, metric).items():
+            merged[key].merge(state)
+
+    return dict(merged)
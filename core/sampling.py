@@ -0,0 +1,169 @@
+import random
+from collections import defaultdict
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+from .sketches import ColumnSketch
+
+
+def reservoir_sample(
+    items: Iterable[Any],
+    size: int,
+    key: Optional[Callable[[Any], Hashable]] = None,
+    rng: Optional[random.Random] = None,
+) -> tuple[dict[Hashable, list[Any]], dict[Hashable, int]]:
+    """
+    Drawing uniform reservoir sample of items, one reservoir per key.
+
+    Args:
+        items: Items to sample from, consumed once.
+        size: Reservoir size for every key.
+        key: Function returning stratum of item, single stratum if None.
+        rng: Random generator.
+
+    Returns:
+        Tuple of (reservoirs by key, items count by key).
+    """
+
+    rng = rng or random.Random()
+    reservoirs: dict[Hashable, list[Any]] = defaultdict(list)
+    totals: dict[Hashable, int] = defaultdict(int)
+
+    for item in items:
+        stratum = key(item) if key is not None else None
+        totals[stratum] += 1
+        reservoir = reservoirs[stratum]
+
+        if len(reservoir) < size:
+            reservoir.append(item)
+        else:
+            index = rng.randrange(totals[stratum])
+            if index < size:
+                reservoir[index] = item
+
+    return dict(reservoirs), dict(totals)
+
+
+def _merge_reservoirs(
+    parts: list[tuple[list[Any], int]], size: int, rng: random.Random
+) -> list[Any]:
+    pools = [
+        (rng.sample(reservoir, len(reservoir)), total) for reservoir, total in parts
+    ]
+    merged: list[Any] = []
+
+    while len(merged) < size:
+        pools = [(pool, total) for pool, total in pools if pool]
+        if not pools:
+            break
+        weights = [total for _, total in pools]
+        pool_index = rng.choices(range(len(pools)), weights=weights)[0]
+        pool, total = pools[pool_index]
+        merged.append(pool.pop())
+        pools[pool_index] = (pool, total - 1)
+
+    return merged
+
+
+class Sample:
+    """Random sample of rows with population sizes and column sketches."""
+
+    def __init__(
+        self,
+        strata: dict[Hashable, list[dict[str, Any]]],
+        totals: dict[Hashable, int],
+        size: int,
+        stratify_by: Optional[str] = None,
+        sketches: Optional[dict[str, ColumnSketch]] = None,
+    ):
+        self.strata = strata
+        self.totals = totals
+        self.size = size
+        self.stratify_by = stratify_by
+        self.sketches = sketches or {}
+
+    @property
+    def rows(self) -> list[dict[str, Any]]:
+        """All sampled rows."""
+
+        return [row for rows in self.strata.values() for row in rows]
+
+    @property
+    def total(self) -> int:
+        """Number of rows the sample was drawn from."""
+
+        return sum(self.totals.values())
+
+    def population(self, stratum: Hashable) -> Optional[int]:
+        """
+        Getting number of rows in stratum.
+
+        Args:
+            stratum: Value of stratify column.
+
+        Returns:
+            Number of rows or None if sample isn't stratified.
+        """
+
+        if self.stratify_by is None:
+            return None
+        return self.totals.get(stratum, 0)
+
+    @classmethod
+    def merge(cls, samples: list["Sample"], seed: Optional[int] = None) -> "Sample":
+        """
+        Merging samples drawn from different files.
+
+        Args:
+            samples: Samples with the same size and stratify column.
+            seed: Random seed.
+
+        Returns:
+            Sample equivalent to drawing from concatenated files.
+
+        Raises:
+            ValueError: If samples were drawn differently.
+        """
+
+        if len({(s.size, s.stratify_by) for s in samples}) > 1:
+            error_msg = "Cannot merge samples with different size or stratification."
+            raise ValueError(error_msg)
+
+        rng = random.Random(seed)
+        parts: dict[Hashable, list[tuple[list[Any], int]]] = defaultdict(list)
+        sketches: dict[str, ColumnSketch] = {}
+
+        for sample in samples:
+            for stratum, rows in sample.strata.items():
+                parts[stratum].append((rows, sample.totals[stratum]))
+            for name, sketch in sample.sketches.items():
+                if name in sketches:
+                    sketches[name].merge(sketch)
+                else:
+                    sketches[name] = sketch
+
+        return cls(
+            strata={
+                stratum: _merge_reservoirs(stratum_parts, samples[0].size, rng)
+                for stratum, stratum_parts in parts.items()
+            },
+            totals={
+                stratum: sum(total for _, total in stratum_parts)
+                for stratum, stratum_parts in parts.items()
+            },
+            size=samples[0].size,
+            stratify_by=samples[0].stratify_by,
+            sketches=sketches,
+        )
+
+    def describe(self) -> list[dict[str, Any]]:
+        """
+        Describing column sketches.
+
+        Returns:
+            List of dictionaries with column name and sketch estimates.
+        """
+
+        return [
+            {"column": name, **sketch.describe()}
+            for name, sketch in self.sketches.items()
+        ]
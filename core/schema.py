@@ -0,0 +1,175 @@
+import sys
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from .logger import log
+
+DEFAULT_SAMPLE_SIZE = 100
+CATEGORY_RATIO = 0.5
+
+
+class ColumnType(Enum):
+    """Supported column types."""
+
+    INT = "int"
+    FLOAT = "float"
+    CATEGORY = "category"
+    STR = "str"
+
+    @property
+    def converter(self) -> Callable[[str], Any]:
+        """Converter from raw CSV string to column value."""
+
+        return _CONVERTERS[self]
+
+
+_CONVERTERS: dict[ColumnType, Callable[[str], Any]] = {
+    ColumnType.INT: int,
+    ColumnType.FLOAT: float,
+    ColumnType.CATEGORY: sys.intern,
+    ColumnType.STR: str,
+}
+
+
+def _all_convert(values: Sequence[str], converter: Callable[[str], Any]) -> bool:
+    try:
+        deque(map(converter, values), maxlen=0)
+    except ValueError:
+        return False
+    return True
+
+
+def _int_or_float(value: str) -> int | float:
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _infer_column_type(values: Sequence[str]) -> ColumnType:
+    if values and _all_convert(values, int):
+        return ColumnType.INT
+    if values and _all_convert(values, float):
+        return ColumnType.FLOAT
+    if values and len(set(values)) <= len(values) * CATEGORY_RATIO:
+        return ColumnType.CATEGORY
+    return ColumnType.STR
+
+
+class Schema:
+    """
+    Column types of a CSV file.
+
+    Inferred int columns are widened to float when later values are floats,
+    since their type is only a guess from the first rows.
+    """
+
+    def __init__(self, types: dict[str, ColumnType | str], widen: bool = False):
+        self.types = {name: ColumnType(value) for name, value in types.items()}
+        self.widen = widen
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Schema) and self.types == other.types
+
+    def __repr__(self) -> str:
+        items = ", ".join(f"{name}={kind.value}" for name, kind in self.types.items())
+        return f"Schema({items})"
+
+    @classmethod
+    @log
+    def infer(cls, header: Sequence[str], sample: Iterable[Sequence[str]]) -> "Schema":
+        """
+        Inferring schema from header and sample rows.
+
+        Args:
+            header: Column names.
+            sample: Sample rows with raw string values.
+
+        Returns:
+            Schema with a type for every column.
+        """
+
+        columns = list(zip(*sample)) or [()] * len(header)
+        return cls(
+            {name: _infer_column_type(values) for name, values in zip(header, columns)},
+            widen=True,
+        )
+
+    def column_type(self, name: str) -> ColumnType:
+        """Type of column, columns outside schema are strings."""
+
+        return self.types.get(name, ColumnType.STR)
+
+    def _converter(self, name: str) -> Callable[[str], Any]:
+        column_type = self.column_type(name)
+        if column_type is ColumnType.INT and self.widen:
+            return _int_or_float
+        return column_type.converter
+
+    def convert_column(self, name: str, values: Sequence[str]) -> list[Any]:
+        """
+        Converting whole column at once.
+
+        Args:
+            name: Column name.
+            values: Raw string values.
+
+        Returns:
+            List of converted values.
+
+        Raises:
+            ValueError: If some value doesn't match column type.
+                Inferred int column with float values becomes float column.
+        """
+
+        column_type = self.column_type(name)
+
+        try:
+            return list(map(column_type.converter, values))
+        except ValueError:
+            if self._converter(name) is _int_or_float and _all_convert(values, float):
+                self.types[name] = ColumnType.FLOAT
+                return list(map(float, values))
+
+            index = self.invalid_rows(name, values, limit=1)[0]
+            error_msg = (
+                f"Invalid {column_type.value} value {values[index]!r} "
+                f"in column '{name}'"
+            )
+            raise ValueError(error_msg)
+
+    def invalid_rows(
+        self, name: str, values: Sequence[str], limit: Optional[int] = None
+    ) -> list[int]:
+        """
+        Finding indexes of values that don't match column type.
+
+        Args:
+            name: Column name.
+            values: Raw string values.
+            limit: Maximum number of indexes to return.
+
+        Returns:
+            List of indexes of invalid values, floats are valid
+            in inferred int columns.
+        """
+
+        column_type = self.column_type(name)
+        if column_type in (ColumnType.CATEGORY, ColumnType.STR):
+            return []
+
+        converter = self._converter(name)
+        if _all_convert(values, converter):
+            return []
+
+        invalid = []
+        for index, value in enumerate(values):
+            try:
+                converter(value)
+            except ValueError:
+                invalid.append(index)
+                if limit is not None and len(invalid) >= limit:
+                    break
+
+        return invalid
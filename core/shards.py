@@ -0,0 +1,321 @@
+import csv
+import json
+import queue
+import socket
+import struct
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from .aggregation import AggregateState, GroupAggregator
+from .csv_tools import CsvReader
+from .logger import log
+from .reports import ReportRegistry
+from .validation import ErrorPolicy
+
+HEADER = struct.Struct(">I")
+DEFAULT_ADDRESS = ("127.0.0.1", 0)
+POLL_INTERVAL = 0.1
+WORKER_EXIT_TIMEOUT = 5.0
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    """
+    Parsing HOST:PORT address.
+
+    Raises:
+        ValueError: If address has no host or port.
+    """
+
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        error_msg = f"Address must be HOST:PORT, got {address!r}."
+        raise ValueError(error_msg)
+
+    return host, int(port)
+
+
+def send_message(sock: socket.socket, message: dict[str, Any]) -> None:
+    """Sending JSON message prefixed by its length."""
+
+    payload = json.dumps(message, separators=(",", ":")).encode()
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    return b"".join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Optional[dict[str, Any]]:
+    """Receiving message sent by send_message, None if connection is closed."""
+
+    header = _recv_exactly(sock, HEADER.size)
+    if header is None:
+        return None
+
+    payload = _recv_exactly(sock, HEADER.unpack(header)[0])
+    if payload is None:
+        return None
+
+    return json.loads(payload)
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+def process_shard(task: dict[str, Any]) -> dict[str, Any]:
+    """
+    Aggregating file of task into partial states of report.
+
+    Args:
+        task: Message with file, report name, report options, on_error policy
+            and whether rows are records.
+
+    Returns:
+        Result message with states, numbers of read and rejected rows,
+        or error message if file can't be aggregated.
+    """
+
+    file = task["file"]
+    try:
+        report = ReportRegistry.get_report(task["report"], **task["options"])
+        reader = CsvReader(
+            Path(file),
+            infer_schema=True,
+            records=task.get("records", False),
+            on_error=ErrorPolicy(task["on_error"]),
+        )
+        with report.aggregator() as aggregator:
+            report.aggregate(reader.iter_rows(), aggregator)
+            states = [[key, state.to_list()] for key, state in aggregator.items()]
+    except (OSError, ValueError, NotImplementedError, csv.Error) as e:
+        return {"type": "error", "file": file, "message": str(e)}
+
+    return {
+        "type": "result",
+        "file": file,
+        "states": states,
+        "rows": reader.rows_read,
+        "rejected": reader.rows_rejected,
+    }
+
+
+@log
+def run_worker(address: tuple[str, int]) -> None:
+    """
+    Connecting to coordinator and processing its tasks until it stops.
+
+    Args:
+        address: Host and port of coordinator.
+    """
+
+    try:
+        with socket.create_connection(address) as sock:
+            while True:
+                message = recv_message(sock)
+                if message is None or message["type"] != "task":
+                    return
+                send_message(sock, process_shard(message))
+    except OSError:
+        return
+
+
+class Coordinator:
+    """
+    Coordinator of workers aggregating files into partial states.
+
+    Workers connect to listening socket, local ones are started as
+    subprocesses, remote ones with the same files can join at any time.
+    Every worker gets one file at a time, so faster workers take more files,
+    and files of disconnected workers are given to others. Partial states
+    are merged into report aggregator as they arrive.
+    """
+
+    def __init__(
+        self,
+        report_name: str,
+        options: dict[str, Any],
+        on_error: ErrorPolicy = ErrorPolicy.FAIL,
+        address: tuple[str, int] = DEFAULT_ADDRESS,
+        records: bool = False,
+    ):
+        if on_error is ErrorPolicy.QUARANTINE:
+            error_msg = "Sharded mode doesn't support quarantine."
+            raise ValueError(error_msg)
+
+        self.report = ReportRegistry.get_report(report_name, **options)
+        self.task = {
+            "type": "task",
+            "report": report_name,
+            "options": options,
+            "on_error": on_error.value,
+            "records": records,
+        }
+        self.on_error = on_error
+        self.server = socket.create_server(address)
+        self.server.settimeout(POLL_INTERVAL)
+        self.address = self.server.getsockname()[:2]
+        self.rows = 0
+        self.rejected = 0
+        self.skipped: list[tuple[str, str]] = []
+        self._tasks: queue.Queue[str] = queue.Queue()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._error: Optional[str] = None
+        self._connections: set[socket.socket] = set()
+        self._aggregator: Optional[GroupAggregator] = None
+
+    def _finish(self, result: dict[str, Any]) -> None:
+        with self._lock:
+            if result["type"] == "error":
+                if self.on_error is ErrorPolicy.FAIL:
+                    self._error = result["message"]
+                    self._done.set()
+                    return
+                self.skipped.append((result["file"], result["message"]))
+            else:
+                for key, values in result["states"]:
+                    self._aggregator.merge(
+                        _hashable(key), AggregateState.from_list(values)
+                    )
+                self.rows += result["rows"]
+                self.rejected += result["rejected"]
+
+            self._pending -= 1
+            if not self._pending:
+                self._done.set()
+
+    def _next_task(self) -> Optional[str]:
+        while not self._done.is_set():
+            try:
+                return self._tasks.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return None
+
+    def _serve(self, conn: socket.socket) -> None:
+        file = None
+        try:
+            while (file := self._next_task()) is not None:
+                send_message(conn, {**self.task, "file": file})
+                result = recv_message(conn)
+                if result is None:
+                    return
+                self._finish(result)
+                file = None
+            send_message(conn, {"type": "stop"})
+        except OSError:
+            return
+        finally:
+            if file is not None:
+                self._tasks.put(file)
+            with self._lock:
+                self._connections.discard(conn)
+            conn.close()
+
+    def _accept(self) -> None:
+        while not self._done.is_set():
+            try:
+                conn, _ = self.server.accept()
+            except TimeoutError:
+                continue
+            except OSError:
+                return
+
+            conn.settimeout(None)
+            with self._lock:
+                self._connections.add(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _wait(self, processes: list[subprocess.Popen]) -> None:
+        while not self._done.wait(POLL_INTERVAL):
+            with self._lock:
+                idle = not self._connections
+            if processes and idle and all(p.poll() is not None for p in processes):
+                error_msg = f"All workers exited with {self._pending} files left."
+                raise ConnectionError(error_msg)
+
+        if self._error is not None:
+            raise ValueError(self._error)
+
+    @log
+    def run(
+        self,
+        files: Sequence[Path],
+        command: Sequence[str] = (),
+        workers: int = 0,
+    ) -> list[dict[str, Any]]:
+        """
+        Generating report from files aggregated on workers.
+
+        Args:
+            files: Files given to workers one by one.
+            command: Command starting local worker, address is appended to it.
+            workers: Number of local workers, remote ones may connect too.
+
+        Returns:
+            List of dictionaries from report.
+
+        Raises:
+            ValueError: If file is invalid with fail policy.
+            ConnectionError: If all local workers exit before files are done.
+        """
+
+        for file in files:
+            self._tasks.put(str(file))
+        self._pending = len(files)
+
+        host, port = self.address
+        processes = []
+        with self.report.aggregator() as aggregator:
+            self._aggregator = aggregator
+            try:
+                if files:
+                    accept = threading.Thread(target=self._accept, daemon=True)
+                    accept.start()
+                    processes = [
+                        subprocess.Popen([*command, f"{host}:{port}"])
+                        for _ in range(workers)
+                    ]
+                    self._wait(processes)
+            finally:
+                self._done.set()
+                self.close()
+                self._stop(processes)
+
+            return self.report.from_states(aggregator.items())
+
+    def _stop(self, processes: list[subprocess.Popen]) -> None:
+        for process in processes:
+            if self._error is not None or self._pending:
+                process.terminate()
+            try:
+                process.wait(timeout=WORKER_EXIT_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    def close(self) -> None:
+        """Closing listening socket and connections of workers."""
+
+        self.server.close()
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from .logger import log
 
@@ -41,3 +41,48 @@ def convert_to_number(value: Any) -> int | float:
     except ValueError:
         error_msg = f"Cannot convert value {value} to numeric."
         raise ValueError(error_msg)
+
+
+# not logged, it's called for every value of streamed rows
+def to_number(value: Any) -> Optional[int | float]:
+    """
+    Converting raw or already typed value into number.
+
+    Returns:
+        Value converted from string with surrounding spaces, value itself
+        if it isn't a string, None if string isn't numeric.
+    """
+
+    if not isinstance(value, str):
+        return value
+
+    value = value.strip()
+    if not is_numeric(value):
+        return None
+    return convert_to_number(value)
+
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+@log
+def parse_size(value: str) -> int:
+    """
+    Converting human-readable size into bytes.
+
+    Returns:
+        Number of bytes, e.g. 1536 for "1.5K" and 2147483648 for "2G".
+
+    Raises:
+        ValueError: If value isn't a valid size.
+    """
+
+    text = value.strip().upper().removesuffix("B")
+    unit = text[-1:] if text[-1:] in SIZE_UNITS else ""
+    number = text[: len(text) - len(unit)]
+
+    if not is_numeric(number) or float(number) < 0:
+        error_msg = f"Cannot convert value {value} to size."
+        raise ValueError(error_msg)
+
+    return int(float(number) * SIZE_UNITS[unit])
@@ -0,0 +1,235 @@
+import math
+from hashlib import blake2b
+from typing import Any, Callable, Iterable, Optional
+
+
+class HyperLogLog:
+    """HyperLogLog sketch for approximate distinct counts."""
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        """Adding value to the sketch."""
+
+        digest = blake2b(str(value).encode(), digest_size=8).digest()
+        hashed = int.from_bytes(digest, "big")
+        width = 64 - self.precision
+        index = hashed >> width
+        rank = width - (hashed & ((1 << width) - 1)).bit_length() + 1
+
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Merging other sketch of the same precision into this one."""
+
+        if other.precision != self.precision:
+            error_msg = "Cannot merge HyperLogLog sketches of different precision."
+            raise ValueError(error_msg)
+
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    @property
+    def relative_error(self) -> float:
+        """Standard relative error of the count."""
+
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def count(self) -> int:
+        """
+        Estimating number of distinct values.
+
+        Returns:
+            Approximate distinct count.
+        """
+
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0**-rank for rank in self.registers)
+        zeros = self.registers.count(0)
+
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+
+        return round(estimate)
+
+
+class TDigest:
+    """Merging t-digest for approximate quantiles."""
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.centroids: list[list[float]] = []
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: list[list[float]] = []
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """Adding value to the digest."""
+
+        self._buffer.append([value, weight])
+        self.total += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if len(self._buffer) >= self.compression * 5:
+            self._compress()
+
+    def merge(self, other: "TDigest") -> None:
+        """Merging other digest into this one."""
+
+        other._compress()
+        self._buffer.extend([mean, weight] for mean, weight in other.centroids)
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _q_limit(self, q: float) -> float:
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(2 * math.pi * k / self.compression) + 1) / 2
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+
+        points = sorted(self.centroids + self._buffer)
+        self._buffer = []
+        merged = [points[0][:]]
+        weight_before = 0.0
+        q_limit = self._q_limit(0.0)
+
+        for mean, weight in points[1:]:
+            last = merged[-1]
+            if (weight_before + last[1] + weight) / self.total <= q_limit:
+                last[0] += (mean - last[0]) * weight / (last[1] + weight)
+                last[1] += weight
+            else:
+                weight_before += last[1]
+                q_limit = self._q_limit(weight_before / self.total)
+                merged.append([mean, weight])
+
+        self.centroids = merged
+
+    def _centers(self) -> list[float]:
+        centers = []
+        cumulative = 0.0
+        for _, weight in self.centroids:
+            centers.append(cumulative + weight / 2)
+            cumulative += weight
+        return centers
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimating quantile.
+
+        Args:
+            q: Quantile in range [0, 1].
+
+        Returns:
+            Approximate quantile value or None for empty digest.
+        """
+
+        self._compress()
+        if not self.centroids:
+            return None
+
+        target = q * self.total
+        centers = self._centers()
+        points = [(0.0, self.min)]
+        points += [(center, mean) for center, (mean, _) in zip(centers, self.centroids)]
+        points.append((self.total, self.max))
+
+        for (left_rank, left), (right_rank, right) in zip(points, points[1:]):
+            if target <= right_rank:
+                if right_rank == left_rank:
+                    return right
+                share = (target - left_rank) / (right_rank - left_rank)
+                return left + (right - left) * share
+
+        return self.max
+
+    def rank_error(self, q: float) -> float:
+        """
+        Estimating rank error of quantile.
+
+        Args:
+            q: Quantile in range [0, 1].
+
+        Returns:
+            Half of the covering centroid weight as share of total.
+        """
+
+        self._compress()
+        if not self.centroids:
+            return 0.0
+
+        target = q * self.total
+        cumulative = 0.0
+        for _, weight in self.centroids:
+            cumulative += weight
+            if target <= cumulative:
+                return weight / 2 / self.total
+
+        return 0.0
+
+
+class ColumnSketch:
+    """Distinct count and optional quantile sketches of a column."""
+
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, converter: Optional[Callable[[str], Any]] = None):
+        self.distinct = HyperLogLog()
+        self.digest = TDigest() if converter is not None else None
+        self.converter = converter
+
+    def add(self, value: str) -> None:
+        """Adding raw value to the sketches."""
+
+        self.distinct.add(value)
+
+        if self.digest is not None:
+            try:
+                self.digest.add(self.converter(value))
+            except ValueError:
+                pass
+
+    def update(self, values: Iterable[str]) -> None:
+        """Adding raw values to the sketches."""
+
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "ColumnSketch") -> None:
+        """Merging other column sketch into this one."""
+
+        self.distinct.merge(other.distinct)
+        if self.digest is not None and other.digest is not None:
+            self.digest.merge(other.digest)
+
+    def describe(self) -> dict[str, Any]:
+        """
+        Describing sketches with error bounds.
+
+        Returns:
+            Dictionary with distinct count and quantiles.
+        """
+
+        description: dict[str, Any] = {
+            "distinct": self.distinct.count(),
+            "distinct_error": f"±{self.distinct.relative_error:.1%}",
+        }
+
+        if self.digest is not None:
+            for q in self.QUANTILES:
+                description[f"p{round(q * 100)}"] = self.digest.quantile(q)
+            rank_error = max(self.digest.rank_error(q) for q in self.QUANTILES)
+            description["rank_error"] = f"±{rank_error:.1%}"
+
+        return description
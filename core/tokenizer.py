@@ -0,0 +1,146 @@
+import csv
+import io
+from itertools import chain
+from operator import methodcaller
+from typing import Iterable, Iterator, Optional, TextIO
+
+BLOCK_SIZE = 1024 * 1024
+QUOTE_CHAR = '"'
+
+
+def is_simple(text: str) -> bool:
+    """
+    Checking if complete lines are in simple dialect.
+
+    Simple lines have no quotes, no carriage returns and no blank lines,
+    so splitting them by newline and delimiter gives the same rows as csv.reader.
+    """
+
+    return (
+        QUOTE_CHAR not in text
+        and "\r" not in text
+        and "\n\n" not in text
+        and not text.startswith("\n")
+    )
+
+
+def _blocks(
+    csvfile: TextIO, delimiter: str, block_size: int
+) -> Iterator[str | Iterator[list[str]]]:
+    carry = ""
+
+    while block := csvfile.read(block_size):
+        text = carry + block
+        end = text.rfind("\n") + 1
+        if not end:
+            carry = text
+            continue
+
+        lines, carry = text[:end], text[end:]
+        if not is_simple(lines):
+            rest = io.StringIO(lines + carry + csvfile.readline())
+            yield csv.reader(chain(rest, csvfile), delimiter=delimiter)
+            return
+
+        yield lines[:-1]
+
+    if carry:
+        yield carry if is_simple(carry) else csv.reader([carry], delimiter=delimiter)
+
+
+def read_rows(
+    csvfile: TextIO, delimiter: str = ",", block_size: int = BLOCK_SIZE
+) -> Iterator[list[str]]:
+    """
+    Reading rows of CSV text stream by large blocks.
+
+    Blocks of simple dialect are split by newline and delimiter, from the
+    first block with quotes, carriage returns or blank lines the rest of
+    stream is parsed by csv.reader, so rows are always the same as from it.
+
+    Args:
+        csvfile: Text stream opened with newline="".
+        delimiter: Field delimiter.
+        block_size: Number of characters read at once.
+
+    Yields: Lists of field values.
+    """
+
+    split = methodcaller("split", delimiter)
+
+    for block in _blocks(csvfile, delimiter, block_size):
+        if isinstance(block, str):
+            yield from map(split, block.split("\n"))
+        else:
+            yield from block
+
+
+def _extend_rows(columns: list[list[str]], rows: Iterable[list[str]]) -> None:
+    rows = list(rows)
+    first_row = len(columns[0]) + 1 if columns else 1
+    for index, row in enumerate(rows):
+        if len(row) != len(columns):
+            error_msg = f"Row {first_row + index}: More or less columns than headers in row: {row}"
+            raise csv.Error(error_msg)
+
+    for column, values in zip(columns, zip(*rows)):
+        column.extend(values)
+
+
+def _extend_columns(columns: list[list[str]], text: str, delimiter: str) -> None:
+    lines = text.split("\n")
+    count = len(columns)
+
+    if set(map(methodcaller("count", delimiter), lines)) == {count - 1}:
+        fields = text.replace("\n", delimiter).split(delimiter)
+        for index, column in enumerate(columns):
+            column.extend(fields[index::count])
+        return
+
+    _extend_rows(columns, (line.split(delimiter) for line in lines))
+
+
+def read_columns(
+    csvfile: TextIO, delimiter: str = ",", block_size: int = BLOCK_SIZE
+) -> tuple[list[str], list[list[str]]]:
+    """
+    Reading header and columns of CSV text stream without building rows.
+
+    Blocks of simple dialect with the same number of fields in every line
+    are split into one list of fields and sliced into columns, other blocks
+    are read by rows and checked against the header.
+
+    Args:
+        csvfile: Text stream opened with newline="".
+        delimiter: Field delimiter.
+        block_size: Number of characters read at once.
+
+    Returns:
+        Header and list of raw values for every header column.
+
+    Raises:
+        csv.Error: If number of fields of row differs from header.
+    """
+
+    header: Optional[list[str]] = None
+    columns: list[list[str]] = []
+
+    for block in _blocks(csvfile, delimiter, block_size):
+        if not isinstance(block, str):
+            rows = iter(block)
+            if header is None:
+                header = next(rows, [])
+                columns = [[] for _ in header]
+            _extend_rows(columns, rows)
+            continue
+
+        if header is None:
+            first, _, block = block.partition("\n")
+            header = first.split(delimiter)
+            columns = [[] for _ in header]
+            if not block:
+                continue
+
+        _extend_columns(columns, block, delimiter)
+
+    return header or [], columns
@@ -0,0 +1,216 @@
+import csv
+from enum import Enum
+from pathlib import Path
+from typing import Optional, Sequence, TextIO
+
+from .schema import Schema
+
+DEFAULT_MAX_ERRORS = 100
+DEFAULT_BATCH_SIZE = 65536
+
+
+class ErrorPolicy(Enum):
+    """What to do with invalid rows while streaming."""
+
+    FAIL = "fail"
+    SKIP = "skip"
+    QUARANTINE = "quarantine"
+
+
+class RowError:
+    """Validation error of a single data row."""
+
+    __slots__ = ("row", "message")
+
+    def __init__(self, row: int, message: str):
+        self.row = row
+        self.message = message
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, RowError)
+            and self.row == other.row
+            and self.message == other.message
+        )
+
+    def __repr__(self) -> str:
+        return f"RowError(row={self.row}, message={self.message!r})"
+
+    def __str__(self) -> str:
+        return f"Row {self.row}: {self.message}"
+
+
+class ValidationResult:
+    """Rows count and collected errors of validated file."""
+
+    def __init__(self, rows: int, errors: list[RowError], max_errors: int):
+        self.rows = rows
+        self.errors = errors
+        self.max_errors = max_errors
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether no errors were found."""
+
+        return not self.errors
+
+    @property
+    def truncated(self) -> bool:
+        """Whether validation stopped at max_errors."""
+
+        return len(self.errors) >= self.max_errors
+
+    def __str__(self) -> str:
+        lines = [str(error) for error in self.errors]
+        if self.truncated:
+            lines.append(f"Stopped after {self.max_errors} errors.")
+        return "\n".join(lines)
+
+
+class Quarantine:
+    """Side CSV file with rejected rows and reasons, created on first write."""
+
+    HEADER = ("file", "row", "reason", "raw")
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self._file: Optional[TextIO] = None
+        self._writer = None
+
+    def __enter__(self) -> "Quarantine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(
+        self,
+        file: Path,
+        row: Optional[int],
+        reason: str,
+        values: Sequence[str] = (),
+        delimiter: str = ",",
+    ) -> None:
+        """
+        Writing rejected row.
+
+        Args:
+            file: Source file of the row.
+            row: Row number, None for whole-file errors.
+            reason: Why the row was rejected.
+            values: Raw values of the row.
+            delimiter: Delimiter to join raw values with.
+        """
+
+        if self._writer is None:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.HEADER)
+
+        self._writer.writerow([file, row or "", reason, delimiter.join(values)])
+        self.count += 1
+
+    def close(self) -> None:
+        """Closing side file."""
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+
+def _field_count_errors(
+    header_count: int, rows: Sequence[list[str]], errors: dict[int, RowError]
+) -> None:
+    lengths = list(map(len, rows))
+    if lengths.count(header_count) == len(rows):
+        return
+
+    for index, length in enumerate(lengths):
+        if length != header_count:
+            errors[index] = RowError(
+                index, f"More or less columns than headers in row: {rows[index]}"
+            )
+
+
+def _empty_value_errors(
+    columns: list[tuple[str, ...]],
+    rows: Sequence[list[str]],
+    positions: Sequence[int],
+    errors: dict[int, RowError],
+) -> None:
+    for column in columns:
+        if "" not in column:
+            continue
+        for index, value in enumerate(column):
+            position = positions[index]
+            if not value and position not in errors:
+                errors[position] = RowError(
+                    position, f"Empty value in row: {rows[index]}"
+                )
+
+
+def _type_errors(
+    header: Sequence[str],
+    columns: list[tuple[str, ...]],
+    rows: Sequence[list[str]],
+    positions: Sequence[int],
+    schema: Schema,
+    errors: dict[int, RowError],
+) -> None:
+    for name, column in zip(header, columns):
+        column_type = schema.column_type(name)
+        for index in schema.invalid_rows(name, column):
+            position = positions[index]
+            if position not in errors:
+                errors[position] = RowError(
+                    position,
+                    f"Invalid {column_type.value} value in column '{name}' "
+                    f"in row: {rows[index]}",
+                )
+
+
+def validate_batch(
+    header: Sequence[str],
+    rows: Sequence[list[str]],
+    first_row: int = 1,
+    schema: Optional[Schema] = None,
+    limit: Optional[int] = None,
+) -> list[RowError]:
+    """
+    Validating batch of rows column by column.
+
+    Every row gets at most one error: wrong field count first,
+    then empty value, then value not matching schema.
+
+    Args:
+        header: Column names.
+        rows: Raw rows of the batch.
+        first_row: Number of first row in the batch.
+        schema: Schema to check value types against.
+        limit: Maximum number of errors to return.
+
+    Returns:
+        List of errors sorted by row number.
+    """
+
+    errors: dict[int, RowError] = {}
+    positions: Sequence[int] = range(len(rows))
+
+    _field_count_errors(len(header), rows, errors)
+    if errors:
+        positions = [index for index in positions if index not in errors]
+        rows = [rows[index] for index in positions]
+
+    columns = list(zip(*rows))
+    _empty_value_errors(columns, rows, positions, errors)
+
+    if schema is not None:
+        _type_errors(header, columns, rows, positions, schema, errors)
+
+    result = [errors[position] for position in sorted(errors)][:limit]
+    for error in result:
+        error.row += first_row
+
+    return result
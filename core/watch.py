@@ -0,0 +1,316 @@
+import csv
+import ctypes
+import os
+import select
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Hashable, Iterable, Optional, Sequence
+
+from .aggregation import AggregateState
+from .compression import COMPRESSED_SUFFIXES
+from .csv_tools import CsvReader
+from .logger import log
+from .reports import BaseReport
+from .schema import Schema
+
+POLL_INTERVAL = 1.0
+FINGERPRINT_SIZE = 64
+READ_SIZE = 64 * 1024
+
+# inotify events of files created, written, moved or deleted in directory
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+
+
+class Inotify:
+    """Waiting for changes in directories with Linux inotify, called through libc."""
+
+    def __init__(self, directories: Iterable[Path]):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error_msg = "Can't initialize inotify."
+            raise OSError(ctypes.get_errno(), error_msg)
+
+        for directory in set(directories):
+            if libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK) < 0:
+                self.close()
+                error_msg = f"Can't watch directory {directory}."
+                raise OSError(ctypes.get_errno(), error_msg)
+
+    def wait(self, timeout: float) -> None:
+        """Waiting for any event up to timeout seconds, events are discarded."""
+
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        while ready:
+            try:
+                os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                return
+
+    def close(self) -> None:
+        """Closing inotify descriptor."""
+
+        os.close(self.fd)
+
+
+class Poller:
+    """Waiting for next poll of files, when inotify isn't available."""
+
+    def wait(self, timeout: float) -> None:
+        """Sleeping for timeout seconds."""
+
+        time.sleep(timeout)
+
+    def close(self) -> None:
+        """Nothing to close."""
+
+
+def create_waiter(directories: Iterable[Path]) -> Inotify | Poller:
+    """Creating inotify waiter for directories, poller on other platforms."""
+
+    try:
+        return Inotify(directories)
+    except (AttributeError, TypeError, OSError):
+        return Poller()
+
+
+def _stat(file: Path) -> tuple[int, int]:
+    try:
+        stat = file.stat()
+    except OSError:
+        return -1, -1
+
+    return stat.st_size, stat.st_mtime_ns
+
+
+class FileState:
+    """Partial group states of file with position its rows are read to."""
+
+    __slots__ = (
+        "size",
+        "mtime_ns",
+        "offset",
+        "head",
+        "tail",
+        "schema",
+        "states",
+        "rows",
+        "rejected",
+        "error",
+    )
+
+    def __init__(self, size: int, mtime_ns: int, error: Optional[str] = None):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.offset: Optional[int] = None
+        self.head = b""
+        self.tail = b""
+        self.schema: Optional[Schema] = None
+        self.states: dict[Hashable, AggregateState] = {}
+        self.rows = 0
+        self.rejected = 0
+        self.error = error
+
+    def appended(self, file: Path, size: int) -> bool:
+        """Checking if file only grew since it was read to offset."""
+
+        if self.offset is None or size <= self.offset:
+            return False
+
+        with open(file, "rb") as f:
+            if f.read(len(self.head)) != self.head:
+                return False
+            f.seek(self.offset - len(self.tail))
+            return f.read(len(self.tail)) == self.tail
+
+
+class Watcher:
+    """
+    Report kept up to date with partial group states of every file.
+
+    Changed files are aggregated again, only complete lines appended to
+    plain CSV files are read when the rest of file is unchanged. Files that
+    fail to be read keep no states until they change again.
+    """
+
+    def __init__(self, report: BaseReport, readers: Sequence[CsvReader]):
+        self.report = report
+        self.readers = {reader.file: reader for reader in readers}
+        self.files: dict[Path, FileState] = {}
+
+    @property
+    def rows(self) -> int:
+        """Number of aggregated rows of all files."""
+
+        return sum(state.rows for state in self.files.values())
+
+    @property
+    def rejected(self) -> int:
+        """Number of rejected rows of all files."""
+
+        return sum(state.rejected for state in self.files.values())
+
+    def _reader(
+        self,
+        template: CsvReader,
+        schema: Optional[Schema] = None,
+        content: Optional[bytes] = None,
+    ) -> CsvReader:
+        return CsvReader(
+            template.file,
+            template.delimiter,
+            schema=schema,
+            infer_schema=template.infer_schema,
+            max_errors=template.max_errors,
+            on_error=template.on_error,
+            quarantine=template.quarantine,
+            records=template.records,
+            content=content,
+        )
+
+    def _aggregate(self, reader: CsvReader) -> dict[Hashable, AggregateState]:
+        with self.report.aggregator() as aggregator:
+            self.report.aggregate(reader.iter_rows(), aggregator)
+            return dict(aggregator.items())
+
+    def _read_file(self, template: CsvReader, size: int, mtime_ns: int) -> FileState:
+        reader = self._reader(template)
+        state = FileState(size, mtime_ns)
+        state.states = self._aggregate(reader)
+        state.rows = reader.rows_read
+        state.rejected = reader.rows_rejected
+        state.schema = reader.schema
+
+        file = template.file
+        if file.suffix in COMPRESSED_SUFFIXES or _stat(file) != (size, mtime_ns):
+            return state
+
+        with open(file, "rb") as f:
+            state.head = f.read(FINGERPRINT_SIZE)
+            f.seek(max(0, size - FINGERPRINT_SIZE))
+            tail = f.read(FINGERPRINT_SIZE)
+
+        # partial last line may be continued, so file is read again then
+        if tail.endswith(b"\n"):
+            state.offset = size
+            state.tail = tail
+
+        return state
+
+    def _read_appended(
+        self, template: CsvReader, state: FileState, size: int, mtime_ns: int
+    ) -> FileState:
+        with open(template.file, "rb") as f:
+            header = f.readline()
+            f.seek(state.offset)
+            data = f.read(size - state.offset)
+
+        end = data.rfind(b"\n") + 1
+        if end:
+            reader = self._reader(template, state.schema, header + data[:end])
+            for key, group in self._aggregate(reader).items():
+                if key in state.states:
+                    state.states[key].merge(group)
+                else:
+                    state.states[key] = group
+            state.rows += reader.rows_read
+            state.rejected += reader.rows_rejected
+            state.offset += end
+            state.tail = (state.tail + data[:end])[-FINGERPRINT_SIZE:]
+
+        state.size = size
+        state.mtime_ns = mtime_ns
+
+        return state
+
+    def _read(
+        self, template: CsvReader, state: Optional[FileState], size: int, mtime_ns: int
+    ) -> FileState:
+        try:
+            if state is not None and state.appended(template.file, size):
+                return self._read_appended(template, state, size, mtime_ns)
+            return self._read_file(template, size, mtime_ns)
+        except (OSError, ValueError, csv.Error) as e:
+            return FileState(size, mtime_ns, str(e))
+
+    @log
+    def refresh(self) -> list[Path]:
+        """
+        Reading files changed since previous refresh, all files on the first one.
+
+        Returns:
+            Changed files.
+        """
+
+        changed = []
+        for file, template in self.readers.items():
+            size, mtime_ns = _stat(file)
+            state = self.files.get(file)
+            if state is not None and (state.size, state.mtime_ns) == (size, mtime_ns):
+                continue
+
+            self.files[file] = self._read(template, state, size, mtime_ns)
+            changed.append(file)
+
+        return changed
+
+    def errors(self, files: Iterable[Path]) -> list[tuple[Path, str]]:
+        """Errors of files that couldn't be read."""
+
+        return [
+            (file, self.files[file].error)
+            for file in files
+            if self.files[file].error is not None
+        ]
+
+    def result(self) -> list[dict[str, Any]]:
+        """Generating report from merged states of all files."""
+
+        with self.report.aggregator() as aggregator:
+            for state in self.files.values():
+                for key, group in state.states.items():
+                    aggregator.merge(key, group)
+            return self.report.from_states(aggregator.items())
+
+
+@log
+def watch(
+    watcher: Watcher,
+    on_update: Callable[[list[Path], float], None],
+    interval: float = POLL_INTERVAL,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """
+    Refreshing watcher on every change of its files until stopped.
+
+    Files are refreshed first right away, then after inotify events of their
+    directories or every interval seconds, whichever comes first.
+
+    Args:
+        watcher: Watcher of report files.
+        on_update: Callback getting changed files and seconds refresh took.
+        interval: Seconds between polls of files.
+        stop: Event stopping the loop, it runs until interrupted if None.
+    """
+
+    waiter = create_waiter(file.resolve().parent for file in watcher.readers)
+    try:
+        while True:
+            start = time.perf_counter()
+            changed = watcher.refresh()
+            if changed:
+                on_update(changed, time.perf_counter() - start)
+            if stop is not None and stop.is_set():
+                return
+            waiter.wait(interval)
+    finally:
+        waiter.close()
@@ -1,31 +1,126 @@
+import inspect
 import sys
+import time
 from csv import Error as csv_Error
 from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
 
 from core import (
     ArgParser,
+    BaseReport,
     CsvReader,
     ReportRegistry,
     print_table,
     setup_logging,
 )
-from core.defined_reports import AverageGDPReport
+from core.compression import STDIN
+from core.dedup import DedupPolicy, Deduplicator, priority_order
+from core.manifest import MANIFEST_NAME, Manifest
+from core.planner import Plan, Strategy, plan_execution
+from core.prefetch import DEFAULT_PREFETCH_WORKERS, Prefetcher
+from core.query import Dataset, repl
+from core.defined_reports import (
+    AverageGDPReport,
+    EconomySummaryReport,
+    GDPTrendsReport,
+)
+from core.results import ResultSet
+from core.rollups import Rollup
+from core.sampling import Sample
+from core.shards import DEFAULT_ADDRESS, Coordinator, run_worker
+from core.validation import DEFAULT_MAX_ERRORS, ErrorPolicy, Quarantine
+from core.watch import Watcher, watch
 
 
-def main():
-    """Entry point for the application."""
+def scan_inputs(
+    args, quarantine: Optional[Quarantine] = None
+) -> tuple[Optional[Manifest], list[Path]]:
+    """
+    Scanning input directories and rejecting files with incompatible headers.
 
-    setup_logging()
+    Files with the most common set of columns are kept, others fail the run
+    with fail policy and are skipped with skip or quarantine policies.
+    """
 
-    ReportRegistry.register_report("average-gdp", AverageGDPReport)
+    if args.input_dir is None:
+        return None, []
 
-    parser = ArgParser()
-    args = parser.parse_args()
+    directories = [Path(directory) for directory in args.input_dir]
+    path = Path(args.manifest) if args.manifest else directories[0] / MANIFEST_NAME
+    manifest = Manifest.scan(directories, args.pattern, Manifest.load(path))
 
-    all_data = []
-    for file_path in args.files:
-        path = Path(file_path)
-        reader = CsvReader(path)
+    groups = manifest.groups()
+    if not groups:
+        print(f"Error: No CSV files found in {', '.join(args.input_dir)}.")
+        sys.exit(1)
+
+    expected = ", ".join(groups[0][0].header)
+    for group in groups[1:]:
+        files = ", ".join(str(entry.path) for entry in group)
+        reason = (
+            f"header {', '.join(group[0].header) or '(unreadable)'} "
+            f"is incompatible with {expected}"
+        )
+        if not args.on_error or args.on_error == ErrorPolicy.FAIL.value:
+            print(f"Error: {files}: {reason}.")
+            sys.exit(1)
+
+        print(f"Skipping {files}: {reason}.")
+        if quarantine is not None:
+            for entry in group:
+                quarantine.write(entry.path, None, reason)
+
+    return manifest, [entry.path for entry in groups[0]]
+
+
+def create_readers(
+    args,
+    quarantine: Optional[Quarantine] = None,
+    scanned: Sequence[Path] = (),
+) -> list[CsvReader]:
+    """Creating readers for all input files and files found in input directories."""
+
+    files = list(args.files or []) + list(scanned)
+    if args.stdin:
+        files.append(STDIN)
+
+    max_errors = DEFAULT_MAX_ERRORS if args.max_errors is None else args.max_errors
+    on_error = ErrorPolicy(args.on_error or ErrorPolicy.FAIL.value)
+
+    readers = [
+        CsvReader(
+            Path(file_path),
+            infer_schema=True,
+            max_errors=max_errors,
+            records=args.records,
+            on_error=on_error,
+            quarantine=quarantine,
+        )
+        for file_path in files
+    ]
+
+    if args.dedup_key is not None:
+        policy = DedupPolicy(args.dedup_policy or DedupPolicy.LAST_FILE.value)
+        readers = priority_order(readers, policy)
+
+    return readers
+
+
+def check_files(readers: list[CsvReader], manifest: Optional[Manifest] = None) -> None:
+    """
+    Validating all files before processing, stdin is validated while streaming.
+
+    Files validated in previous runs and unchanged since are skipped.
+    """
+
+    unchanged = 0
+    for reader in readers:
+        if reader.is_stdin:
+            continue
+
+        if manifest is not None and manifest.is_valid(reader.file):
+            unchanged += 1
+            continue
 
         try:
             print(reader.check_csv_file_valid)
@@ -33,21 +128,457 @@ def main():
             print(f"Error: {e}")
             sys.exit(1)
 
-        data = reader.load_csv
-        all_data.extend(data)
+        if manifest is not None:
+            manifest.mark_valid(reader.file)
+
+    if unchanged:
+        print(f"Skipped validation of {unchanged} unchanged files.")
+
+
+def stream_rows(readers: list[CsvReader]) -> Iterator[dict[str, Any]]:
+    """Streaming rows of all files, skipping broken files unless policy is fail."""
+
+    for reader in readers:
+        try:
+            yield from reader.iter_rows()
+        except (FileNotFoundError, ValueError, csv_Error) as e:
+            if reader.on_error is ErrorPolicy.FAIL:
+                raise
+            print(f"Skipping {reader.file}: {e}")
+            if reader.quarantine is not None:
+                reader.quarantine.write(reader.file, None, str(e))
+
+
+def build_index(readers: list[CsvReader]) -> None:
+    """Building rollup index files for all files, skipping broken files unless policy is fail."""
+
+    for reader in readers:
+        if reader.is_stdin:
+            print("Rollup can't be built for stdin, skipping.")
+            continue
+        try:
+            rollup = Rollup.build_for(reader)
+        except (FileNotFoundError, ValueError, csv_Error) as e:
+            if reader.on_error is ErrorPolicy.FAIL:
+                raise
+            print(f"Skipping {reader.file}: {e}")
+            continue
+        path = rollup.save(reader.file)
+        print(f"Rollup {path} is built with {len(rollup.groups)} groups.")
+        if reader.rows_rejected:
+            print(f"Rejected {reader.rows_rejected} invalid rows of {reader.file}.")
+
+
+def from_rollups(
+    report: BaseReport, readers: list[CsvReader]
+) -> Optional[tuple[list[dict[str, Any]], int]]:
+    """Report and number of records from rollups if all files have fresh ones answering it."""
+
+    if any(reader.is_stdin for reader in readers):
+        return None
+
+    rollups = [Rollup.load_for(reader.file) for reader in readers]
+    if not all(rollups):
+        return None
+
+    result = report.from_rollups(rollups)
+    if result is None:
+        return None
+
+    return result, sum(rollup.rows for rollup in rollups)
+
+
+def run_streaming(
+    report_name: str,
+    report: BaseReport,
+    readers: list[CsvReader],
+    deduplicator: Optional[Deduplicator] = None,
+) -> list[dict[str, Any]]:
+    """Generating report from validated rows streamed in a single pass."""
+
+    if deduplicator is None:
+        result = report.generate(stream_rows(readers))
+    else:
+        result = report.generate(
+            deduplicator.dedup(stream_rows([reader]) for reader in readers)
+        )
+
+    duplicates = 0 if deduplicator is None else deduplicator.duplicates
+    records = sum(reader.rows_read for reader in readers) - duplicates
+    rejected = sum(reader.rows_rejected for reader in readers)
+
+    print_table(result, title=f"Report: {report_name.upper()} ({records} records)")
+
+    if rejected:
+        print(f"Rejected {rejected} invalid rows.")
+
+    if duplicates:
+        print(f"Dropped {duplicates} duplicate rows.")
+
+    return result
+
+
+def run_columnar(
+    report_name: str, report: BaseReport, readers: list[CsvReader]
+) -> Optional[list[dict[str, Any]]]:
+    """Generating report from typed columns of all files if report supports it."""
+
+    columns: dict[str, list[Any]] = {}
+    for index, reader in enumerate(readers):
+        file_columns = reader.load_columns
+        if index and file_columns.keys() != columns.keys():
+            return None
+        for name, values in file_columns.items():
+            columns.setdefault(name, []).extend(values)
+
+    result = report.generate_columns(columns)
+    if result is None:
+        return None
+
+    records = len(next(iter(columns.values()), []))
+    print_table(result, title=f"Report: {report_name.upper()} ({records} records)")
+    return result
+
+
+def run_exact(
+    report_name: str,
+    report: BaseReport,
+    readers: list[CsvReader],
+    plan: Plan,
+    deduplicator: Optional[Deduplicator] = None,
+) -> list[dict[str, Any]]:
+    """Generating report from inputs as planned."""
+
+    if deduplicator is not None:
+        return run_streaming(report_name, report, readers, deduplicator)
+
+    if plan.strategy in (Strategy.STREAMING, Strategy.SPILL):
+        return run_streaming(report_name, report, readers)
+
+    if plan.strategy is Strategy.COLUMNAR:
+        result = run_columnar(report_name, report, readers)
+        if result is not None:
+            return result
+
+    all_data = []
+    for reader in readers:
+        all_data.extend(reader.load_csv)
+
+    result = report.generate(all_data)
+
+    print_table(
+        result, title=f"Report: {report_name.upper()} ({len(all_data)} records)"
+    )
+    return result
+
+
+def run_sharded(
+    report_name: str,
+    options: dict[str, Any],
+    readers: list[CsvReader],
+    args,
+    workers: int,
+) -> list[dict[str, Any]]:
+    """Generating report from partial states of files aggregated on workers."""
+
+    command = [sys.executable, str(Path(__file__).resolve())]
+    if args.specs is not None:
+        command += ["--specs", str(Path(args.specs).resolve())]
+    if args.plugins is not None:
+        command += ["--plugins", *(str(Path(path).resolve()) for path in args.plugins)]
+    command.append("--worker")
+
+    coordinator = Coordinator(
+        report_name,
+        options,
+        ErrorPolicy(args.on_error or ErrorPolicy.FAIL.value),
+        args.listen or DEFAULT_ADDRESS,
+        records=args.records,
+    )
+    result = coordinator.run([reader.file for reader in readers], command, workers)
+
+    print_table(
+        result, title=f"Report: {report_name.upper()} ({coordinator.rows} records)"
+    )
+
+    for file, reason in coordinator.skipped:
+        print(f"Skipping {file}: {reason}")
+
+    if coordinator.rejected:
+        print(f"Rejected {coordinator.rejected} invalid rows.")
+
+    return result
+
+
+def run_watch(
+    report_name: str, report: BaseReport, readers: list[CsvReader]
+) -> list[dict[str, Any]]:
+    """Printing report again on every change of input files until interrupted."""
 
+    watcher = Watcher(report, readers)
+    result: list[dict[str, Any]] = []
+
+    def render(changed: list[Path], seconds: float) -> None:
+        nonlocal result
+        start = time.perf_counter()
+        result = watcher.result()
+        seconds += time.perf_counter() - start
+
+        print_table(
+            result,
+            title=(
+                f"Report: {report_name.upper()} ({watcher.rows} records, "
+                f"updated {time.strftime('%H:%M:%S')})"
+            ),
+        )
+        for file, error in watcher.errors(changed):
+            print(f"Skipping {file} until it changes: {error}")
+        if watcher.rejected:
+            print(f"Rejected {watcher.rejected} invalid rows.")
+        print(f"Updated {len(changed)} files in {seconds * 1000:.0f} ms, watching.")
+
+    try:
+        watch(watcher, render)
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+
+    return result
+
+
+def run_repl(readers: list[CsvReader]) -> None:
+    """Loading all files once and answering queries at prompt until exit."""
+
+    start = time.perf_counter()
+    dataset = Dataset.load(readers)
+    milliseconds = (time.perf_counter() - start) * 1000
+
+    print(
+        f"Loaded {dataset.rows} records of {len(readers)} files in "
+        f"{milliseconds:.0f} ms, type help for queries."
+    )
+
+    rejected = sum(reader.rows_rejected for reader in readers)
+    if rejected:
+        print(f"Rejected {rejected} invalid rows.")
     try:
-        report_instance = ReportRegistry.get_report(args.report)
-        result = report_instance.generate(all_data)
+        repl(dataset)
+    except KeyboardInterrupt:
+        print()
+
+
+def run_approximate(
+    report_name: str, report: BaseReport, readers: list[CsvReader], args
+) -> list[dict[str, Any]]:
+    """Estimating report from random sample of rows."""
+
+    sample = Sample.merge(
+        [
+            reader.load_sample(
+                args.sample_size,
+                stratify_by=report.stratify_by,
+                sketch_columns=report.sketch_columns,
+                seed=args.seed,
+            )
+            for reader in readers
+        ],
+        seed=args.seed,
+    )
+    result = report.estimate(sample)
+
+    print_table(
+        result,
+        title=(
+            f"Report: {report_name.upper()} "
+            f"(~{len(sample.rows)} of {sample.total} records sampled)"
+        ),
+    )
+    print_table(sample.describe(), title="Column sketches")
+
+    return result
+
+
+def register_reports(specs: Optional[str], plugins: Sequence[str] = ()) -> None:
+    """
+    Registering defined reports, declarative reports from specs file and plugins.
+
+    Plugins of installed packages and directories are imported only when used.
+    """
+
+    ReportRegistry.register_report("average-gdp", AverageGDPReport)
+    ReportRegistry.register_report("gdp-trends", GDPTrendsReport)
+    ReportRegistry.register_report("economy-summary", EconomySummaryReport)
+
+    try:
+        if specs is not None:
+            ReportRegistry.load_specs(Path(specs))
+        ReportRegistry.discover_plugins(Path(directory) for directory in plugins)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+def create_prefetcher(
+    readers: list[CsvReader], workers: Optional[int]
+) -> Optional[Prefetcher]:
+    """Creating prefetcher of input files shared by all readers."""
+
+    workers = DEFAULT_PREFETCH_WORKERS if workers is None else workers
+    if workers <= 0:
+        return None
+
+    prefetcher = Prefetcher(
+        [reader.file for reader in readers if not reader.is_stdin], workers
+    )
+    for reader in readers:
+        reader.prefetcher = prefetcher
+
+    return prefetcher
+
+
+def report_options(args) -> dict[str, Any]:
+    """Options of requested report given in arguments, options not set aren't passed."""
+
+    options = {
+        "memory_limit": args.memory_limit,
+        "window": args.window,
+        "group_by": args.group_by,
+    }
+
+    return {name: value for name, value in options.items() if value is not None}
+
+
+def generate_report(
+    args, report: BaseReport, options: dict[str, Any], readers: list[CsvReader]
+) -> list[dict[str, Any]]:
+    """Generating report in mode chosen by arguments."""
+
+    if args.shards is not None:
+        return run_sharded(args.report, options, readers, args, args.shards)
+
+    if args.sample_size:
+        return run_approximate(args.report, report, readers, args)
 
+    if args.watch:
+        return run_watch(args.report, report, readers)
+
+    dedup = args.dedup_key is not None
+    answered = None if dedup else from_rollups(report, readers)
+    plan = plan_execution(
+        report, readers, args.memory_limit, dedup=dedup, rollups=answered is not None
+    )
+    if args.explain:
+        print_table(plan.describe(), title="Execution plan")
+
+    if answered is not None:
+        result, records = answered
         print_table(
-            result, title=f"Report: {args.report.upper()} ({len(all_data)} records)"
+            result,
+            title=f"Report: {args.report.upper()} ({records} records, from rollups)",
         )
+        return result
+
+    if plan.strategy is Strategy.PARALLEL:
+        parameters = inspect.signature(type(report)).parameters
+        if plan.worker_memory_limit is not None and "memory_limit" in parameters:
+            options = {**options, "memory_limit": plan.worker_memory_limit}
+        return run_sharded(args.report, options, readers, args, plan.workers)
+
+    deduplicator = None
+    if dedup:
+        deduplicator = Deduplicator(args.dedup_key, args.memory_limit)
+
+    return run_exact(args.report, report, readers, plan, deduplicator)
+
+
+def compare_result(args, report: BaseReport, result: list[dict[str, Any]]) -> None:
+    """Printing difference from baseline result and saving result as new baseline."""
+
+    result_set = ResultSet.from_result(
+        ReportRegistry.qualified_name(args.report), result, report.result_key
+    )
+
+    if args.diff is not None:
+        baseline = ResultSet.load(Path(args.diff))
+        print_table(
+            result_set.diff(baseline),
+            title=f"Diff: {args.report.upper()} against {args.diff}",
+        )
+
+    if args.save_result is not None:
+        result_set.save(Path(args.save_result))
+        print(f"Result is saved to {args.save_result}.")
+
+
+def run(args, readers: list[CsvReader], manifest: Optional[Manifest] = None) -> None:
+    """Validating files, building index and generating requested report."""
+
+    # sampled rows are validated while sampling, files aren't scanned twice
+    if (
+        args.shards is None
+        and not args.sample_size
+        and (not args.on_error or args.on_error == ErrorPolicy.FAIL.value)
+    ):
+        check_files(readers, manifest)
+
+    try:
+        if args.build_index:
+            build_index(readers)
+            if args.report is None and not args.query:
+                return
+
+        if args.query:
+            run_repl(readers)
+            return
+
+        options = report_options(args)
+        report_instance = ReportRegistry.get_report(args.report, **options)
+        result = generate_report(args, report_instance, options, readers)
 
-    except ValueError as e:
+        if args.diff is not None or args.save_result is not None:
+            compare_result(args, report_instance, result)
+
+    except (OSError, ValueError, NotImplementedError, csv_Error) as e:
         print(f"Error: {e}")
         sys.exit(1)
 
 
+def main():
+    """Entry point for the application."""
+
+    setup_logging()
+
+    parser = ArgParser()
+    args = parser.parse_args()
+
+    register_reports(args.specs, args.plugins or ())
+
+    if args.worker is not None:
+        run_worker(args.worker)
+        return
+
+    quarantine = None
+    if args.on_error == ErrorPolicy.QUARANTINE.value:
+        quarantine = Quarantine(Path(args.quarantine_file or "quarantine.csv"))
+
+    manifest, scanned = scan_inputs(args, quarantine)
+    readers = create_readers(args, quarantine, scanned)
+    prefetcher = create_prefetcher(readers, args.prefetch)
+
+    try:
+        run(args, readers, manifest)
+
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
+
+        if manifest is not None:
+            manifest.save()
+
+        if quarantine is not None:
+            quarantine.close()
+            if quarantine.count:
+                print(f"Quarantined {quarantine.count} entries to {quarantine.path}.")
+
+
 if __name__ == "__main__":
     main()
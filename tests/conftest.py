@@ -287,3 +287,94 @@ def zero_files_args() -> list[str]:
     """Zero-files arguments for testing arg_parser."""
 
     return ["--files", "--report", "average-gdp"]
+
+
+@pytest.fixture
+def economic_schema():
+    """Schema of economic CSV files."""
+
+    from core import Schema
+
+    return Schema(
+        {
+            "country": "category",
+            "year": "int",
+            "gdp": "int",
+            "gdp_growth": "float",
+            "inflation": "float",
+            "unemployment": "float",
+            "population": "int",
+            "continent": "category",
+        }
+    )
+
+
+@pytest.fixture
+def wrong_type_csv_file() -> Iterator[Path]:
+    """Creating a temporary CSV file with non-numeric gdp for testing csv_tools."""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write(
+            "country,year,gdp,gdp_growth,inflation,unemployment,population,continent\n"
+        )
+        f.write("United States,2023,25462,2.1,3.4,3.7,339,North America\n")
+        f.write("China,2022,unknown,5.5,8.4,13.0,48,Asia\n")
+        temp_path = Path(f.name)
+
+    yield temp_path
+
+    temp_path.unlink()
+
+
+@pytest.fixture(params=[".gz", ".bz2", ".xz"])
+def compressed_csv_file(request, valid_csv_file: Path) -> Iterator[Path]:
+    """Creating a temporary compressed copy of valid CSV file."""
+
+    import bz2
+    import gzip
+    import lzma
+
+    modules = {".gz": gzip, ".bz2": bz2, ".xz": lzma}
+    temp_path = valid_csv_file.with_name(valid_csv_file.name + request.param)
+    temp_path.write_bytes(modules[request.param].compress(valid_csv_file.read_bytes()))
+
+    yield temp_path
+
+    temp_path.unlink()
+
+
+@pytest.fixture
+def multi_member_gzip_file() -> Iterator[tuple[Path, bytes]]:
+    """Creating a temporary multi-member gzip file with its plain content."""
+
+    import gzip
+
+    parts = [f"row{i},{i * 2}\n".encode() * 100 for i in range(10)]
+    parts.insert(3, b"false,\x1f\x8b\x08magic\n")
+
+    with tempfile.NamedTemporaryFile(suffix=".csv.gz", delete=False) as f:
+        for part in parts:
+            f.write(gzip.compress(part, compresslevel=0))
+        temp_path = Path(f.name)
+
+    yield temp_path, b"".join(parts)
+
+    temp_path.unlink()
+
+
+@pytest.fixture
+def many_errors_csv_file() -> Iterator[Path]:
+    """Creating a temporary CSV file with several invalid rows for testing csv_tools."""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write("country,year,gdp\n")
+        f.write("China,2021,17734\n")
+        f.write("China,2022\n")
+        f.write("Japan,,4231\n")
+        f.write("Japan,2022,unknown\n")
+        f.write("Germany,2021,4257\n")
+        temp_path = Path(f.name)
+
+    yield temp_path
+
+    temp_path.unlink()
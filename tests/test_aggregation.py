@@ -0,0 +1,113 @@
+import json
+import math
+import random
+from pathlib import Path
+
+from core.aggregation import GROUP_SIZE_ESTIMATE, AggregateState, GroupAggregator
+
+
+class TestAggregateState:
+    """Tests for AggregateState class."""
+
+    def test_add(self):
+        state = AggregateState()
+        for value in [3, 1, 2]:
+            state.add(value)
+
+        assert state.to_list() == [3, 6, 1, 3]
+        assert state.mean == 2
+
+    def test_update_batch(self):
+        state = AggregateState()
+        state.update([3, 1, 2])
+        state.update([])
+
+        assert state == AggregateState(3, 6, 1, 3)
+
+    def test_merge(self):
+        state = AggregateState(2, 10, 4, 6)
+        state.merge(AggregateState(1, 1, 1, 1))
+        state.merge(AggregateState())
+
+        assert state.to_list() == [3, 11, 1, 6]
+
+    def test_empty_mean(self):
+        assert AggregateState().mean is None
+
+    def test_round_trip(self):
+        state = AggregateState(2, 3.5, 1.5, 2.0)
+
+        assert AggregateState.from_list(state.to_list()) == state
+
+    def test_exact_sum_in_any_order(self):
+        values = [0.1] * 10 + [1e16, 1.0, -1e16, 3, 2.5e-17] * 7
+        expected = math.fsum(values)
+        random.seed(0)
+
+        for _ in range(20):
+            random.shuffle(values)
+            cut = random.randrange(len(values))
+            first, second = AggregateState(), AggregateState()
+            for value in values[:cut]:
+                first.add(value)
+            second.update(values[cut:])
+            second.merge(first)
+
+            assert second.sum == expected
+            assert second.count == len(values)
+
+    def test_integer_sum_stays_integer(self):
+        state = AggregateState()
+        state.update([2**60, 1])
+        state.add(2)
+
+        assert state.sum == 2**60 + 3
+        assert isinstance(state.sum, int)
+
+    def test_partials_survive_serialization(self):
+        state = AggregateState()
+        state.update([1e16, 1.0])
+        restored = AggregateState.from_list(json.loads(json.dumps(state.to_list())))
+        restored.add(-1e16)
+
+        assert restored.sum == 1.0
+        assert AggregateState(1, 0.5).to_list() == [1, 0.5, None, None]
+
+
+class TestGroupAggregator:
+    """Tests for GroupAggregator class."""
+
+    def test_in_memory(self):
+        with GroupAggregator() as aggregator:
+            aggregator.add("a", 1)
+            aggregator.add("a", 3)
+            aggregator.merge("b", AggregateState(1, 5, 5, 5))
+
+            assert dict(aggregator.items()) == {
+                "a": AggregateState(2, 4, 1, 3),
+                "b": AggregateState(1, 5, 5, 5),
+            }
+            assert aggregator.spills == 0
+
+    def test_spill_gives_same_result(self):
+        values = [(f"key{i % 50}", i) for i in range(1000)]
+        expected = GroupAggregator()
+        for key, value in values:
+            expected.add(key, value)
+
+        with GroupAggregator(memory_limit=10 * GROUP_SIZE_ESTIMATE) as aggregator:
+            for key, value in values:
+                aggregator.add(key, value)
+            result = dict(aggregator.items())
+
+            assert aggregator.spills > 0
+            assert result == dict(expected.items())
+
+    def test_close_removes_spill_files(self):
+        aggregator = GroupAggregator(memory_limit=GROUP_SIZE_ESTIMATE, partitions=2)
+        for value in range(10):
+            aggregator.add(value, value)
+        spill_dir = aggregator._spill_dir.name
+        aggregator.close()
+
+        assert not Path(spill_dir).exists()
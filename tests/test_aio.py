@@ -0,0 +1,115 @@
+import asyncio
+import csv
+import threading
+
+from pytest import raises as pt_raises
+
+from core import CsvReader
+from core.aio import SharedBatches, aiter_batches, aiter_rows
+from core.declarative import DeclarativeReport, ReportSpec
+from core.defined_reports import AverageGDPReport
+
+
+async def _collect(batches) -> list:
+    return [batch async for batch in batches]
+
+
+class TestAsyncIteration:
+    """Tests for aiter_rows and aiter_batches."""
+
+    def test_aiter_rows(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        batches = asyncio.run(_collect(aiter_rows([reader], batch_size=3)))
+
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        assert [row for batch in batches for row in batch] == reader.load_csv
+
+    def test_aiter_batches(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        batches = asyncio.run(_collect(aiter_batches([reader, reader], batch_size=4)))
+
+        assert sum(sum(batch["gdp"]) for batch in batches) == 2 * sum(
+            reader.load_columns["gdp"]
+        )
+
+    def test_errors_are_raised(self, wrong_type_csv_file, economic_schema):
+        reader = CsvReader(wrong_type_csv_file, schema=economic_schema)
+
+        with pt_raises(csv.Error, match="Invalid int value"):
+            asyncio.run(_collect(aiter_rows([reader])))
+
+
+class TestAgenerate:
+    """Tests for BaseReport.agenerate."""
+
+    def test_matches_generate(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        report = AverageGDPReport()
+
+        result = asyncio.run(report.agenerate(aiter_rows([reader], batch_size=2)))
+
+        assert result == report.generate(reader.load_csv)
+
+    def test_concurrent_reports_share_input(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        average = AverageGDPReport()
+        by_continent = DeclarativeReport.for_spec(
+            "gdp-by-continent", ReportSpec(["continent"], {"gdp": "sum"})
+        )()
+
+        async def run():
+            shared = SharedBatches(aiter_rows([reader], batch_size=2), queue_size=1)
+            return await asyncio.gather(
+                average.agenerate(shared.subscribe()),
+                by_continent.agenerate(shared.subscribe()),
+            )
+
+        first, second = asyncio.run(run())
+
+        assert first == average.generate(reader.load_csv)
+        assert second == by_continent.generate(reader.load_csv)
+
+    def test_early_subscriber_exit_doesnt_block(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+
+        async def first_batch(batches):
+            async for batch in batches:
+                return batch
+
+        async def run():
+            shared = SharedBatches(aiter_rows([reader], batch_size=1), queue_size=1)
+            return await asyncio.gather(
+                first_batch(shared.subscribe()), _collect(shared.subscribe())
+            )
+
+        first, every = asyncio.run(asyncio.wait_for(run(), 5))
+
+        assert first == every[0]
+        assert len(every) == 7
+
+    def test_cancellation_stops_generation(self):
+        stopped = threading.Event()
+
+        class EndlessReport(AverageGDPReport):
+            def generate(self, data):
+                try:
+                    return super().generate(data)
+                finally:
+                    stopped.set()
+
+        async def endless():
+            while True:
+                await asyncio.sleep(0.01)
+                yield [{"country": "A", "gdp": 1}]
+
+        async def run():
+            task = asyncio.ensure_future(EndlessReport().agenerate(endless()))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pt_raises(asyncio.CancelledError):
+                await task
+            await asyncio.get_running_loop().run_in_executor(None, stopped.wait, 5)
+
+        asyncio.run(run())
+
+        assert stopped.is_set()
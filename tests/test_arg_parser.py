@@ -1,3 +1,4 @@
+import pytest
 from pytest import raises as pt_raises
 
 from core import ArgParser
@@ -68,3 +69,162 @@ class TestArgParser:
         parser = ArgParser()
         with pt_raises(SystemExit):
             parser.parse_args(zero_files_args)
+
+    def test_parse_sample_size(self, valid_args):
+        parser = ArgParser()
+        args = parser.parse_args(valid_args + ["--sample-size", "100", "--seed", "1"])
+
+        assert args.sample_size == 100
+        assert args.seed == 1
+
+    def test_sample_size_not_int_raises_error(self, valid_args):
+        parser = ArgParser()
+        with pt_raises(SystemExit):
+            parser.parse_args(valid_args + ["--sample-size", "many"])
+
+    def test_build_index_without_report(self):
+        parser = ArgParser()
+        args = parser.parse_args(["--files", "file.csv", "--build-index"])
+
+        assert args.build_index is True
+        assert args.report is None
+
+    def test_stdin_without_files(self):
+        parser = ArgParser()
+        args = parser.parse_args(["--stdin", "--report", "average-gdp"])
+
+        assert args.stdin is True
+        assert args.files is None
+
+    def test_dash_file(self):
+        parser = ArgParser()
+        args = parser.parse_args(["--files", "-", "--report", "average-gdp"])
+
+        assert args.files == ["-"]
+
+    def test_parse_error_policy(self, valid_args):
+        parser = ArgParser()
+        args = parser.parse_args(
+            valid_args + ["--on-error", "quarantine", "--quarantine-file", "bad.csv"]
+        )
+
+        assert args.on_error == "quarantine"
+        assert args.quarantine_file == "bad.csv"
+
+    def test_unknown_error_policy_raises_error(self, valid_args):
+        parser = ArgParser()
+        with pt_raises(SystemExit):
+            parser.parse_args(valid_args + ["--on-error", "ignore"])
+
+    def test_parse_memory_limit(self, valid_args):
+        parser = ArgParser()
+        args = parser.parse_args(valid_args + ["--memory-limit", "1K"])
+
+        assert args.memory_limit == 1024
+
+    def test_parse_specs(self, valid_args):
+        parser = ArgParser()
+        args = parser.parse_args(valid_args + ["--specs", "reports.toml"])
+
+        assert args.specs == "reports.toml"
+
+    def test_parse_plugins(self, valid_args):
+        parser = ArgParser()
+        args = parser.parse_args(valid_args + ["--plugins", "plugins", "more"])
+
+        assert args.plugins == ["plugins", "more"]
+
+    def test_parse_dedup(self, valid_args):
+        parser = ArgParser()
+        args = parser.parse_args(
+            valid_args
+            + ["--dedup-key", "country", "year", "--dedup-policy", "newest-mtime"]
+        )
+
+        assert args.dedup_key == ["country", "year"]
+        assert args.dedup_policy == "newest-mtime"
+
+    def test_dedup_with_sample_size_raises_error(self, valid_args):
+        parser = ArgParser()
+        with pt_raises(SystemExit):
+            parser.parse_args(
+                valid_args + ["--dedup-key", "country", "--sample-size", "10"]
+            )
+
+    def test_parse_group_by(self, valid_args):
+        parser = ArgParser()
+        args = parser.parse_args(valid_args + ["--group-by", "continent", "year"])
+
+        assert args.group_by == ["continent", "year"]
+
+    def test_input_dir_without_files(self):
+        parser = ArgParser()
+        args = parser.parse_args(
+            ["--input-dir", "data", "--pattern", "*.csv", "--report", "average-gdp"]
+        )
+
+        assert args.input_dir == ["data"]
+        assert args.pattern == "*.csv"
+
+    def test_pattern_without_input_dir_raises_error(self, valid_args):
+        parser = ArgParser()
+        with pt_raises(SystemExit):
+            parser.parse_args(valid_args + ["--pattern", "*.csv"])
+
+    def test_parse_shards(self, valid_args):
+        parser = ArgParser()
+        args = parser.parse_args(
+            valid_args + ["--shards", "2", "--listen", "0.0.0.0:7000"]
+        )
+
+        assert args.shards == 2
+        assert args.listen == ("0.0.0.0", 7000)
+
+    def test_worker_without_files(self):
+        parser = ArgParser()
+        args = parser.parse_args(["--worker", "localhost:7000"])
+
+        assert args.worker == ("localhost", 7000)
+
+    def test_shards_with_stdin_raises_error(self, valid_args):
+        parser = ArgParser()
+        with pt_raises(SystemExit):
+            parser.parse_args(valid_args + ["--shards", "2", "--stdin"])
+
+    def test_parse_records(self, valid_args):
+        parser = ArgParser()
+
+        assert parser.parse_args(valid_args + ["--records"]).records
+        assert not parser.parse_args(valid_args).records
+
+    def test_parse_watch(self, valid_args):
+        parser = ArgParser()
+
+        assert parser.parse_args(valid_args + ["--watch"]).watch
+        assert not parser.parse_args(valid_args).watch
+
+    def test_watch_with_shards_raises_error(self, valid_args):
+        parser = ArgParser()
+        with pt_raises(SystemExit):
+            parser.parse_args(valid_args + ["--watch", "--shards", "2"])
+
+    def test_parse_query_without_report(self):
+        parser = ArgParser()
+        args = parser.parse_args(["--files", "file.csv", "--query"])
+
+        assert args.query
+        assert args.report is None
+
+    def test_query_with_stdin_raises_error(self):
+        parser = ArgParser()
+        with pt_raises(SystemExit):
+            parser.parse_args(["--stdin", "--query"])
+
+    @pytest.mark.parametrize(
+        "mode",
+        [["--query"], ["--watch", "--report", "x"], ["--shards", "2", "--report", "x"]],
+    )
+    def test_dash_file_counts_as_stdin(self, mode):
+        parser = ArgParser()
+        with pt_raises(SystemExit):
+            parser.parse_args(["--files", "a.csv", "-"] + mode)
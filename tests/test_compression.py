@@ -0,0 +1,88 @@
+import gzip
+import io
+from pathlib import Path
+
+import pytest
+
+from core.compression import (
+    GZIP_MAGIC,
+    ZSTD_MAGIC,
+    ParallelMemberReader,
+    _gzip_decompressor,
+    is_csv_path,
+    open_text,
+)
+
+
+class TestIsCsvPath:
+    """Tests for is_csv_path function."""
+
+    def test_plain_csv(self):
+        assert is_csv_path(Path("data.csv")) is True
+
+    def test_compressed_csv(self):
+        for suffix in (".gz", ".bz2", ".xz", ".zst"):
+            assert is_csv_path(Path(f"data.csv{suffix}")) is True
+
+    def test_not_csv(self):
+        assert is_csv_path(Path("data.txt")) is False
+        assert is_csv_path(Path("data.txt.gz")) is False
+        assert is_csv_path(Path("data.gz")) is False
+
+
+class TestOpenText:
+    """Tests for open_text function."""
+
+    def test_compressed(self, compressed_csv_file, valid_csv_file):
+        with open_text(compressed_csv_file) as f:
+            assert f.read() == valid_csv_file.read_bytes().decode()
+
+    def test_zstd(self, valid_csv_file, tmp_path):
+        zstandard = pytest.importorskip("zstandard")
+        path = tmp_path / "data.csv.zst"
+        path.write_bytes(zstandard.ZstdCompressor().compress(b"a,b\n1,2\n"))
+
+        with open_text(path) as f:
+            assert f.read() == "a,b\n1,2\n"
+
+
+class TestParallelMemberReader:
+    """Tests for ParallelMemberReader class."""
+
+    def test_member_offsets(self):
+        data = b"xx" + GZIP_MAGIC + b"yy" + GZIP_MAGIC
+
+        assert ParallelMemberReader.member_offsets(data, GZIP_MAGIC) == [2, 7]
+
+    def test_false_magic_falls_back(self, multi_member_gzip_file):
+        path, content = multi_member_gzip_file
+        raw = ParallelMemberReader(path, GZIP_MAGIC, _gzip_decompressor, workers=2)
+
+        with io.BufferedReader(raw) as f:
+            assert raw.members > 11
+            assert f.read() == content
+
+    def test_zstd_frames(self, tmp_path):
+        zstandard = pytest.importorskip("zstandard")
+        from core.compression import _zstd_decompressor
+
+        parts = [f"row{i}\n".encode() * 50 for i in range(5)]
+        path = tmp_path / "data.csv.zst"
+        path.write_bytes(
+            b"".join(zstandard.ZstdCompressor().compress(p) for p in parts)
+        )
+        raw = ParallelMemberReader(path, ZSTD_MAGIC, _zstd_decompressor, workers=2)
+
+        with io.BufferedReader(raw) as f:
+            assert raw.members == 5
+            assert f.read() == b"".join(parts)
+
+    def test_parallel_open_text(self, tmp_path, monkeypatch):
+        parts = [f"row{i},{i * 2}\n" * 100 for i in range(10)]
+        path = tmp_path / "data.csv.gz"
+        path.write_bytes(b"".join(gzip.compress(part.encode()) for part in parts))
+        monkeypatch.setattr("core.compression.PARALLEL_MIN_SIZE", 0)
+
+        with open_text(path) as f:
+            assert isinstance(f.buffer.raw, ParallelMemberReader)
+            assert f.read() == "".join(parts)
@@ -1,8 +1,14 @@
+import io
+import sys
 from csv import Error as csv_Error
+from pathlib import Path
 
 from pytest import raises as pt_raises
 
-from core import CsvReader
+from core import CsvReader, Schema
+from core.defined_reports import AverageGDPReport
+from core.records import Record
+from core.validation import ErrorPolicy, Quarantine
 
 
 class TestCsvReader:
@@ -119,3 +125,225 @@ class TestCsvReader:
 
         assert data1 == data2
         assert len(data1) == 7
+
+    def test_load_csv_with_schema(self, valid_csv_file, economic_schema):
+        reader = CsvReader(valid_csv_file, schema=economic_schema)
+        data = reader.load_csv
+
+        assert data[0]["country"] == "United States"
+        assert data[0]["year"] == 2021
+        assert data[0]["gdp"] == 22994
+        assert data[0]["gdp_growth"] == 2.4
+
+    def test_load_csv_with_inferred_schema(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        data = reader.load_csv
+
+        assert isinstance(data[0]["gdp"], int)
+        assert isinstance(data[0]["inflation"], float)
+        assert reader.schema is not None
+
+    def test_float_after_inferred_int_rows(self, tmp_path):
+        file = tmp_path / "economic.csv"
+        lines = [f"Country {index},{1000 + index}\n" for index in range(150)]
+        file.write_text("country,gdp\n" + "".join(lines) + "Atlantis,1234.5\n")
+
+        reader = CsvReader(file, infer_schema=True)
+        assert "is valid with 151 rows" in reader.check_csv_file_valid
+        assert reader.load_csv[-1]["gdp"] == 1234.5
+
+        reader = CsvReader(file, infer_schema=True, on_error=ErrorPolicy.SKIP)
+        rows = list(reader.iter_rows(batch_size=50))
+        assert [row["gdp"] for row in rows[-2:]] == [1149, 1234.5]
+        assert reader.rows_rejected == 0
+
+    def test_load_csv_records(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, records=True)
+        data = reader.load_csv
+
+        assert isinstance(data[0], Record)
+        assert data[0].country == data[0]["country"] == data[0][0] == "United States"
+        assert [dict(row) for row in data] == CsvReader(valid_csv_file).load_csv
+
+    def test_iter_rows_records(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True, records=True)
+        rows = list(reader.iter_rows(batch_size=3))
+
+        assert rows == reader.load_csv
+        assert rows[0].gdp == 22994
+        assert AverageGDPReport().generate(rows) == AverageGDPReport().generate(
+            CsvReader(valid_csv_file).load_csv
+        )
+
+    def test_load_columns(self, valid_csv_file, economic_schema):
+        reader = CsvReader(valid_csv_file, schema=economic_schema)
+        columns = reader.load_columns
+
+        assert len(columns) == 8
+        assert columns["gdp"][:3] == [22994, 23315, 25462]
+        assert columns["country"][-1] == "Germany"
+
+    def test_check_wrong_type_value(self, wrong_type_csv_file, economic_schema):
+        """Test that value not matching schema raises csv.Error."""
+
+        reader = CsvReader(wrong_type_csv_file, schema=economic_schema)
+
+        with pt_raises(csv_Error, match="Invalid int value in column 'gdp'"):
+            _ = reader.check_csv_file_valid
+
+    def test_check_schema_missing_column(self, valid_csv_file):
+        """Test that schema column missing from header raises csv.Error."""
+
+        reader = CsvReader(valid_csv_file, schema=Schema({"sector": "str"}))
+
+        with pt_raises(csv_Error, match="sector from schema are missing"):
+            _ = reader.check_csv_file_valid
+
+    def test_load_sample(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        sample = reader.load_sample(2, seed=1)
+
+        assert sample.total == 7
+        assert len(sample.rows) == 2
+        assert isinstance(sample.rows[0]["gdp"], int)
+
+    def test_load_sample_stratified_with_sketches(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        sample = reader.load_sample(
+            1, stratify_by="country", sketch_columns=("country", "gdp")
+        )
+
+        assert sample.totals == {"United States": 3, "China": 3, "Germany": 1}
+        assert len(sample.rows) == 3
+        assert sample.sketches["country"].distinct.count() == 3
+        assert sample.sketches["gdp"].digest.total == 7
+
+    def test_load_sample_fail_policy(self, many_errors_csv_file):
+        reader = CsvReader(many_errors_csv_file, schema=Schema({"gdp": "int"}))
+
+        with pt_raises(csv_Error, match="Row 2: More or less columns"):
+            reader.load_sample(10, sketch_columns=("gdp",))
+
+    def test_load_sample_skip_policy(self, many_errors_csv_file):
+        reader = CsvReader(
+            many_errors_csv_file,
+            schema=Schema({"gdp": "int"}),
+            on_error=ErrorPolicy.SKIP,
+        )
+        sample = reader.load_sample(10, stratify_by="country", sketch_columns=("gdp",))
+
+        assert sorted(row["gdp"] for row in sample.rows) == [4257, 17734]
+        assert sample.total == 2
+        assert reader.rows_rejected == 3
+
+    def test_load_sample_unknown_column_raises_error(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file)
+
+        with pt_raises(ValueError, match="Column 'sector' isn't found"):
+            reader.load_sample(1, stratify_by="sector")
+
+    def test_compressed_csv_file(self, compressed_csv_file):
+        reader = CsvReader(compressed_csv_file, infer_schema=True)
+
+        assert "7 rows" in reader.check_csv_file_valid
+        assert reader.load_csv[0]["gdp"] == 22994
+        assert len(reader.load_sample(2).rows) == 2
+
+    def test_iter_rows(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        rows = reader.iter_rows()
+
+        assert next(rows)["gdp"] == 22994
+        assert len(list(rows)) == 6
+        assert reader.rows_read == 7
+
+    def test_iter_rows_invalid_row_raises_error(self, invalid_csv_file):
+        reader = CsvReader(invalid_csv_file)
+
+        with pt_raises(csv_Error, match="More or less columns"):
+            list(reader.iter_rows())
+
+    def test_iter_rows_wrong_type_raises_error(self, wrong_type_csv_file):
+        reader = CsvReader(wrong_type_csv_file, schema=Schema({"gdp": "int"}))
+
+        with pt_raises(csv_Error, match="Invalid int value in column 'gdp'"):
+            list(reader.iter_rows())
+
+    def test_iter_rows_empty_file_raises_error(self, empty_csv_file):
+        reader = CsvReader(empty_csv_file)
+
+        with pt_raises(csv_Error, match="is empty"):
+            list(reader.iter_rows())
+
+    def test_iter_rows_from_stdin(self, valid_csv_file, monkeypatch):
+        stdin = io.TextIOWrapper(io.BytesIO(valid_csv_file.read_bytes()))
+        monkeypatch.setattr(sys, "stdin", stdin)
+        reader = CsvReader(Path("-"), infer_schema=True)
+
+        assert reader.is_stdin
+        assert [row["year"] for row in reader.iter_rows()][:2] == [2021, 2022]
+        assert not stdin.buffer.closed
+
+    def test_validate_collects_errors(self, many_errors_csv_file):
+        reader = CsvReader(many_errors_csv_file, schema=Schema({"gdp": "int"}))
+        result = reader.validate()
+
+        assert result.rows == 5
+        assert [error.row for error in result.errors] == [2, 3, 4]
+
+    def test_validate_in_small_batches(self, many_errors_csv_file):
+        reader = CsvReader(many_errors_csv_file, schema=Schema({"gdp": "int"}))
+        result = reader.validate(max_errors=2, batch_size=2)
+
+        assert [error.row for error in result.errors] == [2, 3]
+        assert result.truncated
+
+    def test_check_reports_all_errors(self, many_errors_csv_file):
+        reader = CsvReader(many_errors_csv_file, infer_schema=True)
+
+        with pt_raises(csv_Error) as exc_info:
+            _ = reader.check_csv_file_valid
+
+        assert str(exc_info.value).count("Row ") == 2
+        assert "Row 3: Empty value" in str(exc_info.value)
+
+    def test_check_stops_at_max_errors(self, many_errors_csv_file):
+        reader = CsvReader(many_errors_csv_file, max_errors=1)
+
+        with pt_raises(csv_Error, match="Stopped after 1 errors"):
+            _ = reader.check_csv_file_valid
+
+    def test_iter_rows_fail_policy(self, many_errors_csv_file):
+        reader = CsvReader(many_errors_csv_file)
+
+        with pt_raises(csv_Error, match="Row 2: More or less columns"):
+            list(reader.iter_rows())
+
+    def test_iter_rows_skip_policy(self, many_errors_csv_file):
+        reader = CsvReader(
+            many_errors_csv_file,
+            schema=Schema({"gdp": "int"}),
+            on_error=ErrorPolicy.SKIP,
+        )
+        rows = list(reader.iter_rows(batch_size=2))
+
+        assert [row["gdp"] for row in rows] == [17734, 4257]
+        assert reader.rows_read == 2
+        assert reader.rows_rejected == 3
+
+    def test_iter_rows_quarantine_policy(self, many_errors_csv_file, tmp_path):
+        with Quarantine(tmp_path / "quarantine.csv") as quarantine:
+            reader = CsvReader(
+                many_errors_csv_file,
+                schema=Schema({"gdp": "int"}),
+                on_error=ErrorPolicy.QUARANTINE,
+                quarantine=quarantine,
+            )
+            rows = list(reader.iter_rows())
+
+        content = (tmp_path / "quarantine.csv").read_text()
+
+        assert len(rows) == 2
+        assert quarantine.count == 3
+        assert "Japan,2022,unknown" in content
+        assert "Invalid int value in column 'gdp'" in content
@@ -0,0 +1,208 @@
+import json
+
+from pytest import raises as pt_raises
+
+from core import CsvReader, ReportRegistry
+from core.declarative import DeclarativeReport, ReportSpec
+from core.defined_reports import AverageGDPReport, EconomySummaryReport
+from core.rollups import Rollup
+
+
+def _report(**spec) -> DeclarativeReport:
+    return DeclarativeReport.for_spec("test-spec", ReportSpec(**spec))()
+
+
+class TestReportSpec:
+    """Tests for ReportSpec class."""
+
+    def test_metrics_and_names(self):
+        spec = ReportSpec(["continent"], {"gdp": "mean", "population": ["sum", "max"]})
+
+        assert spec.metrics == [
+            ("gdp", "mean"),
+            ("population", "sum"),
+            ("population", "max"),
+        ]
+        assert spec.columns == ["gdp", "population"]
+        assert spec.sort_by == "average_gdp"
+
+    def test_unknown_function(self):
+        with pt_raises(ValueError, match="got median"):
+            ReportSpec(["country"], {"gdp": "median"})
+
+    def test_wrong_sort(self):
+        with pt_raises(ValueError, match="sort must be"):
+            ReportSpec(["country"], {"gdp": "mean"}, sort="up")
+
+    def test_sort_by_must_be_output_column(self):
+        spec = ReportSpec(["country"], {"gdp": "mean"}, sort_by="country")
+
+        assert spec.sort_by == "country"
+        with pt_raises(ValueError, match="sort_by must be one of country, average_gdp"):
+            ReportSpec(["country"], {"gdp": "mean"}, sort_by="gdp")
+
+    def test_group_by_must_be_list(self):
+        with pt_raises(ValueError, match="group_by must be a list of columns"):
+            ReportSpec("continent", {"gdp": "mean"})
+
+        with pt_raises(ValueError, match="group_by must be a list of columns"):
+            ReportSpec.from_dict({"group_by": [1], "agg": {"gdp": "mean"}})
+
+    def test_wmean_needs_weight(self):
+        with pt_raises(ValueError, match="weights for wmean of inflation"):
+            ReportSpec(["country"], {"inflation": "wmean"})
+
+    def test_regrouped(self):
+        spec = ReportSpec(["country"], {"gdp": "mean"}, limit=3)
+        regrouped = spec.regrouped(["continent", "year"])
+
+        assert regrouped.group_by == ("continent", "year")
+        assert regrouped.metrics == spec.metrics
+        assert regrouped.limit == 3
+
+    def test_regrouped_without_sort_column(self):
+        spec = ReportSpec(["country"], {"gdp": "mean"}, sort_by="country")
+
+        assert spec.regrouped(["continent"]).sort_by == "average_gdp"
+
+    def test_from_dict_unknown_keys(self):
+        with pt_raises(ValueError, match="Unknown report spec keys: having"):
+            ReportSpec.from_dict({"group_by": ["country"], "agg": {}, "having": 1})
+
+
+class TestDeclarativeReport:
+    """Tests for DeclarativeReport class."""
+
+    def test_matches_average_gdp(self, economic_data):
+        report = _report(group_by=["country"], agg={"gdp": "mean"})
+
+        assert report.generate(economic_data) == AverageGDPReport().generate(
+            economic_data
+        )
+
+    def test_generate_many_aggregates(self, economic_data):
+        report = _report(
+            group_by=["continent"],
+            agg={"gdp": ["sum", "count"]},
+            sort="asc",
+            limit=2,
+        )
+
+        assert report.generate(economic_data) == [
+            {"continent": "Europe", "sum_gdp": 4257, "count_gdp": 1},
+            {"continent": "Asia", "sum_gdp": 53431, "count_gdp": 3},
+        ]
+
+    def test_generate_with_spill(self, economic_data):
+        report = DeclarativeReport.for_spec(
+            "test-spec", ReportSpec(["country", "year"], {"gdp": "max"})
+        )(memory_limit=1)
+
+        assert len(report.generate(economic_data)) == 7
+
+    def test_generate_columns_matches_rows(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        report = _report(group_by=["continent"], agg={"gdp": "mean", "year": "min"})
+
+        assert report.generate_columns(reader.load_columns) == report.generate(
+            reader.load_csv
+        )
+
+    def test_generate_columns_missing_column(self):
+        report = _report(group_by=["country"], agg={"gdp": "mean"})
+
+        assert report.generate_columns({"country": ["A"]}) is None
+        assert report.generate_columns({"country": ["A"], "gdp": ["1"]}) is None
+
+    def test_generate_columns_mixed_files(self):
+        report = _report(group_by=["country"], agg={"gdp": "mean"})
+        columns = {"country": ["A", "B"], "gdp": [1.5, "n/a"]}
+
+        assert report.generate_columns(columns) is None
+
+    def test_weighted_mean(self):
+        data = [
+            {"continent": "Asia", "inflation": "2.0", "population": "300"},
+            {"continent": "Asia", "inflation": "6.0", "population": "100"},
+            {"continent": "Asia", "inflation": "9.0", "population": ""},
+        ]
+        report = _report(
+            group_by=["continent"],
+            agg={"inflation": ["wmean", "mean"], "population": "sum"},
+            weights={"inflation": "population"},
+        )
+
+        assert report.generate(data) == [
+            {
+                "continent": "Asia",
+                "weighted_inflation": 3.0,
+                "average_inflation": 5.67,
+                "sum_population": 400,
+            }
+        ]
+
+    def test_economy_summary_paths_match(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        report = EconomySummaryReport(group_by=["continent", "year"])
+
+        result = report.generate(reader.load_csv)
+
+        assert result == report.generate_columns(reader.load_columns)
+        assert len(result) == 7
+        assert set(result[0]) == {
+            "continent",
+            "year",
+            "average_gdp",
+            "average_gdp_growth",
+            "weighted_inflation",
+            "average_unemployment",
+            "sum_population",
+        }
+        assert EconomySummaryReport().spec.group_by == ("continent",)
+
+    def test_from_rollups(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        rollup = Rollup.build_for(reader)
+        report = _report(group_by=["continent"], agg={"gdp": ["mean", "max"]})
+
+        assert report.from_rollups([rollup]) == report.generate(reader.load_csv)
+
+    def test_from_rollups_not_covered(self, valid_csv_file):
+        rollup = Rollup.build_for(CsvReader(valid_csv_file, infer_schema=True))
+        report = _report(group_by=["gdp_growth"], agg={"gdp": "mean"})
+
+        assert report.from_rollups([rollup]) is None
+        assert EconomySummaryReport().from_rollups([rollup]) is None
+
+
+class TestLoadSpecs:
+    """Tests for ReportRegistry.load_specs."""
+
+    def test_load_toml(self, tmp_path, economic_data):
+        path = tmp_path / "reports.toml"
+        path.write_text(
+            '[gdp-by-continent]\ngroup_by = ["continent"]\nagg = { gdp = "mean" }\n'
+        )
+
+        assert ReportRegistry.load_specs(path) == ["gdp-by-continent"]
+
+        report = ReportRegistry.get_report("gdp-by-continent", memory_limit=1024)
+        assert isinstance(report, DeclarativeReport)
+        assert report.memory_limit == 1024
+        assert report.generate(economic_data)[0] == {
+            "continent": "North America",
+            "average_gdp": 23923.67,
+        }
+
+    def test_load_json(self, tmp_path):
+        path = tmp_path / "reports.json"
+        path.write_text(
+            json.dumps({"top-gdp": {"group_by": ["country"], "agg": {"gdp": "max"}}})
+        )
+
+        assert ReportRegistry.load_specs(path) == ["top-gdp"]
+        assert "top-gdp" in ReportRegistry.available_reports
+
+    def test_load_unsupported_format(self, tmp_path):
+        with pt_raises(ValueError, match="must be .toml or .json"):
+            ReportRegistry.load_specs(tmp_path / "reports.yaml")
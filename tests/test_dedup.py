@@ -0,0 +1,124 @@
+import os
+
+from pytest import raises as pt_raises
+
+from core import CsvReader, dedup
+from core.dedup import DedupPolicy, Deduplicator, priority_order
+
+
+def _rows(source: str, keys: list[tuple[str, int]]) -> list[dict]:
+    return [
+        {"country": country, "year": year, "source": source} for country, year in keys
+    ]
+
+
+class TestDeduplicator:
+    """Tests for Deduplicator class."""
+
+    def test_first_source_wins(self):
+        newest = _rows("new", [("A", 2021), ("B", 2021)])
+        oldest = _rows("old", [("A", 2021), (" A ", 2022), ("B", 2020)])
+        deduplicator = Deduplicator()
+
+        result = list(deduplicator.dedup([newest, oldest]))
+
+        assert [(row["country"], row["source"]) for row in result] == [
+            ("A", "new"),
+            ("B", "new"),
+            (" A ", "old"),
+            ("B", "old"),
+        ]
+        assert deduplicator.duplicates == 1
+
+    def test_duplicates_within_source_kept(self):
+        deduplicator = Deduplicator(key=("country",))
+        rows = _rows("one", [("A", 2021), ("A", 2022)])
+
+        assert len(list(deduplicator.dedup([rows, rows]))) == 2
+        assert deduplicator.duplicates == 2
+
+    def test_spill_matches_in_memory(self):
+        sources = [
+            _rows(
+                str(rank), [(f"C{i % 50}", 2000 + i % (rank + 3)) for i in range(200)]
+            )
+            for rank in range(4)
+        ]
+        in_memory = Deduplicator()
+        spilling = Deduplicator(memory_limit=1000, partitions=4)
+
+        expected = list(in_memory.dedup(sources))
+        result = list(spilling.dedup(sources))
+
+        assert spilling.spilled
+        assert not in_memory.spilled
+        assert spilling.duplicates == in_memory.duplicates
+        assert sorted(map(repr, result)) == sorted(map(repr, expected))
+
+    def test_partition_over_budget_spills_again(self, monkeypatch):
+        levels = []
+
+        class RecordingSpill(dedup._Spill):
+            def __init__(self, partitions, level=0):
+                super().__init__(partitions, level)
+                levels.append(level)
+
+        monkeypatch.setattr(dedup, "_Spill", RecordingSpill)
+        sources = [
+            _rows(str(rank), [(f"C{i}", 2000 + i % (rank + 2)) for i in range(300)])
+            for rank in range(3)
+        ]
+
+        expected = list(Deduplicator().dedup(sources))
+        spilling = Deduplicator(memory_limit=2000, partitions=2)
+        result = list(spilling.dedup(sources))
+
+        assert max(levels) > 0
+        assert sorted(map(repr, result)) == sorted(map(repr, expected))
+
+    def test_index_memory_counts_sort_buffer(self):
+        index = dedup._KeyIndex()
+        for key in [(-5, -1), (3, 2**62), (-5, 7)]:
+            index.add(key)
+
+        assert index.memory == 3 * (dedup.KEY_SIZE + dedup.SORT_KEY_SIZE)
+
+        index.commit()
+
+        assert index.memory == 3 * 2 * dedup.KEY_SIZE
+        assert list(zip(*index.claimed)) == [(-5, 7), (-5, -1), (3, 2**62)]
+        assert (-5, -1) in index and (-5, 8) not in index
+
+    def test_unknown_key_column_raises_error(self):
+        deduplicator = Deduplicator(key=("country", "yeer"))
+        rows = _rows("one", [("A", 2021)])
+
+        with pt_raises(ValueError, match="columns yeer aren't found"):
+            list(deduplicator.dedup([rows]))
+
+    def test_hash_collision_isnt_duplicate(self, monkeypatch):
+        deduplicator = Deduplicator(key=("country",))
+        monkeypatch.setattr(deduplicator, "_key", lambda row: (0, len(row["country"])))
+        newest = _rows("new", [("A", 2021)])
+        oldest = _rows("old", [("BB", 2021), ("C", 2021)])
+
+        result = list(deduplicator.dedup([newest, oldest]))
+
+        assert [row["country"] for row in result] == ["A", "BB"]
+        assert deduplicator.duplicates == 1
+
+
+class TestPriorityOrder:
+    """Tests for priority_order."""
+
+    def test_last_file(self, valid_csv_file, semicolon_csv_file):
+        readers = [CsvReader(valid_csv_file), CsvReader(semicolon_csv_file)]
+
+        assert priority_order(readers) == readers[::-1]
+
+    def test_newest_mtime(self, valid_csv_file, semicolon_csv_file):
+        stat = valid_csv_file.stat()
+        os.utime(semicolon_csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+        readers = [CsvReader(valid_csv_file), CsvReader(semicolon_csv_file)]
+
+        assert priority_order(readers, DedupPolicy.NEWEST_MTIME) == readers
@@ -0,0 +1,69 @@
+from collections import Counter
+from itertools import islice
+
+from pytest import raises as pt_raises
+
+from benchmarks.generator import HEADER, generate_lines, write_csv, write_files
+from core import CsvReader
+from core.validation import ErrorPolicy
+
+
+class TestGenerateLines:
+    """Tests for generate_lines."""
+
+    def test_rows_match_header(self):
+        rows = [
+            line.rstrip("\n").split(",")
+            for line in islice(generate_lines(countries=20, seed=1), 1000)
+        ]
+
+        assert all(len(row) == len(HEADER) for row in rows)
+        assert {int(row[1]) for row in rows} <= set(range(2000, 2025))
+
+    def test_same_seed_same_lines(self):
+        first = list(islice(generate_lines(countries=20, seed=7), 100))
+
+        assert first == list(islice(generate_lines(countries=20, seed=7), 100))
+        assert first != list(islice(generate_lines(countries=20, seed=8), 100))
+
+    def test_skew_makes_first_countries_frequent(self):
+        lines = islice(generate_lines(countries=50, skew=1.5, seed=1), 10_000)
+        counts = Counter(line.split(",", 1)[0] for line in lines)
+
+        assert counts.most_common(1)[0][0] == "Country 0000"
+        assert counts["Country 0000"] > 10 * counts["Country 0049"]
+
+    def test_invalid_values(self):
+        with pt_raises(ValueError):
+            next(generate_lines(invalid_rate=2))
+        with pt_raises(ValueError):
+            next(generate_lines(years=(2024, 2000)))
+
+
+def test_invalid_rows_are_rejected(tmp_path):
+    file = tmp_path / "economic.csv"
+    write_csv(file, generate_lines(countries=20, invalid_rate=0.05, seed=3), count=2000)
+    reader = CsvReader(file, infer_schema=True, on_error=ErrorPolicy.SKIP)
+
+    rows = sum(1 for _ in reader.iter_rows())
+
+    assert rows + reader.rows_rejected == 2000
+    assert 50 < reader.rows_rejected < 150
+
+
+def test_write_files_splits_rows(tmp_path):
+    paths = write_files(tmp_path / "feed", 3, count=100, countries=20, seed=1)
+
+    counts = [len(path.read_text(encoding="utf-8").splitlines()) - 1 for path in paths]
+    assert counts == [34, 33, 33]
+
+
+def test_write_csv_by_size(tmp_path):
+    file = tmp_path / "economic.csv"
+
+    write_csv(file, generate_lines(countries=20, seed=1), size=100_000)
+
+    assert 100_000 <= file.stat().st_size < 1_000_000
+
+    with pt_raises(ValueError):
+        write_csv(file, generate_lines(countries=20, seed=1))
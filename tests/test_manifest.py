@@ -0,0 +1,82 @@
+import gzip
+import os
+
+from core.manifest import Manifest, read_header, scan_directories
+
+
+def _write_tree(root):
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "one.csv").write_text("country,year,gdp\nA,2020,1\n")
+    (root / "a" / "two.csv.gz").write_bytes(
+        gzip.compress(b"gdp,country,year\n2,B,2021\n")
+    )
+    (root / "a" / "b" / "other.csv").write_text("x,y\n1,2\n")
+    (root / "a" / "notes.txt").write_text("country,year,gdp\n")
+
+
+class TestScanDirectories:
+    """Tests for scan_directories."""
+
+    def test_finds_csv_files_recursively(self, tmp_path):
+        _write_tree(tmp_path)
+
+        found = scan_directories([tmp_path])
+
+        assert [path.relative_to(tmp_path).as_posix() for path, _, _ in found] == [
+            "a/b/other.csv",
+            "a/two.csv.gz",
+            "one.csv",
+        ]
+        assert found[-1][1] == (tmp_path / "one.csv").stat().st_size
+
+    def test_pattern(self, tmp_path):
+        _write_tree(tmp_path)
+
+        found = scan_directories([tmp_path], pattern="*.gz")
+
+        assert [path.name for path, _, _ in found] == ["two.csv.gz"]
+
+
+class TestManifest:
+    """Tests for Manifest class."""
+
+    def test_groups_by_column_set(self, tmp_path):
+        _write_tree(tmp_path)
+
+        groups = Manifest.scan([tmp_path]).groups()
+
+        assert [sorted(entry.path.name for entry in group) for group in groups] == [
+            ["one.csv", "two.csv.gz"],
+            ["other.csv"],
+        ]
+
+    def test_unreadable_header(self, tmp_path):
+        path = tmp_path / "broken.csv.gz"
+        path.write_bytes(b"not gzip")
+
+        assert read_header(path) == ()
+
+    def test_unchanged_entries_reused(self, tmp_path):
+        _write_tree(tmp_path)
+        path = tmp_path / "manifest.json"
+        manifest = Manifest.scan([tmp_path], previous=Manifest.load(path))
+        manifest.mark_valid(tmp_path / "one.csv")
+        manifest.mark_valid(tmp_path / "a" / "two.csv.gz")
+        manifest.save()
+
+        changed = tmp_path / "a" / "two.csv.gz"
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        rescanned = Manifest.scan([tmp_path], previous=Manifest.load(path))
+
+        assert rescanned.path == path
+        assert rescanned.is_valid(tmp_path / "one.csv")
+        assert not rescanned.is_valid(changed)
+        assert rescanned.entries[str(changed)].header == ("gdp", "country", "year")
+
+    def test_load_missing_or_broken(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        assert Manifest.load(path).entries == {}
+
+        path.write_text("{broken")
+        assert Manifest.load(path).entries == {}
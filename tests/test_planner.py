@@ -0,0 +1,82 @@
+import os
+
+from core import CsvReader, planner
+from core.defined_reports import EconomySummaryReport, GDPTrendsReport
+from core.planner import Strategy, available_cpus, input_size, plan_execution
+from core.validation import ErrorPolicy
+
+
+class TestPlanExecution:
+    """Tests for plan_execution."""
+
+    def test_columnar_when_supported(self, valid_csv_file):
+        plan = plan_execution(EconomySummaryReport(), [CsvReader(valid_csv_file)])
+
+        assert plan.strategy is Strategy.COLUMNAR
+        assert plan.files == 1
+        assert plan.size == valid_csv_file.stat().st_size
+
+    def test_in_memory_without_columns(self, valid_csv_file):
+        plan = plan_execution(GDPTrendsReport(), [CsvReader(valid_csv_file)])
+
+        assert plan.strategy is Strategy.IN_MEMORY
+
+    def test_spill_above_memory_limit(self, valid_csv_file):
+        plan = plan_execution(
+            EconomySummaryReport(), [CsvReader(valid_csv_file)], memory_limit=1024
+        )
+
+        assert plan.strategy is Strategy.SPILL
+        assert plan.budget == 1024
+
+    def test_forced_streaming(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, on_error=ErrorPolicy.SKIP)
+
+        assert plan_execution(GDPTrendsReport(), [reader]).strategy is (
+            Strategy.STREAMING
+        )
+        assert plan_execution(
+            GDPTrendsReport(), [CsvReader(valid_csv_file)], dedup=True
+        ).reason.startswith("deduplication")
+
+    def test_parallel_for_large_inputs(self, valid_csv_file, monkeypatch):
+        monkeypatch.setattr(planner, "PARALLEL_MIN_SIZE", 1)
+        readers = [CsvReader(valid_csv_file) for _ in range(3)]
+
+        plan = plan_execution(GDPTrendsReport(), readers, memory_limit=900, cpus=8)
+
+        assert plan.strategy is Strategy.PARALLEL
+        assert plan.workers == 3
+        assert plan.worker_memory_limit == 300
+        assert plan_execution(GDPTrendsReport(), readers, cpus=1).strategy is (
+            Strategy.IN_MEMORY
+        )
+
+    def test_rollups_before_parallel(self, valid_csv_file, monkeypatch):
+        monkeypatch.setattr(planner, "PARALLEL_MIN_SIZE", 1)
+        readers = [CsvReader(valid_csv_file) for _ in range(3)]
+
+        plan = plan_execution(GDPTrendsReport(), readers, cpus=4, rollups=True)
+
+        assert plan.strategy is Strategy.ROLLUPS
+        assert (
+            plan_execution(
+                GDPTrendsReport(), readers, dedup=True, cpus=4, rollups=True
+            ).strategy
+            is Strategy.STREAMING
+        )
+
+    def test_describe(self, valid_csv_file):
+        plan = plan_execution(EconomySummaryReport(), [CsvReader(valid_csv_file)])
+
+        assert plan.describe()[0] == {"setting": "strategy", "value": "columnar"}
+
+
+def test_input_size_of_compressed(compressed_csv_file):
+    size = input_size([CsvReader(compressed_csv_file)])
+
+    assert size == compressed_csv_file.stat().st_size * planner.COMPRESSION_RATIO
+
+
+def test_available_cpus():
+    assert 1 <= available_cpus() <= (os.cpu_count() or 1)
@@ -0,0 +1,228 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from pytest import raises as pt_raises
+
+from core import ReportRegistry
+from core.defined_reports import AverageGDPReport
+from core.plugins import directory_reports, entry_point_reports, load_report_file
+from core.results import ResultSet
+
+MAIN = Path(__file__).resolve().parents[1] / "main.py"
+
+PLUGIN = """
+from core.defined_reports import AverageGDPReport
+
+IMPORTS.append(__name__)
+
+
+class {name}(AverageGDPReport):
+    pass
+"""
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    """Registry restored after every test."""
+
+    monkeypatch.setattr(ReportRegistry, "_reports", dict(ReportRegistry._reports))
+    monkeypatch.setattr(ReportRegistry, "_loaders", {})
+    monkeypatch.setattr(ReportRegistry, "_qualified", {})
+
+
+@pytest.fixture
+def imports(monkeypatch) -> list[str]:
+    """Names of plugin modules imported in test."""
+
+    imported: list[str] = []
+    monkeypatch.setattr("builtins.IMPORTS", imported, raising=False)
+    return imported
+
+
+def _write_plugin(directory: Path, stem: str, name: str = "PluginReport") -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    file = directory / f"{stem}.py"
+    file.write_text(PLUGIN.format(name=name), encoding="utf-8")
+    return file
+
+
+def _write_distribution(path: Path, module: str, reports: dict[str, str]) -> None:
+    (path / f"{module}.py").write_text(
+        PLUGIN.format(name="PackageReport"), encoding="utf-8"
+    )
+    info = path / "acme_reports-1.0.dist-info"
+    info.mkdir()
+    (info / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: acme-reports\nVersion: 1.0\n", encoding="utf-8"
+    )
+    lines = [f"{name} = {target}" for name, target in reports.items()]
+    (info / "entry_points.txt").write_text(
+        "[csv_economy_report.reports]\n" + "\n".join(lines) + "\n", encoding="utf-8"
+    )
+
+
+class TestDirectoryPlugins:
+    """Tests for plugins loaded from directories."""
+
+    def test_plugins_are_imported_on_first_use(self, tmp_path, imports):
+        _write_plugin(tmp_path / "acme", "gdp_per_capita")
+
+        names = ReportRegistry.discover_plugins([tmp_path / "acme"])
+
+        assert names == ["acme:gdp-per-capita", "gdp-per-capita"]
+        assert "gdp-per-capita" in ReportRegistry.available_reports
+        assert imports == []
+
+        report = ReportRegistry.get_report("gdp-per-capita", memory_limit=1024)
+        ReportRegistry.get_report("acme:gdp-per-capita")
+
+        assert isinstance(report, AverageGDPReport)
+        assert report.memory_limit == 1024
+        assert imports == ["report_plugins.acme.gdp_per_capita"]
+
+    def test_taken_name_is_registered_only_qualified(self, tmp_path, imports):
+        ReportRegistry.register_report("average-gdp", AverageGDPReport)
+        _write_plugin(tmp_path / "acme", "average_gdp")
+        _write_plugin(tmp_path / "other", "average_gdp")
+
+        names = ReportRegistry.discover_plugins([tmp_path / "acme", tmp_path / "other"])
+
+        assert names == ["acme:average-gdp", "other:average-gdp"]
+        assert ReportRegistry.get_report("average-gdp").__class__ is AverageGDPReport
+        assert (
+            ReportRegistry.get_report("acme:average-gdp").__class__
+            is not ReportRegistry.get_report("other:average-gdp").__class__
+        )
+
+    def test_qualified_name(self, tmp_path):
+        ReportRegistry.register_report("average-gdp", AverageGDPReport)
+        _write_plugin(tmp_path / "acme", "gdp_ratio")
+        ReportRegistry.discover_plugins([tmp_path / "acme"])
+
+        assert ReportRegistry.qualified_name("gdp-ratio") == "acme:gdp-ratio"
+        assert ReportRegistry.qualified_name("acme:gdp-ratio") == "acme:gdp-ratio"
+        assert ReportRegistry.qualified_name("average-gdp") == "average-gdp"
+
+    def test_registered_report_replaces_plugin(self, tmp_path):
+        _write_plugin(tmp_path / "acme", "gdp_ratio")
+        ReportRegistry.discover_plugins([tmp_path / "acme"])
+        ReportRegistry.register_report("gdp-ratio", AverageGDPReport)
+
+        assert ReportRegistry.get_report("gdp-ratio").__class__ is AverageGDPReport
+        assert ReportRegistry.qualified_name("gdp-ratio") == "gdp-ratio"
+
+    def test_broken_plugin_fails_only_when_used(self, tmp_path):
+        directory = tmp_path / "acme"
+        directory.mkdir()
+        (directory / "broken.py").write_text(
+            "import missing_module\n", encoding="utf-8"
+        )
+
+        ReportRegistry.discover_plugins([directory])
+
+        with pt_raises(ValueError, match="Can't load report 'broken'.*missing_module"):
+            ReportRegistry.get_report("broken")
+
+    def test_missing_directory_raises_error(self, tmp_path):
+        with pt_raises(FileNotFoundError, match="does not exist"):
+            directory_reports(tmp_path / "missing")
+
+    def test_private_files_are_ignored(self, tmp_path):
+        _write_plugin(tmp_path / "acme", "_helpers")
+
+        assert directory_reports(tmp_path / "acme") == []
+
+
+def test_plugin_must_define_one_report(tmp_path, imports):
+    file = tmp_path / "empty.py"
+    file.write_text("VALUE = 1\n", encoding="utf-8")
+
+    with pt_raises(ImportError, match="must define one report class, found 0"):
+        load_report_file(file, "acme")
+
+
+def test_entry_points_are_discovered(tmp_path, monkeypatch, imports):
+    _write_distribution(
+        tmp_path,
+        "acme_gdp",
+        {"gdp-per-capita": "acme_gdp:PackageReport", "not-a-report": "json:dumps"},
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    reports = {name: namespace for name, namespace, _ in entry_point_reports()}
+    ReportRegistry.discover_plugins()
+
+    assert reports == {"gdp-per-capita": "acme-reports", "not-a-report": "acme-reports"}
+    assert imports == []
+    assert isinstance(ReportRegistry.get_report("gdp-per-capita"), AverageGDPReport)
+    assert (
+        ReportRegistry.qualified_name("gdp-per-capita") == "acme-reports:gdp-per-capita"
+    )
+    with pt_raises(ValueError, match="isn't a BaseReport subclass"):
+        ReportRegistry.get_report("not-a-report")
+
+
+def test_plugin_report_from_command_line(tmp_path, valid_csv_file):
+    directory = tmp_path / "acme"
+    directory.mkdir()
+    (directory / "gdp_per_capita.py").write_text(
+        "from core.defined_reports import AverageGDPReport\n\n\n"
+        "class GDPPerCapitaReport(AverageGDPReport):\n    pass\n",
+        encoding="utf-8",
+    )
+    result_file = tmp_path / "result.json"
+
+    completed = subprocess.run(
+        [
+            sys.executable,
+            str(MAIN),
+            "--files",
+            str(valid_csv_file),
+            "--plugins",
+            str(directory),
+            "--report",
+            "gdp-per-capita",
+            "--save-result",
+            str(result_file),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert "Report: GDP-PER-CAPITA" in completed.stdout
+    assert ResultSet.load(result_file).report == "acme:gdp-per-capita"
+
+
+def test_plugin_without_options_from_command_line(tmp_path, valid_csv_file):
+    directory = tmp_path / "acme"
+    directory.mkdir()
+    (directory / "row_count.py").write_text(
+        "from core import BaseReport\n\n\n"
+        "class RowCountReport(BaseReport):\n"
+        "    def __init__(self):\n"
+        "        super().__init__()\n\n"
+        "    def generate(self, data):\n"
+        "        return [{'rows': sum(1 for _ in data)}]\n",
+        encoding="utf-8",
+    )
+
+    completed = subprocess.run(
+        [
+            sys.executable,
+            str(MAIN),
+            "--files",
+            str(valid_csv_file),
+            "--plugins",
+            str(directory),
+            "--report",
+            "row-count",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert "Report: ROW-COUNT" in completed.stdout
@@ -0,0 +1,145 @@
+import gzip
+import io
+
+from pytest import raises as pt_raises
+
+from core import CsvReader
+from core.compression import ParallelMemberReader, open_text
+from core import prefetch
+from core.prefetch import Prefetcher
+
+
+def _write_files(tmp_path, count: int) -> list:
+    files = []
+    for index in range(count):
+        path = tmp_path / f"part{index}.csv"
+        path.write_bytes(
+            b"x,y\n" + b"".join(b"%d,%d\n" % (index, i) for i in range(100))
+        )
+        files.append(path)
+    return files
+
+
+class TestPrefetcher:
+    """Tests for Prefetcher class."""
+
+    def test_take_in_order(self, tmp_path):
+        files = _write_files(tmp_path, 5)
+
+        with Prefetcher(files, workers=2, chunk_size=16, depth=2) as prefetcher:
+            for path in files:
+                with io.BufferedReader(prefetcher.take(path)) as stream:
+                    assert stream.read() == path.read_bytes()
+
+    def test_take_skipped_and_repeated(self, tmp_path):
+        files = _write_files(tmp_path, 3)
+
+        with Prefetcher(files, workers=1, chunk_size=16, depth=1) as prefetcher:
+            with io.BufferedReader(prefetcher.take(files[2])) as stream:
+                assert stream.read() == files[2].read_bytes()
+
+            with io.BufferedReader(prefetcher.take(files[0])) as stream:
+                assert stream.read(4) == b"x,y\n"
+
+            with io.BufferedReader(prefetcher.take(files[1])) as stream:
+                assert stream.read() == files[1].read_bytes()
+
+    def test_second_pass_reuses_reads(self, tmp_path, monkeypatch):
+        files = _write_files(tmp_path, 3)
+        filled = []
+        fill = prefetch._fill
+        monkeypatch.setattr(
+            prefetch,
+            "_fill",
+            lambda file, *args: filled.append(file) or fill(file, *args),
+        )
+
+        with Prefetcher(files, workers=1, chunk_size=64) as prefetcher:
+            for _ in range(2):
+                for path in files:
+                    with io.BufferedReader(prefetcher.take(path)) as stream:
+                        assert stream.read() == path.read_bytes()
+
+        assert filled == files
+
+    def test_changed_file_is_read_again(self, tmp_path):
+        files = _write_files(tmp_path, 2)
+
+        with Prefetcher(files, chunk_size=64) as prefetcher:
+            for path in files:
+                with io.BufferedReader(prefetcher.take(path)) as stream:
+                    stream.read()
+            prefetcher.take(files[0])
+            files[1].write_bytes(b"x,y\n1,2\n")
+
+            with io.BufferedReader(prefetcher.take(files[1])) as stream:
+                assert stream.read() == b"x,y\n1,2\n"
+
+    def test_files_above_cache_size_are_read_again(self, tmp_path, monkeypatch):
+        files = _write_files(tmp_path, 2)
+        filled = []
+        fill = prefetch._fill
+        monkeypatch.setattr(
+            prefetch,
+            "_fill",
+            lambda file, *args: filled.append(file) or fill(file, *args),
+        )
+
+        with Prefetcher(files, chunk_size=64, cache_size=100) as prefetcher:
+            for _ in range(2):
+                for path in files:
+                    with io.BufferedReader(prefetcher.take(path)) as stream:
+                        assert stream.read() == path.read_bytes()
+
+        assert filled == files + files
+
+    def test_take_unknown_file(self, tmp_path):
+        files = _write_files(tmp_path, 1)
+
+        with Prefetcher(files) as prefetcher:
+            assert prefetcher.take(tmp_path / "other.csv") is None
+
+    def test_missing_file_raises_on_read(self, tmp_path):
+        path = tmp_path / "missing.csv"
+
+        with Prefetcher([path]) as prefetcher:
+            stream = prefetcher.take(path)
+            with pt_raises(FileNotFoundError):
+                stream.read()
+
+    def test_compressed_file(self, tmp_path, valid_csv_file):
+        path = tmp_path / "data.csv.gz"
+        path.write_bytes(gzip.compress(valid_csv_file.read_bytes()))
+
+        with Prefetcher([path], chunk_size=64) as prefetcher:
+            with open_text(path, raw=prefetcher.take(path)) as f:
+                assert f.read() == valid_csv_file.read_bytes().decode()
+
+    def test_large_compressed_file_is_read_in_parallel(self, tmp_path, monkeypatch):
+        parts = ["x,y\n"] + [f"{i},{i * 2}\n" * 100 for i in range(10)]
+        path = tmp_path / "data.csv.gz"
+        path.write_bytes(b"".join(gzip.compress(part.encode()) for part in parts))
+        monkeypatch.setattr("core.compression.PARALLEL_MIN_SIZE", 0)
+
+        with Prefetcher([path]) as prefetcher:
+            reader = CsvReader(path, infer_schema=True, prefetcher=prefetcher)
+
+            assert prefetcher.take(path) is None
+            with reader._open() as f:
+                assert isinstance(f.buffer.raw, ParallelMemberReader)
+            assert len(list(reader.iter_rows())) == 1000
+
+    def test_csv_reader_passes(self, tmp_path):
+        files = _write_files(tmp_path, 3)
+
+        with Prefetcher(files, workers=2, chunk_size=32) as prefetcher:
+            readers = [
+                CsvReader(path, infer_schema=True, prefetcher=prefetcher)
+                for path in files
+            ]
+
+            assert all(reader.validate().is_valid for reader in readers)
+            rows = [row for reader in readers for row in reader.iter_rows()]
+
+        assert len(rows) == 300
+        assert rows[-1] == {"x": 2, "y": 99}
@@ -0,0 +1,201 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from pytest import raises as pt_raises
+
+from core import BaseReport, CsvReader, ReportRegistry, Schema
+from core.defined_reports import AverageGDPReport, EconomySummaryReport
+from core.query import Condition, Dataset, Query, repl, run_query
+from core.validation import ErrorPolicy
+
+MAIN = Path(__file__).resolve().parents[1] / "main.py"
+
+
+@pytest.fixture
+def dataset(valid_csv_file) -> Dataset:
+    ReportRegistry.register_report("average-gdp", AverageGDPReport)
+    ReportRegistry.register_report("economy-summary", EconomySummaryReport)
+    return Dataset.load([CsvReader(valid_csv_file, infer_schema=True, records=True)])
+
+
+def _rows(valid_csv_file: Path) -> list[dict]:
+    return CsvReader(valid_csv_file, infer_schema=True).load_csv
+
+
+class TestQueryParse:
+    """Tests for Query.parse."""
+
+    def test_parse_report_query(self):
+        query = Query.parse(
+            'average-gdp where continent = "North America" and year >= 2022 top 2'
+        )
+
+        assert query.report == "average-gdp"
+        assert [(c.column, c.op, c.value) for c in query.conditions] == [
+            ("continent", "=", "North America"),
+            ("year", ">=", "2022"),
+        ]
+        assert (query.limit, query.sort_by) == (2, None)
+
+    def test_parse_aggregation_query(self):
+        query = Query.parse(
+            "agg gdp:mean gdp:max population:sum by continent top 3 max_gdp"
+        )
+
+        assert query.report is None
+        assert query.agg == {"gdp": ["mean", "max"], "population": ["sum"]}
+        assert query.group_by == ["continent"]
+        assert (query.limit, query.sort_by) == (3, "max_gdp")
+
+    @pytest.mark.parametrize(
+        "text, message",
+        [
+            ("", "empty"),
+            ("average-gdp extra", "Unexpected extra"),
+            ("average-gdp where year >= 2022 or year < 2000", "joined with and"),
+            ("average-gdp where year ~ 2022", "Unknown operator"),
+            ("average-gdp top many", "top <n>"),
+            ("average-gdp top 1 top 2", "given twice"),
+            ("average-gdp agg gdp:mean by country", "not both"),
+            ("agg gdp:mean", "needs group columns"),
+            ("agg gdp:median by country", "got gdp:median"),
+        ],
+    )
+    def test_invalid_query_raises_error(self, text, message):
+        with pt_raises(ValueError, match=message):
+            Query.parse(text)
+
+
+class TestDataset:
+    """Tests for Dataset class."""
+
+    def test_load_concatenates_files(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True, records=True)
+        dataset = Dataset.load([reader, reader])
+
+        assert dataset.rows == 2 * len(_rows(valid_csv_file))
+
+    def test_load_skips_invalid_rows(self, many_errors_csv_file):
+        reader = CsvReader(
+            many_errors_csv_file,
+            schema=Schema({"year": "int", "gdp": "int"}),
+            on_error=ErrorPolicy.SKIP,
+        )
+        dataset = Dataset.load([reader])
+
+        assert dataset.columns["gdp"] == [17734, 4257]
+        assert reader.rows_rejected == 3
+
+    def test_select_compares_numbers(self, dataset, valid_csv_file):
+        columns = dataset.select([Condition("year", ">=", "2022")])
+
+        expected = [
+            row["country"] for row in _rows(valid_csv_file) if row["year"] >= 2022
+        ]
+        assert columns["country"] == expected
+
+    def test_select_without_conditions_keeps_columns(self, dataset):
+        assert dataset.select([]) is dataset.columns
+
+    def test_select_unknown_column_raises_error(self, dataset):
+        with pt_raises(ValueError, match="Column area isn't found"):
+            dataset.select([Condition("area", "=", "1")])
+
+    def test_records_of_dataset_are_kept(self, dataset):
+        assert dataset.records(dataset.columns) is dataset.records(dataset.columns)
+
+
+class TestRunQuery:
+    """Tests for run_query function."""
+
+    def test_report_query_matches_report(self, dataset, valid_csv_file):
+        result = run_query(dataset, Query.parse("average-gdp"))
+
+        assert result == AverageGDPReport().generate(_rows(valid_csv_file))
+
+    def test_filtered_report_query(self, dataset, valid_csv_file):
+        result = run_query(
+            dataset, Query.parse("average-gdp where continent = Asia top 1")
+        )
+        rows = [row for row in _rows(valid_csv_file) if row["continent"] == "Asia"]
+
+        assert result == AverageGDPReport().generate(rows)[:1]
+
+    def test_regrouped_report_query(self, dataset, valid_csv_file):
+        result = run_query(dataset, Query.parse("economy-summary by year"))
+
+        assert result == EconomySummaryReport(group_by=["year"]).generate(
+            _rows(valid_csv_file)
+        )
+
+    def test_aggregation_query(self, dataset, valid_csv_file):
+        result = run_query(
+            dataset, Query.parse("agg gdp:count gdp:max by country top 1 max_gdp")
+        )
+
+        rows = _rows(valid_csv_file)
+        top = max(rows, key=lambda row: row["gdp"])
+        count = sum(row["country"] == top["country"] for row in rows)
+        assert result == [
+            {"country": top["country"], "count_gdp": count, "max_gdp": top["gdp"]}
+        ]
+
+    def test_unknown_top_column_raises_error(self, dataset):
+        with pt_raises(ValueError, match="Result has no column area"):
+            run_query(dataset, Query.parse("average-gdp top 1 area"))
+
+    def test_unsupported_group_by_raises_error(self, dataset):
+        with pt_raises(ValueError, match="doesn't support options: group_by"):
+            run_query(dataset, Query.parse("average-gdp by year"))
+
+
+def test_repl_answers_until_exit(dataset, capsys):
+    lines = iter(["columns", "average-gdp top 1", "bogus", "", "exit", "average-gdp"])
+
+    answered = repl(dataset, lambda prompt: next(lines))
+    output = capsys.readouterr().out
+
+    assert answered == 1
+    assert "country, year, gdp" in output
+    assert "Query: average-gdp top 1 (1 rows)" in output
+    assert "Error: Report 'bogus' isn't found" in output
+    assert "Answered in" in output
+
+
+def test_repl_survives_report_error(dataset, capsys):
+    ReportRegistry.register_report("broken", _BrokenReport)
+    lines = iter(["broken", "average-gdp top 1", "exit"])
+
+    answered = repl(dataset, lambda prompt: next(lines))
+    output = capsys.readouterr().out
+
+    assert answered == 1
+    assert "Error: 'gdp_per_capita'" in output
+    assert "Query: average-gdp top 1 (1 rows)" in output
+
+
+def test_repl_stops_at_end_of_input(dataset):
+    def read(prompt: str) -> str:
+        raise EOFError
+
+    assert repl(dataset, read) == 0
+
+
+def test_query_from_command_line(valid_csv_file):
+    completed = subprocess.run(
+        [sys.executable, str(MAIN), "--files", str(valid_csv_file), "--query"],
+        input="agg gdp:mean by continent\n",
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert f"Loaded {len(_rows(valid_csv_file))} records of 1 files" in completed.stdout
+    assert "Query: agg gdp:mean by continent" in completed.stdout
+
+
+class _BrokenReport(BaseReport):
+    def generate(self, data):
+        return [row["gdp_per_capita"] for row in data]
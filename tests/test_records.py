@@ -0,0 +1,56 @@
+import sys
+
+from pytest import raises as pt_raises
+
+from core.records import Record, record_type
+
+
+class TestRecord:
+    """Tests for record_type and Record."""
+
+    def test_access(self):
+        row = record_type(["country", "gdp", "gdp growth", "count"])(
+            ("China", 17734, 2.4, 3)
+        )
+
+        assert row.country == "China"
+        assert row["gdp"] == row[1] == 17734
+        assert row["gdp growth"] == 2.4
+        assert row[1:3] == (17734, 2.4)
+        assert row.get("sector") is None
+        assert "gdp" in row
+        assert "China" not in row
+        assert row.count("China") == 1
+        assert (
+            dict(row)
+            == row.as_dict()
+            == {
+                "country": "China",
+                "gdp": 17734,
+                "gdp growth": 2.4,
+                "count": 3,
+            }
+        )
+
+    def test_missing_column_raises_error(self):
+        row = record_type(["country"])(("China",))
+
+        with pt_raises(KeyError):
+            row["gdp"]
+        with pt_raises(AttributeError):
+            row.country = "Japan"
+
+    def test_type_cached_by_header(self):
+        first = record_type(["country", "gdp"])
+
+        assert first is record_type(("country", "gdp"))
+        assert issubclass(first, Record)
+        assert repr(first(("A", 1))) == "Row(country='A', gdp=1)"
+
+    def test_smaller_than_dict(self):
+        header = ["country", "year", "gdp", "gdp_growth"]
+        values = ("China", 2023, 17963, 6.4)
+
+        assert sys.getsizeof(record_type(header)(values)) < sys.getsizeof(
+            dict(zip(header, values))
+        )
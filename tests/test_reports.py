@@ -1,7 +1,9 @@
 from pytest import raises as pt_raises
 
-from core import ReportRegistry
-from core.defined_reports import AverageGDPReport
+from core import BaseReport, ReportRegistry
+from core.defined_reports import AverageGDPReport, GDPTrendsReport
+from core.rollups import Rollup
+from core.sampling import Sample
 
 
 class TestReportRegistry:
@@ -18,6 +20,18 @@ class TestReportRegistry:
 
         assert isinstance(report, AverageGDPReport)
 
+    def test_get_report_with_options(self):
+        ReportRegistry.register_report("average-gdp", AverageGDPReport)
+        report = ReportRegistry.get_report("average-gdp", memory_limit=1024)
+
+        assert report.memory_limit == 1024
+
+    def test_get_report_with_unsupported_options(self):
+        ReportRegistry.register_report("average-gdp", AverageGDPReport)
+
+        with pt_raises(ValueError, match="doesn't support options: window"):
+            ReportRegistry.get_report("average-gdp", memory_limit=1, window=2)
+
     def test_get_nonexistent_report_raises_error(self):
         """Test that getting non-existent report raises ValueError."""
 
@@ -51,14 +65,151 @@ class TestAverageGDPReport:
         assert len(result) == 1
         assert result[0]["average_gdp"] == 10000.5
 
+    def test_generate_report_from_stream(self, economic_data):
+        report = AverageGDPReport()
+
+        assert report.generate(iter(economic_data)) == report.generate(economic_data)
+
+    def test_generate_report_with_spill(self, economic_data):
+        report = AverageGDPReport(memory_limit=1)
+
+        assert report.generate(economic_data) == AverageGDPReport().generate(
+            economic_data
+        )
+
+    def test_generate_report_typed_data(self):
+        report = AverageGDPReport()
+        result = report.generate(
+            [{"country": "China", "gdp": 17734}, {"country": "China", "gdp": 17963.0}]
+        )
+
+        assert result == [{"country": "China", "average_gdp": 17848.5}]
+
     def test_generate_report_empty_data(self):
         report = AverageGDPReport()
         result = report.generate([])
 
         assert result == []
 
+    def test_estimate_full_strata_exact(self, economic_data):
+        sample = Sample(
+            {"China": economic_data[3:6], "Germany": economic_data[6:]},
+            {"China": 3, "Germany": 1},
+            3,
+            "country",
+        )
+        result = AverageGDPReport().estimate(sample)
+
+        assert result == [
+            {"country": "China", "average_gdp": 17810.33, "margin": 0.0},
+            {"country": "Germany", "average_gdp": 4257.0, "margin": 0.0},
+        ]
+
+    def test_estimate_partial_stratum_has_margin(self, economic_data):
+        sample = Sample({"China": economic_data[4:6]}, {"China": 10}, 2, "country")
+        result = AverageGDPReport().estimate(sample)
+
+        assert result[0]["average_gdp"] == 17848.5
+        assert result[0]["margin"] == 211.59
+
+    def test_estimate_not_supported(self):
+        class PlainReport(BaseReport):
+            def generate(self, data):
+                return data
+
+        with pt_raises(NotImplementedError, match="approximate mode"):
+            PlainReport().estimate(Sample({}, {}, 1))
+
+    def test_from_rollups(self, economic_data):
+        columns = {
+            "country": [row["country"] for row in economic_data],
+            "gdp": [int(row["gdp"]) for row in economic_data],
+        }
+        rollups = [
+            Rollup.build(columns, ("country",), ("gdp",)),
+            Rollup.build(columns, ("country",), ("gdp",)),
+        ]
+        report = AverageGDPReport()
+
+        assert report.from_rollups(rollups) == report.generate(economic_data)
+
+    def test_from_rollups_not_covering(self):
+        rollup = Rollup.build({"year": [2021], "gdp": [1]}, ("year",), ("gdp",))
+
+        assert AverageGDPReport().from_rollups([rollup]) is None
+
     def test_registry_average_gdp(self):
         ReportRegistry.register_report("average-gdp", AverageGDPReport)
         report = ReportRegistry.get_report("average-gdp")
 
         assert isinstance(report, AverageGDPReport)
+
+
+class TestGDPTrendsReport:
+    """Tests for GDPTrendsReport class."""
+
+    def test_generate(self, economic_data):
+        result = GDPTrendsReport(window=2).generate(economic_data)
+
+        assert [(row["country"], row["year"]) for row in result[:3]] == [
+            ("China", 2021),
+            ("China", 2022),
+            ("China", 2023),
+        ]
+        assert result[2] == {
+            "country": "China",
+            "year": 2023,
+            "gdp": 17963,
+            "rolling_2y_gdp": 17848.5,
+            "yoy_growth_pct": 1.29,
+            "cagr_pct": 0.64,
+        }
+        assert result[3]["country"] == "Germany"
+        assert result[3]["yoy_growth_pct"] is None
+        assert result[3]["cagr_pct"] is None
+
+    def test_generate_with_gaps_and_duplicates(self):
+        data = [
+            {"country": "A", "year": 2000, "gdp": 100},
+            {"country": "A", "year": 2000, "gdp": 300},
+            {"country": "A", "year": 2002, "gdp": 800},
+            {"country": "A", "year": 2003, "gdp": "bad"},
+        ]
+        result = GDPTrendsReport(window=2).generate(data)
+
+        assert result == [
+            {
+                "country": "A",
+                "year": 2000,
+                "gdp": 200.0,
+                "rolling_2y_gdp": 200.0,
+                "yoy_growth_pct": None,
+                "cagr_pct": None,
+            },
+            {
+                "country": "A",
+                "year": 2002,
+                "gdp": 800,
+                "rolling_2y_gdp": 800.0,
+                "yoy_growth_pct": None,
+                "cagr_pct": 100.0,
+            },
+        ]
+
+    def test_from_rollups(self, economic_data):
+        columns = {
+            "country": [row["country"] for row in economic_data],
+            "year": [int(row["year"]) for row in economic_data],
+            "gdp": [int(row["gdp"]) for row in economic_data],
+        }
+        rollup = Rollup.build(columns, ("country", "year"), ("gdp",))
+        report = GDPTrendsReport()
+
+        assert report.from_rollups([rollup]) == report.generate(economic_data)
+        assert AverageGDPReport().from_rollups([rollup]) == AverageGDPReport().generate(
+            economic_data
+        )
+
+    def test_invalid_window(self):
+        with pt_raises(ValueError, match="at least 1 year"):
+            GDPTrendsReport(window=0)
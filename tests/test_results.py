@@ -0,0 +1,93 @@
+from pytest import raises as pt_raises
+
+from core.defined_reports import AverageGDPReport, GDPTrendsReport
+from core.results import NEW, REMOVED, ResultSet
+
+
+class TestResultSet:
+    """Tests for ResultSet class."""
+
+    def test_save_and_load(self, economic_data, tmp_path):
+        result = GDPTrendsReport().generate(economic_data)
+        result_set = ResultSet.from_result(
+            "gdp-trends", result, GDPTrendsReport.result_key
+        )
+        path = tmp_path / "result.json"
+
+        result_set.save(path)
+        loaded = ResultSet.load(path)
+
+        assert loaded.key == ("country", "year")
+        assert [dict(zip(loaded.columns, row)) for row in loaded.rows] == result
+
+    def test_load_not_result(self, tmp_path):
+        path = tmp_path / "result.json"
+        path.write_text("[]")
+
+        with pt_raises(ValueError, match="isn't a saved report result"):
+            ResultSet.load(path)
+
+    def test_diff(self, economic_data):
+        report = AverageGDPReport()
+        baseline = ResultSet.from_result(
+            "average-gdp",
+            report.generate(
+                [row for row in economic_data if row["country"] != "China"]
+                + [{"country": "Chad", "gdp": "10"}]
+            ),
+        )
+        current = ResultSet.from_result("average-gdp", report.generate(economic_data))
+
+        diff = current.diff(baseline)
+
+        assert diff == [
+            {
+                "country": "United States",
+                "average_gdp": 23923.67,
+                "average_gdp_delta": 0.0,
+                "rank": 1,
+                "rank_change": 0,
+                "status": None,
+            },
+            {
+                "country": "China",
+                "average_gdp": 17810.33,
+                "average_gdp_delta": None,
+                "rank": 2,
+                "rank_change": None,
+                "status": NEW,
+            },
+            {
+                "country": "Germany",
+                "average_gdp": 4257.0,
+                "average_gdp_delta": 0.0,
+                "rank": 3,
+                "rank_change": -1,
+                "status": None,
+            },
+            {
+                "country": "Chad",
+                "average_gdp": None,
+                "average_gdp_delta": None,
+                "rank": None,
+                "rank_change": None,
+                "status": REMOVED,
+            },
+        ]
+
+    def test_diff_other_report(self, economic_data):
+        trends = ResultSet.from_result(
+            "gdp-trends",
+            GDPTrendsReport().generate(economic_data),
+            GDPTrendsReport.result_key,
+        )
+        average = ResultSet.from_result(
+            "average-gdp", AverageGDPReport().generate(economic_data)
+        )
+
+        with pt_raises(ValueError, match="Baseline is result of gdp-trends"):
+            average.diff(trends)
+
+    def test_missing_key_column(self):
+        with pt_raises(ValueError, match="no key columns continent"):
+            ResultSet.from_result("average-gdp", [{"country": "A"}], ("continent",))
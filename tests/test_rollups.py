@@ -0,0 +1,97 @@
+import os
+from csv import Error as csv_Error
+
+from pytest import raises as pt_raises
+
+from core import CsvReader, Schema
+from core.aggregation import AggregateState
+from core.rollups import Rollup, merge_rollups
+from core.validation import ErrorPolicy
+
+
+class TestRollup:
+    """Tests for Rollup class."""
+
+    def test_build(self):
+        columns = {
+            "country": ["China", "China", "Japan"],
+            "year": [2021, 2022, 2021],
+            "gdp": [10, 20, 5],
+        }
+        rollup = Rollup.build(columns, ("country", "year"), ("gdp",))
+
+        assert rollup.rows == 3
+        assert rollup.groups[("China", 2021)]["gdp"] == AggregateState(1, 10, 10, 10)
+        assert rollup.group(("country",), "gdp") == {
+            ("China",): AggregateState(2, 30, 10, 20),
+            ("Japan",): AggregateState(1, 5, 5, 5),
+        }
+
+    def test_build_for_reader(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        rollup = Rollup.build_for(reader)
+
+        assert rollup.dimensions == ("country", "continent", "year")
+        assert "gdp" in rollup.metrics
+        assert "country" not in rollup.metrics
+        assert rollup.covers(("country",), "gdp")
+        assert not rollup.covers(("sector",), "gdp")
+
+    def test_build_for_skips_invalid_rows(self, many_errors_csv_file):
+        reader = CsvReader(
+            many_errors_csv_file,
+            schema=Schema({"year": "int", "gdp": "int"}),
+            on_error=ErrorPolicy.SKIP,
+        )
+        rollup = Rollup.build_for(reader)
+
+        assert rollup.metrics == ("gdp",)
+        assert rollup.rows == 2
+        assert reader.rows_rejected == 3
+        assert rollup.group(("country",), "gdp") == {
+            ("China",): AggregateState(1, 17734, 17734, 17734),
+            ("Germany",): AggregateState(1, 4257, 4257, 4257),
+        }
+
+    def test_build_for_invalid_row_raises_error(self, many_errors_csv_file):
+        reader = CsvReader(many_errors_csv_file, infer_schema=True)
+
+        with pt_raises(csv_Error, match="More or less columns"):
+            Rollup.build_for(reader)
+
+    def test_save_and_load(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        rollup = Rollup.build_for(reader)
+        path = rollup.save(valid_csv_file)
+
+        try:
+            loaded = Rollup.load_for(valid_csv_file)
+
+            assert loaded.dimensions == rollup.dimensions
+            assert loaded.groups == rollup.groups
+            assert loaded.rows == 7
+        finally:
+            path.unlink()
+
+    def test_load_missing(self, valid_csv_file):
+        assert Rollup.load_for(valid_csv_file) is None
+
+    def test_load_stale(self, valid_csv_file):
+        reader = CsvReader(valid_csv_file, infer_schema=True)
+        path = Rollup.build_for(reader).save(valid_csv_file)
+
+        try:
+            stat = valid_csv_file.stat()
+            os.utime(valid_csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+            assert Rollup.load_for(valid_csv_file) is None
+        finally:
+            path.unlink()
+
+    def test_merge_rollups(self):
+        left = Rollup.build({"country": ["A"], "gdp": [1]}, ("country",), ("gdp",))
+        right = Rollup.build({"country": ["A"], "gdp": [3]}, ("country",), ("gdp",))
+
+        assert merge_rollups([left, right], ("country",), "gdp") == {
+            ("A",): AggregateState(2, 4, 1, 3)
+        }
@@ -0,0 +1,61 @@
+import random
+
+from pytest import raises as pt_raises
+
+from core.sampling import Sample, reservoir_sample
+
+
+class TestReservoirSample:
+    """Tests for reservoir_sample function."""
+
+    def test_small_input_kept_whole(self):
+        strata, totals = reservoir_sample(range(5), 10)
+
+        assert strata == {None: [0, 1, 2, 3, 4]}
+        assert totals == {None: 5}
+
+    def test_sample_size(self):
+        strata, totals = reservoir_sample(range(1000), 10, rng=random.Random(1))
+
+        assert len(strata[None]) == 10
+        assert len(set(strata[None])) == 10
+        assert totals == {None: 1000}
+
+    def test_stratified(self):
+        strata, totals = reservoir_sample(range(100), 3, key=lambda x: x % 2)
+
+        assert set(strata) == {0, 1}
+        assert all(len(rows) == 3 for rows in strata.values())
+        assert all(value % 2 == 0 for value in strata[0])
+        assert totals == {0: 50, 1: 50}
+
+
+class TestSample:
+    """Tests for Sample class."""
+
+    def test_rows_and_total(self):
+        sample = Sample({"A": [{"x": 1}], "B": [{"x": 2}]}, {"A": 5, "B": 1}, 1, "k")
+
+        assert sample.rows == [{"x": 1}, {"x": 2}]
+        assert sample.total == 6
+        assert sample.population("A") == 5
+        assert sample.population("C") == 0
+
+    def test_population_unknown_without_stratification(self):
+        sample = Sample({None: [{"x": 1}]}, {None: 5}, 1)
+
+        assert sample.population(None) is None
+
+    def test_merge(self):
+        left = Sample({"A": [1, 2]}, {"A": 10}, 2, "k")
+        right = Sample({"A": [3, 4], "B": [5]}, {"A": 2, "B": 1}, 2, "k")
+        merged = Sample.merge([left, right], seed=1)
+
+        assert merged.totals == {"A": 12, "B": 1}
+        assert len(merged.strata["A"]) == 2
+        assert set(merged.strata["A"]) <= {1, 2, 3, 4}
+        assert merged.strata["B"] == [5]
+
+    def test_merge_different_samples_raises_error(self):
+        with pt_raises(ValueError, match="Cannot merge samples"):
+            Sample.merge([Sample({}, {}, 1), Sample({}, {}, 2)])
@@ -0,0 +1,73 @@
+from pytest import raises as pt_raises
+
+from core import ColumnType, Schema
+
+
+class TestSchema:
+    """Tests for Schema class."""
+
+    def test_infer_types(self):
+        header = ["country", "year", "gdp", "name"]
+        sample = [
+            ["China", "2021", "17734.5", "a"],
+            ["China", "2022", "17963", "b"],
+            ["China", "2023", "18100", "c"],
+        ]
+        schema = Schema.infer(header, sample)
+
+        assert schema.types == {
+            "country": ColumnType.CATEGORY,
+            "year": ColumnType.INT,
+            "gdp": ColumnType.FLOAT,
+            "name": ColumnType.STR,
+        }
+
+    def test_infer_empty_sample(self):
+        schema = Schema.infer(["country"], [])
+
+        assert schema.column_type("country") == ColumnType.STR
+
+    def test_schema_from_strings(self):
+        schema = Schema({"gdp": "float"})
+
+        assert schema == Schema({"gdp": ColumnType.FLOAT})
+
+    def test_unknown_column_is_string(self):
+        schema = Schema({"gdp": "int"})
+
+        assert schema.column_type("country") == ColumnType.STR
+
+    def test_convert_column(self):
+        schema = Schema({"gdp": "int", "inflation": "float"})
+
+        assert schema.convert_column("gdp", ["1", "2"]) == [1, 2]
+        assert schema.convert_column("inflation", ["1.5", "2"]) == [1.5, 2.0]
+        assert schema.convert_column("country", ["China"]) == ["China"]
+
+    def test_convert_column_invalid_raises_error(self):
+        schema = Schema({"gdp": "int"})
+
+        with pt_raises(ValueError, match="Invalid int value 'abc' in column 'gdp'"):
+            schema.convert_column("gdp", ["1", "abc"])
+
+    def test_invalid_rows(self):
+        schema = Schema({"gdp": "float"})
+        values = ["1", "x", "2.5", "y"]
+
+        assert schema.invalid_rows("gdp", values) == [1, 3]
+        assert schema.invalid_rows("gdp", values, limit=1) == [1]
+        assert schema.invalid_rows("gdp", ["1", "2"]) == []
+
+    def test_inferred_int_column_widens_to_float(self):
+        schema = Schema.infer(["gdp"], [["1"], ["2"]])
+
+        assert schema.invalid_rows("gdp", ["3", "1234.5", "x"]) == [2]
+        assert schema.convert_column("gdp", ["3", "1234.5"]) == [3.0, 1234.5]
+        assert schema.column_type("gdp") == ColumnType.FLOAT
+
+    def test_given_int_column_doesnt_widen(self):
+        schema = Schema({"gdp": "int"})
+
+        assert schema.invalid_rows("gdp", ["3", "1234.5"]) == [1]
+        with pt_raises(ValueError, match="Invalid int value '1234.5'"):
+            schema.convert_column("gdp", ["3", "1234.5"])
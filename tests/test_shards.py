@@ -0,0 +1,125 @@
+import sys
+import threading
+from pathlib import Path
+
+from pytest import raises as pt_raises
+
+from core import BaseReport, CsvReader, ReportRegistry
+from core.defined_reports import EconomySummaryReport, GDPTrendsReport
+from core.shards import Coordinator, parse_address, process_shard, run_worker
+from core.validation import ErrorPolicy
+
+MAIN = Path(__file__).resolve().parents[1] / "main.py"
+
+
+def _run_with_threads(coordinator: Coordinator, files: list[Path], workers: int):
+    threads = [
+        threading.Thread(target=run_worker, args=(coordinator.address,))
+        for _ in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        return coordinator.run(files)
+    finally:
+        for thread in threads:
+            thread.join()
+
+
+class TestCoordinator:
+    """Tests for Coordinator class."""
+
+    def test_matches_single_process(self, valid_csv_file):
+        ReportRegistry.register_report("gdp-trends", GDPTrendsReport)
+        files = [valid_csv_file, valid_csv_file, valid_csv_file]
+        coordinator = Coordinator("gdp-trends", {"window": 2})
+
+        result = _run_with_threads(coordinator, files, workers=2)
+
+        rows = [row for _ in files for row in CsvReader(valid_csv_file).iter_rows()]
+        assert result == GDPTrendsReport(window=2).generate(rows)
+        assert coordinator.rows == 21
+
+    def test_declarative_report(self, valid_csv_file):
+        ReportRegistry.register_report("economy-summary", EconomySummaryReport)
+        coordinator = Coordinator("economy-summary", {"group_by": ["country"]})
+
+        result = _run_with_threads(coordinator, [valid_csv_file], workers=1)
+
+        expected = EconomySummaryReport(group_by=["country"]).generate(
+            CsvReader(valid_csv_file).iter_rows()
+        )
+        assert result == expected
+
+    def test_invalid_file_fails(self, valid_csv_file, nonexistent_file):
+        ReportRegistry.register_report("gdp-trends", GDPTrendsReport)
+        coordinator = Coordinator("gdp-trends", {})
+
+        with pt_raises(ValueError, match="does not exist"):
+            _run_with_threads(coordinator, [valid_csv_file, nonexistent_file], 1)
+
+    def test_invalid_file_skipped(self, valid_csv_file, nonexistent_file):
+        ReportRegistry.register_report("gdp-trends", GDPTrendsReport)
+        coordinator = Coordinator("gdp-trends", {}, ErrorPolicy.SKIP)
+
+        result = _run_with_threads(coordinator, [nonexistent_file, valid_csv_file], 1)
+
+        assert len(result) == 7
+        assert [file for file, _ in coordinator.skipped] == [str(nonexistent_file)]
+
+    def test_local_subprocess_workers(self, valid_csv_file):
+        ReportRegistry.register_report("economy-summary", EconomySummaryReport)
+        coordinator = Coordinator("economy-summary", {})
+
+        result = coordinator.run(
+            [valid_csv_file] * 4, [sys.executable, str(MAIN), "--worker"], workers=2
+        )
+
+        assert result == EconomySummaryReport().generate(
+            CsvReader(valid_csv_file).load_csv * 4
+        )
+
+    def test_exited_workers_fail(self, valid_csv_file):
+        ReportRegistry.register_report("gdp-trends", GDPTrendsReport)
+        coordinator = Coordinator("gdp-trends", {})
+
+        with pt_raises(ConnectionError, match="1 files left"):
+            coordinator.run([valid_csv_file], [sys.executable, "-c", "pass"], 1)
+
+    def test_quarantine_not_supported(self):
+        ReportRegistry.register_report("gdp-trends", GDPTrendsReport)
+
+        with pt_raises(ValueError, match="quarantine"):
+            Coordinator("gdp-trends", {}, ErrorPolicy.QUARANTINE)
+
+
+class TestProcessShard:
+    """Tests for process_shard."""
+
+    def test_unsupported_report(self, valid_csv_file):
+        ReportRegistry.register_report("test_report", _RowsReport)
+
+        result = process_shard(
+            {
+                "file": str(valid_csv_file),
+                "report": "test_report",
+                "options": {},
+                "on_error": "fail",
+            }
+        )
+
+        assert result["type"] == "error"
+        assert "doesn't support sharded mode" in result["message"]
+
+
+def test_parse_address():
+    assert parse_address("localhost:7000") == ("localhost", 7000)
+    assert parse_address("::1:7000") == ("::1", 7000)
+
+    with pt_raises(ValueError, match="HOST:PORT"):
+        parse_address("7000")
+
+
+class _RowsReport(BaseReport):
+    def generate(self, data):
+        return list(data)
@@ -1,6 +1,6 @@
 from pytest import raises as pt_raises
 
-from core import convert_to_number, is_numeric
+from core import convert_to_number, is_numeric, parse_size, to_number
 
 
 class TestIsNumeric:
@@ -152,3 +152,36 @@ class TestConvertToNumber:
 
         result = convert_to_number("100.0")
         assert isinstance(result, float)
+
+
+class TestToNumber:
+    """Tests for to_number function."""
+
+    def test_converts_strings(self):
+        assert to_number(" 42 ") == 42
+        assert to_number("1.5") == 1.5
+
+    def test_keeps_typed_values(self):
+        assert to_number(7) == 7
+        assert to_number(None) is None
+
+    def test_non_numeric_string_is_none(self):
+        assert to_number("n/a") is None
+        assert to_number("") is None
+
+
+class TestParseSize:
+    """Tests for parse_size function."""
+
+    def test_parse_units(self):
+        assert parse_size("100") == 100
+        assert parse_size("1.5K") == 1536
+        assert parse_size("512m") == 512 * 1024**2
+        assert parse_size("2GB") == 2 * 1024**3
+
+    def test_parse_invalid_raises_error(self):
+        with pt_raises(ValueError, match="Cannot convert value"):
+            parse_size("lots")
+
+        with pt_raises(ValueError, match="Cannot convert value"):
+            parse_size("-1G")
@@ -0,0 +1,88 @@
+import random
+
+from pytest import raises as pt_raises
+
+from core.sketches import ColumnSketch, HyperLogLog, TDigest
+
+
+class TestHyperLogLog:
+    """Tests for HyperLogLog sketch."""
+
+    def test_count_small(self):
+        sketch = HyperLogLog()
+        for value in ["a", "b", "c", "a", "b"]:
+            sketch.add(value)
+
+        assert sketch.count() == 3
+
+    def test_count_large_within_error(self):
+        sketch = HyperLogLog()
+        for value in range(50000):
+            sketch.add(value)
+
+        assert abs(sketch.count() - 50000) / 50000 < 4 * sketch.relative_error
+
+    def test_merge(self):
+        left, right = HyperLogLog(), HyperLogLog()
+        for value in range(100):
+            left.add(value)
+        for value in range(50, 150):
+            right.add(value)
+        left.merge(right)
+
+        assert abs(left.count() - 150) <= 3
+
+    def test_merge_different_precision_raises_error(self):
+        with pt_raises(ValueError, match="different precision"):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+
+class TestTDigest:
+    """Tests for TDigest sketch."""
+
+    def test_quantiles_uniform(self):
+        digest = TDigest()
+        values = list(range(10001))
+        random.Random(1).shuffle(values)
+        for value in values:
+            digest.add(value)
+
+        assert abs(digest.quantile(0.5) - 5000) < 100
+        assert abs(digest.quantile(0.99) - 9900) < 30
+        assert digest.quantile(0) == 0
+        assert digest.quantile(1) == 10000
+
+    def test_merge(self):
+        left, right = TDigest(), TDigest()
+        for value in range(1000):
+            left.add(value)
+            right.add(value + 1000)
+        left.merge(right)
+
+        assert left.total == 2000
+        assert abs(left.quantile(0.5) - 1000) < 20
+
+    def test_empty_digest(self):
+        digest = TDigest()
+
+        assert digest.quantile(0.5) is None
+        assert digest.rank_error(0.5) == 0.0
+
+
+class TestColumnSketch:
+    """Tests for ColumnSketch class."""
+
+    def test_describe_numeric(self):
+        sketch = ColumnSketch(float)
+        sketch.update(["1", "2", "3", "bad"])
+        description = sketch.describe()
+
+        assert description["distinct"] == 4
+        assert description["p50"] == 2
+        assert "rank_error" in description
+
+    def test_describe_text(self):
+        sketch = ColumnSketch()
+        sketch.update(["China", "China", "Japan"])
+
+        assert sketch.describe() == {"distinct": 2, "distinct_error": "±1.6%"}
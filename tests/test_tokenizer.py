@@ -0,0 +1,85 @@
+import csv
+import io
+
+from pytest import raises as pt_raises
+
+from core.tokenizer import is_simple, read_columns, read_rows
+
+SIMPLE = "country,year,gdp\nA,2020,1.5\nB,2021,2\n"
+CASES = [
+    SIMPLE,
+    SIMPLE.rstrip("\n"),
+    "",
+    "country;gdp\nA;1\n",
+    'country,gdp\nA,1\n"B, C",2\nD,3\n',
+    'country,gdp\nA,1\n"multi\nline",2\nD,3',
+    "country,gdp\r\nA,1\r\nB,2\r\n",
+    "country,gdp\n\nA,1\n",
+    "\ncountry,gdp\nA,1\n",
+    "country,gdp\nA,1\nB,\n,\n",
+]
+
+
+def _expected(text: str, delimiter: str = ",") -> list[list[str]]:
+    return list(csv.reader(io.StringIO(text, newline=""), delimiter=delimiter))
+
+
+class TestReadRows:
+    """Tests for read_rows."""
+
+    def test_same_rows_as_csv_reader(self):
+        for text in CASES:
+            delimiter = ";" if ";" in text else ","
+            for block_size in (1, 3, 7, 1024):
+                rows = read_rows(io.StringIO(text, newline=""), delimiter, block_size)
+
+                assert list(rows) == _expected(text, delimiter), (text, block_size)
+
+    def test_fallback_after_simple_blocks(self):
+        text = SIMPLE + "A,2022,3\n" * 100 + '"Z",2023,4\n'
+
+        rows = list(read_rows(io.StringIO(text, newline=""), block_size=64))
+
+        assert rows == _expected(text)
+        assert rows[-1] == ["Z", "2023", "4"]
+
+
+class TestReadColumns:
+    """Tests for read_columns."""
+
+    def test_same_columns_as_csv_reader(self):
+        for text in CASES:
+            delimiter = ";" if ";" in text else ","
+            header, *rows = _expected(text, delimiter) or [[]]
+            columns = [list(column) for column in zip(*rows)] or [[]] * len(header)
+            ragged = any(len(row) != len(header) for row in rows)
+
+            for block_size in (1, 3, 7, 1024):
+                stream = io.StringIO(text, newline="")
+                if ragged:
+                    with pt_raises(csv.Error):
+                        read_columns(stream, delimiter, block_size)
+                    continue
+
+                result = read_columns(stream, delimiter, block_size)
+
+                assert result == (header, columns), (text, block_size)
+
+    def test_ragged_row_raises_error(self):
+        text = "a,b,c\n1,2,3\n4,5\n7,8,9\n"
+
+        with pt_raises(csv.Error, match="Row 2: More or less columns"):
+            read_columns(io.StringIO(text, newline=""))
+
+    def test_ragged_quoted_row_raises_error(self):
+        text = 'a,b\n1,2\n"3",4\n5\n'
+
+        with pt_raises(csv.Error, match="Row 3: More or less columns"):
+            read_columns(io.StringIO(text, newline=""), block_size=4)
+
+
+def test_is_simple():
+    assert is_simple(SIMPLE)
+    assert not is_simple('a,"b"\n')
+    assert not is_simple("a,b\r\n")
+    assert not is_simple("a,b\n\nc,d\n")
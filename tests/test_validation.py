@@ -0,0 +1,83 @@
+import csv
+from pathlib import Path
+
+from core import Schema
+from core.validation import Quarantine, RowError, ValidationResult, validate_batch
+
+
+class TestValidateBatch:
+    """Tests for validate_batch function."""
+
+    def test_valid_batch(self):
+        rows = [["China", "2021"], ["Japan", "2022"]]
+
+        assert validate_batch(["country", "year"], rows) == []
+
+    def test_collects_all_errors_with_row_numbers(self):
+        header = ["country", "year", "gdp"]
+        rows = [
+            ["China", "2021", "1"],
+            ["China", "2022"],
+            ["Japan", "", "2"],
+            ["Japan", "2022", "x"],
+        ]
+        errors = validate_batch(header, rows, 11, Schema({"gdp": "int"}))
+
+        assert [error.row for error in errors] == [12, 13, 14]
+        assert "More or less columns" in errors[0].message
+        assert "Empty value" in errors[1].message
+        assert "Invalid int value in column 'gdp'" in errors[2].message
+
+    def test_one_error_per_row(self):
+        errors = validate_batch(["gdp"], [[""]], schema=Schema({"gdp": "int"}))
+
+        assert errors == [RowError(1, "Empty value in row: ['']")]
+
+    def test_limit(self):
+        rows = [["a"], ["b", "c"], ["d", "e"]]
+
+        assert len(validate_batch(["x", "y"], rows, limit=1)) == 1
+
+
+class TestValidationResult:
+    """Tests for ValidationResult class."""
+
+    def test_valid(self):
+        result = ValidationResult(10, [], 5)
+
+        assert result.is_valid
+        assert str(result) == ""
+
+    def test_truncated(self):
+        result = ValidationResult(10, [RowError(3, "Bad")], 1)
+
+        assert not result.is_valid
+        assert result.truncated
+        assert str(result) == "Row 3: Bad\nStopped after 1 errors."
+
+
+class TestQuarantine:
+    """Tests for Quarantine class."""
+
+    def test_not_created_without_rows(self, tmp_path):
+        path = tmp_path / "quarantine.csv"
+        with Quarantine(path):
+            pass
+
+        assert not path.exists()
+
+    def test_write(self, tmp_path):
+        path = tmp_path / "quarantine.csv"
+        with Quarantine(path) as quarantine:
+            quarantine.write(Path("a.csv"), 3, "Bad row", ["x", "y"])
+            quarantine.write(Path("b.csv"), None, "Missing file")
+
+        with open(path, newline="") as f:
+            rows = list(csv.reader(f))
+
+        assert quarantine.count == 2
+        assert rows == [
+            ["file", "row", "reason", "raw"],
+            ["a.csv", "3", "Bad row", "x,y"],
+            ["b.csv", "", "Missing file", ""],
+        ]
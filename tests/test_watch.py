@@ -0,0 +1,166 @@
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from core import CsvReader
+from core.defined_reports import AverageGDPReport, EconomySummaryReport
+from core.validation import ErrorPolicy
+from core.watch import Inotify, Poller, Watcher, create_waiter, watch
+
+APPENDED = "Atlantis,2023,100,1.0,2.0,3.0,10,Europe\n"
+
+
+def _reader(file: Path, on_error: ErrorPolicy = ErrorPolicy.FAIL) -> CsvReader:
+    return CsvReader(file, infer_schema=True, records=True, on_error=on_error)
+
+
+def _expected(
+    report, file: Path, on_error: ErrorPolicy = ErrorPolicy.FAIL
+) -> list[dict]:
+    return report.generate(_reader(file, on_error).iter_rows())
+
+
+@pytest.fixture
+def watched_file(valid_csv_file, tmp_path) -> Path:
+    file = tmp_path / "economic.csv"
+    file.write_bytes(valid_csv_file.read_bytes())
+    return file
+
+
+def _append(file: Path, text: str) -> None:
+    stat = file.stat()
+    with open(file, "a", encoding="utf-8", newline="") as f:
+        f.write(text)
+    # appends within timestamp resolution are still seen as changes
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+
+class TestWatcher:
+    """Tests for Watcher class."""
+
+    def test_first_refresh_reads_all_files(self, watched_file):
+        watcher = Watcher(EconomySummaryReport(), [_reader(watched_file)])
+
+        assert watcher.refresh() == [watched_file]
+        assert watcher.refresh() == []
+        assert watcher.result() == _expected(EconomySummaryReport(), watched_file)
+        assert watcher.rows == len(_reader(watched_file).load_csv)
+
+    def test_appended_rows_are_read_incrementally(self, watched_file):
+        watcher = Watcher(AverageGDPReport(), [_reader(watched_file)])
+        watcher.refresh()
+        rows = watcher.rows
+
+        _append(watched_file, APPENDED)
+
+        assert watcher.refresh() == [watched_file]
+        assert watcher.files[watched_file].offset == watched_file.stat().st_size
+        assert watcher.rows == rows + 1
+        assert watcher.result() == _expected(AverageGDPReport(), watched_file)
+
+    def test_partial_line_waits_for_newline(self, watched_file):
+        watcher = Watcher(AverageGDPReport(), [_reader(watched_file)])
+        watcher.refresh()
+        rows = watcher.rows
+
+        _append(watched_file, APPENDED[:10])
+        watcher.refresh()
+
+        assert watcher.rows == rows
+        _append(watched_file, APPENDED[10:])
+        watcher.refresh()
+
+        assert watcher.rows == rows + 1
+        assert watcher.result() == _expected(AverageGDPReport(), watched_file)
+
+    def test_rewritten_file_is_read_again(self, watched_file):
+        watcher = Watcher(AverageGDPReport(), [_reader(watched_file)])
+        watcher.refresh()
+
+        header, *_ = watched_file.read_text(encoding="utf-8").splitlines()
+        watched_file.write_text(f"{header}\n{APPENDED * 3}", encoding="utf-8")
+        _append(watched_file, "")
+        watcher.refresh()
+
+        assert watcher.rows == 3
+        assert watcher.result() == [{"country": "Atlantis", "average_gdp": 100}]
+
+    def test_broken_file_is_skipped_until_fixed(self, watched_file):
+        content = watched_file.read_text(encoding="utf-8")
+        watcher = Watcher(AverageGDPReport(), [_reader(watched_file)])
+
+        watched_file.write_text(content + "Atlantis,x,y\n", encoding="utf-8")
+        changed = watcher.refresh()
+
+        assert watcher.errors(changed)[0][0] == watched_file
+        assert watcher.result() == []
+
+        watched_file.write_text(content, encoding="utf-8")
+        _append(watched_file, "")
+        watcher.refresh()
+
+        assert watcher.errors([watched_file]) == []
+        assert watcher.result() == _expected(AverageGDPReport(), watched_file)
+
+    def test_skip_policy_counts_rejected_rows(self, watched_file):
+        reader = _reader(watched_file, ErrorPolicy.SKIP)
+        watcher = Watcher(AverageGDPReport(), [reader])
+        watcher.refresh()
+
+        _append(watched_file, "Atlantis,x,y\n" + APPENDED)
+        watcher.refresh()
+
+        assert watcher.rejected == 1
+        assert watcher.result() == _expected(
+            AverageGDPReport(), watched_file, ErrorPolicy.SKIP
+        )
+
+
+def test_watch_calls_back_with_changed_files(watched_file):
+    watcher = Watcher(AverageGDPReport(), [_reader(watched_file)])
+    updates = []
+    stop = threading.Event()
+
+    def on_update(changed: list[Path], seconds: float) -> None:
+        updates.append(changed)
+        if len(updates) == 2:
+            stop.set()
+        else:
+            _append(watched_file, APPENDED)
+
+    thread = threading.Thread(
+        target=watch, args=(watcher, on_update, 0.01, stop), daemon=True
+    )
+    thread.start()
+    thread.join(timeout=5)
+
+    assert updates == [[watched_file], [watched_file]]
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux only"
+)
+def test_inotify_wakes_on_change(tmp_path):
+    waiter = create_waiter([tmp_path])
+    assert isinstance(waiter, Inotify)
+
+    try:
+        start = time.monotonic()
+        (tmp_path / "new.csv").write_text("a\n", encoding="utf-8")
+        waiter.wait(5)
+
+        assert time.monotonic() - start < 1
+    finally:
+        waiter.close()
+
+
+def test_missing_directory_falls_back_to_polling(tmp_path):
+    waiter = create_waiter([tmp_path / "missing"])
+
+    assert isinstance(waiter, Poller)
+    waiter.wait(0)
+    waiter.close()